@@ -0,0 +1,4 @@
+"""
+Benchmarks de rendimiento de la Red Neuronal RBF
+Se ejecutan desde la raíz del repositorio con python -m benchmarks.<modulo>
+"""
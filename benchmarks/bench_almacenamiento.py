@@ -0,0 +1,124 @@
+"""
+Benchmark: escalabilidad de la base de datos con muchos entrenamientos guardados
+
+Llena una base de datos temporal hasta cada tamaño de --tamanos (por defecto
+hasta 100 000 entrenamientos) y mide cargar_entrenamiento, eliminar_entrenamiento,
+la primera página del listado por fecha y el listado completo. Con índices
+sobre entrenamiento_id y fecha_creacion, cargar, eliminar y la primera página
+deben mantenerse planos; --sin-indices los elimina para comparar.
+
+Uso:
+    python -m benchmarks.bench_almacenamiento [--tamanos 1000 10000 100000] [--sin-indices]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from formato_binario import serializar_objeto
+from storage_manager import StorageManager
+
+
+def poblar(storage, desde, hasta, rng):
+    """Inserta entrenamientos sintéticos con ids desde+1 .. hasta en una transacción"""
+    centros = serializar_objeto(rng.standard_normal((10, 4)))
+    pesos = serializar_objeto(rng.standard_normal((11, 1)))
+    inicio = datetime(2024, 1, 1)
+
+    filas = range(desde + 1, hasta + 1)
+    conexion = storage._conexiones.obtener()
+    with conexion:
+        conexion.executemany('''
+            INSERT INTO entrenamientos
+            (id, nombre, dataset_nombre, fecha_creacion, num_patrones, num_entradas, num_salidas,
+             num_centros, porcentaje_entrenamiento, funcion_activacion, error_optimo, descripcion,
+             parametros_activacion, version, dtype)
+            VALUES (?, ?, ?, ?, 1000, 4, 1, 10, 0.7, 'thin_plate', 0.1, '', '{}', 1, 'float64')
+        ''', [(i, f'modelo_{i}', f'dataset_{i % 50}',
+               (inicio + timedelta(seconds=int(rng.integers(0, 10**8)))).strftime('%Y-%m-%d %H:%M:%S'))
+              for i in filas])
+        conexion.executemany('''
+            INSERT INTO configuracion_modelo
+            (entrenamiento_id, centros_radiales, pesos, scaler_params, label_encoder)
+            VALUES (?, ?, ?, NULL, NULL)
+        ''', [(i, centros, pesos) for i in filas])
+        conexion.executemany('''
+            INSERT INTO metricas (entrenamiento_id, conjunto, eg, mae, rmse, converge)
+            VALUES (?, ?, 0.05, 0.05, 0.07, 1)
+        ''', [(i, conjunto) for i in filas for conjunto in ('Entrenamiento', 'Prueba')])
+        conexion.executemany('''
+            INSERT INTO estadisticas_dataset (entrenamiento_id, estadisticas_json) VALUES (?, '{}')
+        ''', [(i,) for i in filas])
+
+
+def mediana_ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--sin-indices', action='store_true',
+                        help='Elimina los índices para comparar con el esquema anterior')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    aleatorio = random.Random(args.semilla)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        storage = StorageManager(os.path.join(directorio, 'bench.db'))
+        conexion = storage._conexiones.obtener()
+        if args.sin_indices:
+            for (nombre,) in conexion.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall():
+                conexion.execute(f'DROP INDEX {nombre}')
+
+        consulta_pagina = ('SELECT id, nombre, dataset_nombre, fecha_creacion FROM entrenamientos '
+                           'ORDER BY fecha_creacion DESC LIMIT 50')
+        for detalle in conexion.execute('EXPLAIN QUERY PLAN ' + consulta_pagina).fetchall():
+            print(f"Plan del listado: {detalle[-1]}")
+        for detalle in conexion.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM metricas WHERE entrenamiento_id = 1').fetchall():
+            print(f"Plan de carga:    {detalle[-1]}")
+        print()
+
+        print(f"{'Entrenamientos':>14} {'Cargar (ms)':>12} {'Eliminar (ms)':>14} "
+              f"{'1ª página (ms)':>15} {'Listar todo (ms)':>17}")
+        total = 0
+        for tamano in sorted(args.tamanos):
+            poblar(storage, total, tamano, rng)
+            total = tamano
+
+            t_cargar = mediana_ms(lambda: storage.cargar_entrenamiento(aleatorio.randint(1, total)),
+                                  args.repeticiones)
+            t_pagina = mediana_ms(lambda: storage.listar_entrenamientos_pagina(limite=50), args.repeticiones)
+            t_listar = mediana_ms(storage.listar_entrenamientos, max(3, args.repeticiones // 10))
+
+            # Eliminar ids distintos (cada uno una sola vez) y reponerlos después
+            eliminados = aleatorio.sample(range(1, total + 1), args.repeticiones)
+            iterador = iter(eliminados)
+            t_eliminar = mediana_ms(lambda: storage.eliminar_entrenamiento(next(iterador)),
+                                    args.repeticiones)
+            for id_eliminado in eliminados:
+                poblar(storage, id_eliminado - 1, id_eliminado, rng)
+
+            print(f"{tamano:>14} {t_cargar:>12.3f} {t_eliminar:>14.3f} {t_pagina:>15.3f} {t_listar:>17.1f}")
+
+        storage.cerrar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: tiempo de arranque en frío de la ruta de predicción
+
+Importa cada módulo en un intérprete nuevo, mide el tiempo de importación y
+verifica que no se carguen dependencias pesadas (matplotlib, pandas,
+scikit-learn, tkinter, PIL). Termina con código 1 si alguna importación de
+la ruta de predicción supera el presupuesto o carga una dependencia pesada.
+
+Uso:
+    python -m benchmarks.bench_arranque [--repeticiones N] [--presupuesto-ms MS]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Módulos de la ruta de predicción (deben importarse solo con NumPy)
+RUTA_PREDICCION = ['rbf_model', 'storage_manager', 'data_handler', 'rbf']
+
+DEPENDENCIAS_PESADAS = ('matplotlib', 'pandas', 'sklearn', 'scipy', 'tkinter', 'PIL')
+
+CODIGO_MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+tiempo = time.perf_counter() - inicio
+print(json.dumps({{
+    'tiempo': tiempo,
+    'cargados': sorted({{m.split('.')[0] for m in sys.modules}} & set({pesadas!r}))
+}}))
+"""
+
+
+def medir_importacion(modulo, repeticiones):
+    """Mide la importación de un módulo en intérpretes nuevos"""
+    codigo = CODIGO_MEDICION.format(modulo=modulo, pesadas=DEPENDENCIAS_PESADAS)
+    tiempos = []
+    cargados = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True,
+                                text=True, check=True).stdout
+        resultado = json.loads(salida)
+        tiempos.append(resultado['tiempo'])
+        cargados = resultado['cargados']
+    return tiempos, cargados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto-ms', type=float, default=300.0,
+                        help='Tiempo máximo (mediana) de importación de cada módulo de la ruta de predicción')
+    parser.add_argument('--modulos', nargs='+', help='Módulos adicionales a medir (sin presupuesto)')
+    args = parser.parse_args()
+
+    # Referencia: el costo de NumPy, del que no se puede prescindir
+    referencia, _ = medir_importacion('numpy', args.repeticiones)
+    print(f"numpy (referencia): {statistics.median(referencia) * 1000:.1f} ms\n")
+
+    print(f"{'Módulo':<20} {'Mediana (ms)':>12} {'Mejor (ms)':>11}  Dependencias pesadas")
+    fallos = 0
+    for modulo in RUTA_PREDICCION + (args.modulos or []):
+        tiempos, cargados = medir_importacion(modulo, args.repeticiones)
+        mediana = statistics.median(tiempos) * 1000
+
+        estado = ''
+        if modulo in RUTA_PREDICCION:
+            if mediana > args.presupuesto_ms or cargados:
+                estado = '  ✗ FUERA DE PRESUPUESTO' if mediana > args.presupuesto_ms else '  ✗'
+                fallos += 1
+        print(f"{modulo:<20} {mediana:>12.1f} {min(tiempos) * 1000:>11.1f}  "
+              f"{', '.join(cargados) or '-'}{estado}")
+
+    print(f"\nPresupuesto: {args.presupuesto_ms:.0f} ms por módulo; "
+          f"{'OK' if not fallos else f'{fallos} fallos'}")
+    return 1 if fallos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
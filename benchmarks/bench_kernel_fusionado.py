@@ -0,0 +1,72 @@
+"""
+Benchmark: kernel fusionado de distancias + activación frente a la ruta en tres etapas
+
+Compara calcular_phi (distancias al cuadrado y ½·d²·ln(d²) en sitio, por
+bloques) con calcular_activaciones(calcular_distancias(...)).
+
+Uso:
+    python -m benchmarks.bench_kernel_fusionado [--patrones N] [--centros K]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from rbf_model import RBFNeuralNetwork
+
+
+def medir(funcion, repeticiones):
+    """Retorna (mejor tiempo en segundos, memoria pico en bytes)"""
+    funcion()  # Calentamiento
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(tiempos), pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patrones', type=int, default=200000)
+    parser.add_argument('--caracteristicas', type=int, default=8)
+    parser.add_argument('--centros', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    X = rng.standard_normal((args.patrones, args.caracteristicas))
+    centros = X[rng.choice(args.patrones, args.centros, replace=False)]
+    red = RBFNeuralNetwork(args.centros)
+
+    def tres_etapas():
+        return red.calcular_activaciones(red.calcular_distancias(X, centros))
+
+    def fusionado():
+        return red.calcular_phi(X, centros)
+
+    diferencia = np.abs(tres_etapas() - fusionado()).max()
+
+    t_base, mem_base = medir(tres_etapas, args.repeticiones)
+    t_fus, mem_fus = medir(fusionado, args.repeticiones)
+
+    print(f"Patrones: {args.patrones}, características: {args.caracteristicas}, centros: {args.centros}")
+    print(f"{'Ruta':<14} {'Tiempo (s)':>12} {'Memoria pico (MB)':>20}")
+    print(f"{'Tres etapas':<14} {t_base:>12.4f} {mem_base / 2**20:>20.1f}")
+    print(f"{'Fusionada':<14} {t_fus:>12.4f} {mem_fus / 2**20:>20.1f}")
+    print(f"Aceleración: {t_base / t_fus:.2f}x, memoria: {mem_base / max(mem_fus, 1):.2f}x menor")
+    print(f"Diferencia máxima absoluta: {diferencia:.3e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: precisión simple (float32) frente a doble (float64)
+
+Entrena la misma red (mismos centros) con dtype='float64' y dtype='float32'
+para cada función de activación y reporta el tiempo de Φ y de predicción,
+la memoria de Φ y la deriva de precisión respecto a float64.
+
+Uso:
+    python -m benchmarks.bench_precision [--patrones N] [--centros K]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rbf_model import RBFNeuralNetwork
+
+
+FUNCIONES = {
+    'thin_plate': {},
+    'gaussiana': {'epsilon': 0.5},
+    'multicuadratica': {'epsilon': 0.5},
+    'multicuadratica_inversa': {'epsilon': 0.5},
+}
+
+
+def mejor_tiempo(funcion, repeticiones):
+    """Mejor tiempo en segundos tras una ejecución de calentamiento"""
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patrones', type=int, default=100000)
+    parser.add_argument('--caracteristicas', type=int, default=8)
+    parser.add_argument('--centros', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    X = rng.standard_normal((args.patrones, args.caracteristicas))
+    y = np.sin(X[:, :1]) + 0.5 * np.cos(X[:, 1:2]) + 0.05 * rng.standard_normal((args.patrones, 1))
+    X32 = X.astype(np.float32)
+    centros = X[rng.choice(args.patrones, args.centros, replace=False)]
+
+    print(f"Patrones: {args.patrones}, características: {args.caracteristicas}, centros: {args.centros}")
+    print(f"{'Función':<24} {'Φ f64 (s)':>10} {'Φ f32 (s)':>10} {'Pred f64':>10} {'Pred f32':>10} "
+          f"{'Φ (MB)':>12} {'EG f64':>10} {'ΔEG rel.':>10} {'Δy máx.':>10}")
+
+    for nombre, parametros in FUNCIONES.items():
+        redes = {}
+        for dtype in ('float64', 'float32'):
+            red = RBFNeuralNetwork(args.centros, funcion_activacion=nombre,
+                                   parametros_activacion=parametros, dtype=dtype, verbosidad=0)
+            # Mismos centros en ambas precisiones para aislar la deriva numérica
+            red.seleccionar_centros = lambda _X, c=centros: c.copy()
+            red.entrenar(X32 if dtype == 'float32' else X, y)
+            red.phi_train = None
+            redes[dtype] = red
+
+        r64, r32 = redes['float64'], redes['float32']
+        t_phi64 = mejor_tiempo(lambda: r64.calcular_phi(X, centros), args.repeticiones)
+        t_phi32 = mejor_tiempo(lambda: r32.calcular_phi(X32, centros), args.repeticiones)
+        t_pred64 = mejor_tiempo(lambda: r64.predecir(X, tamano_lote=20000), args.repeticiones)
+        t_pred32 = mejor_tiempo(lambda: r32.predecir(X32, tamano_lote=20000), args.repeticiones)
+
+        y64 = r64.predecir(X)
+        y32 = r32.predecir(X32)
+        eg64 = r64.calcular_metricas(y, y64)['EG']
+        eg32 = r32.calcular_metricas(y, y32)['EG']
+        memoria = f"{args.patrones * args.centros * 8 / 2**20:.0f}→{args.patrones * args.centros * 4 / 2**20:.0f}"
+
+        print(f"{nombre:<24} {t_phi64:>10.4f} {t_phi32:>10.4f} {t_pred64:>10.4f} {t_pred32:>10.4f} "
+              f"{memoria:>12} {eg64:>10.6f} {(eg32 - eg64) / eg64:>10.2e} "
+              f"{np.abs(y32 - y64).max():>10.2e}")
+
+
+if __name__ == '__main__':
+    main()
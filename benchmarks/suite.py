@@ -0,0 +1,248 @@
+"""
+Suite de benchmarks de las rutas críticas de rbf_model, data_handler y storage_manager
+
+Genera datasets sintéticos sobre una rejilla de tamaños (patrones,
+características, centros), mide cada operación y guarda los resultados en
+JSON. El modo comparar contrasta dos ejecuciones y marca las regresiones.
+Se ejecuta sin interfaz gráfica (no importa Tk).
+
+Uso:
+    python -m benchmarks.suite ejecutar [--salida resultados.json] [--rapido]
+    python -m benchmarks.suite comparar base.json nuevo.json [--umbral 0.1]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Sin pantalla: forzar un backend de matplotlib no interactivo
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import numpy as np
+
+
+REJILLA_COMPLETA = {
+    'patrones': [1000, 10000, 50000],
+    'caracteristicas': [4, 16],
+    'centros': [20, 100],
+}
+
+REJILLA_RAPIDA = {
+    'patrones': [500, 2000],
+    'caracteristicas': [4],
+    'centros': [10, 40],
+}
+
+
+def cronometrar(funcion, repeticiones):
+    """Tiempos (s) de repeticiones ejecuciones tras una de calentamiento"""
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def generar_dataset(n_patrones, n_caracteristicas, semilla):
+    """Dataset sintético de regresión (X, y) con y suave en las entradas"""
+    rng = np.random.default_rng(semilla)
+    X = rng.standard_normal((n_patrones, n_caracteristicas))
+    y = np.sin(X[:, :1]) + 0.5 * np.cos(X[:, 1:2]) + 0.05 * rng.standard_normal((n_patrones, 1))
+    return X, y
+
+
+def medir_caso(n_patrones, n_caracteristicas, n_centros, repeticiones, semilla, directorio):
+    """Mide todas las operaciones para un tamaño de la rejilla"""
+    import pandas as pd
+
+    from data_handler import DataHandler
+    from rbf_model import RBFNeuralNetwork
+    from storage_manager import StorageManager
+
+    X, y = generar_dataset(n_patrones, n_caracteristicas, semilla)
+    red = RBFNeuralNetwork(n_centros, verbosidad=0, medir_memoria=False, semilla=semilla)
+    centros = red.seleccionar_centros(X)
+    distancias = red.calcular_distancias(X, centros)
+
+    operaciones = {
+        'calcular_distancias': lambda: red.calcular_distancias(X, centros),
+        'funcion_activacion': lambda: red.funcion_activacion(distancias),
+        'calcular_phi': lambda: red.calcular_phi(X, centros),
+        'entrenar': lambda: red.entrenar(X, y),
+    }
+
+    resultados = {}
+    for nombre, funcion in operaciones.items():
+        resultados[nombre] = cronometrar(funcion, repeticiones)
+
+    # predecir sobre la red ya entrenada
+    metricas = red.calcular_metricas(y, red.predecir(X))
+    resultados['predecir'] = cronometrar(lambda: red.predecir(X), repeticiones)
+
+    # Dataset en CSV temporal para medir la carga real desde disco
+    ruta_csv = os.path.join(directorio, f"sintetico_{n_patrones}_{n_caracteristicas}.csv")
+    if not os.path.exists(ruta_csv):
+        df = pd.DataFrame(X, columns=[f"x{i}" for i in range(n_caracteristicas)])
+        df['salida'] = y.ravel()
+        df.to_csv(ruta_csv, index=False)
+
+    def cargar():
+        manejador = DataHandler()
+        manejador.cargar_dataset(ruta_csv)
+        return manejador
+
+    manejador = cargar()
+    df = manejador.df
+
+    def preprocesar():
+        manejador.df = df
+        manejador.preprocesar_datos('salida')
+
+    resultados['cargar_dataset'] = cronometrar(cargar, repeticiones)
+    resultados['preprocesar_datos'] = cronometrar(preprocesar, repeticiones)
+
+    storage = StorageManager(os.path.join(directorio, f"bench_{n_patrones}_{n_caracteristicas}_{n_centros}.db"))
+    argumentos = {
+        'nombre': 'bench',
+        'dataset_info': {'nombre': 'sintetico', 'num_patrones': n_patrones,
+                         'num_entradas': n_caracteristicas, 'num_salidas': 1},
+        'config': {'num_centros': n_centros, 'porcentaje_entrenamiento': 1.0,
+                   'funcion_activacion': red.funcion_base.nombre, 'error_optimo': red.error_optimo},
+        'modelo_data': {'centros': red.centros, 'pesos': red.pesos,
+                        'scaler': manejador.get_scaler(), 'label_encoder': None},
+        'metricas_train': metricas,
+        'metricas_test': metricas,
+        'estadisticas': manejador.get_estadisticas(),
+    }
+    ids = []
+    resultados['guardar_entrenamiento'] = cronometrar(
+        lambda: ids.append(storage.guardar_entrenamiento(**argumentos)), repeticiones)
+    resultados['cargar_entrenamiento'] = cronometrar(
+        lambda: storage.cargar_entrenamiento(ids[-1]), repeticiones)
+    resultados['obtener_metadatos'] = cronometrar(
+        lambda: storage.obtener_metadatos(ids[-1]), repeticiones)
+
+    return resultados
+
+
+def ejecutar(args):
+    rejilla = dict(REJILLA_RAPIDA if args.rapido else REJILLA_COMPLETA)
+    for clave in rejilla:
+        if getattr(args, clave):
+            rejilla[clave] = getattr(args, clave)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        for n_patrones in rejilla['patrones']:
+            for n_caracteristicas in rejilla['caracteristicas']:
+                for n_centros in rejilla['centros']:
+                    if n_centros > n_patrones:
+                        continue
+                    print(f"n={n_patrones}, d={n_caracteristicas}, k={n_centros}...", file=sys.stderr)
+                    medidos = medir_caso(n_patrones, n_caracteristicas, n_centros,
+                                         args.repeticiones, args.semilla, directorio)
+                    for operacion, tiempos in medidos.items():
+                        resultados.append({
+                            'operacion': operacion,
+                            'patrones': n_patrones,
+                            'caracteristicas': n_caracteristicas,
+                            'centros': n_centros,
+                            'mejor': min(tiempos),
+                            'mediana': statistics.median(tiempos),
+                            'tiempos': tiempos
+                        })
+
+    salida = {
+        'metadatos': {
+            'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+            'nucleos': os.cpu_count(),
+            'repeticiones': args.repeticiones,
+            'semilla': args.semilla,
+        },
+        'resultados': resultados
+    }
+
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(salida, f, indent=2)
+
+    print(f"{'Operación':<24} {'n':>7} {'d':>4} {'k':>5} {'Mediana (s)':>12} {'Mejor (s)':>12}")
+    for r in resultados:
+        print(f"{r['operacion']:<24} {r['patrones']:>7} {r['caracteristicas']:>4} {r['centros']:>5} "
+              f"{r['mediana']:>12.5f} {r['mejor']:>12.5f}")
+    print(f"\nResultados guardados en {args.salida}")
+    return 0
+
+
+def comparar(args):
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding='utf-8') as f:
+        nuevo = json.load(f)
+
+    def clave(r):
+        return (r['operacion'], r['patrones'], r['caracteristicas'], r['centros'])
+
+    referencia = {clave(r): r for r in base['resultados']}
+    regresiones = 0
+
+    print(f"{'Operación':<24} {'n':>7} {'d':>4} {'k':>5} {'Base (s)':>10} {'Nuevo (s)':>10} {'Razón':>7}  Estado")
+    for r in nuevo['resultados']:
+        anterior = referencia.get(clave(r))
+        if anterior is None:
+            continue
+        razon = r[args.estadistico] / max(anterior[args.estadistico], 1e-12)
+        if razon > 1 + args.umbral:
+            estado = 'REGRESIÓN'
+            regresiones += 1
+        elif razon < 1 - args.umbral:
+            estado = 'mejora'
+        else:
+            estado = ''
+        print(f"{r['operacion']:<24} {r['patrones']:>7} {r['caracteristicas']:>4} {r['centros']:>5} "
+              f"{anterior[args.estadistico]:>10.5f} {r[args.estadistico]:>10.5f} {razon:>7.2f}  {estado}")
+
+    print(f"\n{regresiones} regresiones (umbral {args.umbral:.0%}, estadístico: {args.estadistico})")
+    # Código de salida distinto de cero para integración continua
+    return 1 if regresiones else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    parser_ejecutar = subparsers.add_parser('ejecutar', help='Ejecuta la suite y guarda los resultados en JSON')
+    parser_ejecutar.add_argument('--salida', default='benchmarks_resultados.json')
+    parser_ejecutar.add_argument('--rapido', action='store_true', help='Rejilla pequeña para pruebas rápidas')
+    parser_ejecutar.add_argument('--patrones', type=int, nargs='+')
+    parser_ejecutar.add_argument('--caracteristicas', type=int, nargs='+')
+    parser_ejecutar.add_argument('--centros', type=int, nargs='+')
+    parser_ejecutar.add_argument('--repeticiones', type=int, default=5)
+    parser_ejecutar.add_argument('--semilla', type=int, default=0)
+
+    parser_comparar = subparsers.add_parser('comparar', help='Compara dos ejecuciones y marca regresiones')
+    parser_comparar.add_argument('base')
+    parser_comparar.add_argument('nuevo')
+    parser_comparar.add_argument('--umbral', type=float, default=0.10,
+                                 help='Variación relativa a partir de la cual se marca (por defecto 0.10)')
+    parser_comparar.add_argument('--estadistico', choices=('mediana', 'mejor'), default='mediana')
+
+    args = parser.parse_args()
+    if args.comando == 'ejecutar':
+        return ejecutar(args)
+    return comparar(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
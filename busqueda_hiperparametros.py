@@ -0,0 +1,330 @@
+"""
+Búsqueda de hiperparámetros para la Red Neuronal RBF
+Rejilla, búsqueda aleatoria y reducción sucesiva (successive halving)
+sobre número de centros y función de activación
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from funciones_base import crear_funcion_base
+from motor_distancias import crear_motor_distancias
+from prediccion_paralela import copiar_a_memoria_compartida
+from seleccion_centros import seleccionar_centros
+from solucionador import (AcumuladorNormal, resolver_ecuaciones_normales, resolver_triangular,
+                          residuo_desde_gram, CONDICION_MAXIMA_NORMALES)
+
+
+MODOS_BUSQUEDA = ('rejilla', 'aleatoria', 'halving')
+
+# Estrategias cuyos primeros k centros son a su vez una selección válida de k
+# centros: permiten evaluar todos los tamaños con una sola factorización
+ESTRATEGIAS_ANIDADAS = ('aleatoria', 'kmeans++')
+
+# Estado de cada proceso trabajador (se fija en el inicializador)
+_estado_trabajador = {}
+
+
+def buscar_hiperparametros(X, y, espacio, modo='rejilla', X_val=None, y_val=None,
+                           fraccion_validacion=0.2, error_optimo=0.1, n_ensayos=20, eta=3,
+                           estrategia_centros='aleatoria', semilla=None, n_trabajadores=None,
+                           motor_distancias='vectorizado', storage=None, dataset_nombre=''):
+    """
+    Busca el número de centros y la función de activación con menor error de validación
+
+    Todos los ensayos comparten los mismos centros: se seleccionan una vez con
+    el máximo número de centros del espacio y cada ensayo con k centros usa los
+    k primeros. Así las distancias al cuadrado se calculan una sola vez para
+    toda la búsqueda, y cada función de activación factoriza con Cholesky solo
+    la matriz G del mayor k: el bloque principal (k+1)×(k+1) del factor es el
+    factor de Cholesky del problema con k centros, por lo que los tamaños
+    menores cuestan una sustitución triangular cada uno.
+
+    Los ensayos se agrupan por función de activación y cada grupo se ejecuta
+    en un proceso; las matrices de distancias se comparten por memoria compartida.
+
+    Args:
+        X: Patrones de entrenamiento (n_patrones, n_caracteristicas)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+        espacio: dict con 'num_centros' (lista de enteros) y 'funciones'
+                 ({nombre: {parametro: [valores]}}, p. ej.
+                 {'thin_plate': {}, 'gaussiana': {'epsilon': [0.5, 1.0, 2.0]}})
+        modo: 'rejilla', 'aleatoria' o 'halving'
+        X_val, y_val: Conjunto de validación; si es None se reserva
+                      fraccion_validacion de los patrones
+        fraccion_validacion: Fracción de validación cuando no se indica X_val
+        error_optimo: Error de aproximación objetivo (EG)
+        n_ensayos: Ensayos a muestrear en modo 'aleatoria'
+        eta: Factor de reducción del modo 'halving' (se conserva 1/eta por ronda)
+        estrategia_centros: 'aleatoria' o 'kmeans++'
+        semilla: Semilla del generador aleatorio
+        n_trabajadores: Procesos en paralelo (por defecto, núcleos disponibles)
+        motor_distancias: Motor usado para las distancias
+        storage: StorageManager opcional donde registrar la búsqueda y sus ensayos
+        dataset_nombre: Nombre del dataset para el registro
+
+    Returns:
+        dict con 'mejor' (ensayo elegido), 'ensayos' (todos los ensayos),
+        'tiempo' y 'busqueda_id' (None si no se indicó storage)
+    """
+    if modo not in MODOS_BUSQUEDA:
+        raise ValueError(f"Modo de búsqueda no soportado: {modo}. "
+                         f"Opciones: {', '.join(MODOS_BUSQUEDA)}")
+    if estrategia_centros not in ESTRATEGIAS_ANIDADAS:
+        raise ValueError(f"La búsqueda requiere una estrategia de centros anidada: "
+                         f"{', '.join(ESTRATEGIAS_ANIDADAS)}")
+    if eta < 2:
+        raise ValueError("eta debe ser al menos 2")
+
+    inicio = time.perf_counter()
+    rng = np.random.RandomState(semilla) if semilla is not None else np.random
+
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float).reshape(len(X), -1)
+    if X_val is None:
+        permutacion = rng.permutation(len(X))
+        n_val = max(1, int(round(len(X) * fraccion_validacion)))
+        X_val, y_val = X[permutacion[:n_val]], y[permutacion[:n_val]]
+        X, y = X[permutacion[n_val:]], y[permutacion[n_val:]]
+    X_val = np.asarray(X_val, dtype=float)
+    y_val = np.asarray(y_val, dtype=float).reshape(len(X_val), -1)
+
+    funciones = _expandir_funciones(espacio['funciones'])
+    tamanos = sorted(set(int(k) for k in espacio['num_centros']))
+    if not funciones or not tamanos:
+        raise ValueError("El espacio de búsqueda está vacío")
+    if tamanos[0] < 1 or tamanos[-1] > len(X):
+        raise ValueError(f"num_centros debe estar entre 1 y {len(X)}")
+
+    # Centros compartidos por todos los ensayos y distancias calculadas una vez
+    motor = crear_motor_distancias(motor_distancias)
+    centros = seleccionar_centros(X, tamanos[-1], estrategia_centros, semilla, motor)
+
+    # Orden aleatorio de filas: los primeros n patrones son un subconjunto
+    # aleatorio (usado por las rondas de 'halving')
+    orden = rng.permutation(len(X))
+    datos = {
+        'd2_train': motor.distancias_cuadradas(X[orden], centros),
+        'y_train': y[orden],
+        'd2_val': motor.distancias_cuadradas(X_val, centros),
+        'y_val': y_val
+    }
+
+    candidatos = [(f, k) for f in range(len(funciones)) for k in tamanos]
+    if modo == 'aleatoria':
+        elegidos = rng.choice(len(candidatos), min(n_ensayos, len(candidatos)), replace=False)
+        candidatos = [candidatos[i] for i in sorted(elegidos)]
+
+    if modo == 'halving':
+        rondas = _rondas_halving(len(candidatos), len(X), tamanos[-1], eta)
+    else:
+        rondas = [len(X)]
+
+    ensayos = []
+    ronda = 0
+    with _Evaluador(datos, n_trabajadores, len(funciones)) as evaluador:
+        while True:
+            resultados = evaluador.evaluar(funciones, candidatos, rondas[ronda], error_optimo)
+            for ensayo in resultados:
+                ensayo['ronda'] = ronda
+            ensayos.extend(resultados)
+
+            if ronda == len(rondas) - 1:
+                break
+
+            resultados.sort(key=lambda e: e['eg_validacion'])
+            conservar = max(1, len(resultados) // eta)
+            candidatos = [(e['indice_funcion'], e['num_centros']) for e in resultados[:conservar]]
+            # Con un único superviviente se pasa directamente a la ronda completa
+            ronda = len(rondas) - 1 if len(candidatos) == 1 else ronda + 1
+
+    for ensayo in ensayos:
+        del ensayo['indice_funcion']
+
+    ultima_ronda = max(e['ronda'] for e in ensayos)
+    mejor = elegir_mejor_ensayo([e for e in ensayos if e['ronda'] == ultima_ronda], error_optimo)
+    tiempo = time.perf_counter() - inicio
+
+    busqueda_id = None
+    if storage is not None:
+        busqueda_id = storage.guardar_busqueda(modo, dataset_nombre, espacio, ensayos, mejor, tiempo)
+
+    return {'mejor': mejor, 'ensayos': ensayos, 'tiempo': tiempo, 'busqueda_id': busqueda_id}
+
+
+def elegir_mejor_ensayo(ensayos, error_optimo):
+    """
+    Elige el ensayo con menos centros que converge en validación
+
+    Si ninguno alcanza error_optimo se elige el de menor EG de validación.
+    """
+    convergentes = [e for e in ensayos if e['eg_validacion'] <= error_optimo]
+    if convergentes:
+        return min(convergentes, key=lambda e: (e['num_centros'], e['eg_validacion']))
+    return min(ensayos, key=lambda e: e['eg_validacion'])
+
+
+def evaluar_grupo(funcion, parametros, tamanos, n_patrones, datos, error_optimo):
+    """
+    Evalúa una función de activación para varios números de centros
+
+    Args:
+        funcion: Nombre de la función de activación
+        parametros: Parámetros de la función
+        tamanos: Números de centros a evaluar (los k primeros centros)
+        n_patrones: Patrones de entrenamiento a usar (los primeros)
+        datos: dict con 'd2_train', 'y_train', 'd2_val' e 'y_val'
+        error_optimo: Error de aproximación objetivo
+
+    Returns:
+        Lista de ensayos (dict) en el orden de tamanos
+    """
+    inicio = time.perf_counter()
+    funcion_base = crear_funcion_base(funcion, **parametros)
+    k_max = max(tamanos)
+
+    y_train = datos['y_train'][:n_patrones]
+    y_val = datos['y_val']
+    phi = funcion_base.desde_cuadradas(datos['d2_train'][:n_patrones, :k_max])
+    phi_val = funcion_base.desde_cuadradas(datos['d2_val'][:, :k_max])
+
+    acumulador = AcumuladorNormal(k_max, y_train.shape[1])
+    acumulador.agregar(phi, y_train)
+    G, b = acumulador.G, acumulador.b
+
+    # Un único factor de Cholesky para todos los tamaños anidados
+    try:
+        L = np.linalg.cholesky(G)
+        z = resolver_triangular(L, b, inferior=True)
+        diagonal = np.abs(np.diag(L))
+    except np.linalg.LinAlgError:
+        L = None
+
+    tiempo_comun = (time.perf_counter() - inicio) / len(tamanos)
+    ensayos = []
+
+    for k in tamanos:
+        inicio = time.perf_counter()
+        m = k + 1
+        condicion = float(diagonal[:m].max() / diagonal[:m].min()) if L is not None else np.inf
+
+        if condicion <= CONDICION_MAXIMA_NORMALES:
+            pesos = resolver_triangular(L[:m, :m].T, z[:m], inferior=False)
+            metodo = 'cholesky'
+        else:
+            # Bloque mal condicionado o G no definida positiva: SVD de ese bloque
+            pesos, info = resolver_ecuaciones_normales(G[:m, :m], b[:m], metodo='svd')
+            condicion, metodo = info['condicion'], info['metodo']
+
+        residuo = residuo_desde_gram(G[:m, :m], b[:m], pesos, acumulador.yty)
+        y_pred = phi[:, :k] @ pesos[1:] + pesos[0]
+        y_pred_val = phi_val[:, :k] @ pesos[1:] + pesos[0]
+
+        # Mismas definiciones que RBFNeuralNetwork.calcular_metricas
+        eg_val = float(np.sum(np.abs(y_val - y_pred_val)) / len(y_val))
+        ensayos.append({
+            'funcion_activacion': funcion,
+            'parametros_activacion': dict(funcion_base.parametros),
+            'num_centros': k,
+            'num_patrones': n_patrones,
+            'metodo': metodo,
+            'condicion': condicion,
+            'eg_entrenamiento': float(np.sum(np.abs(y_train - y_pred)) / n_patrones),
+            'rmse_entrenamiento': residuo / np.sqrt(y_train.size),
+            'eg_validacion': eg_val,
+            'rmse_validacion': float(np.sqrt(np.mean((y_val - y_pred_val) ** 2))),
+            'converge': eg_val <= error_optimo,
+            'tiempo': tiempo_comun + time.perf_counter() - inicio
+        })
+
+    return ensayos
+
+
+class _Evaluador:
+    """Ejecuta los grupos de ensayos en el proceso actual o en un grupo de procesos"""
+
+    def __init__(self, datos, n_trabajadores, n_funciones):
+        self.datos = datos
+        self.n_trabajadores = min(n_trabajadores or os.cpu_count() or 1, n_funciones)
+        self.grupo = None
+        self.memorias = []
+
+    def __enter__(self):
+        if self.n_trabajadores > 1:
+            arrays = {}
+            for nombre, array in self.datos.items():
+                shm, forma = copiar_a_memoria_compartida(array)
+                self.memorias.append(shm)
+                arrays[nombre] = (shm.name, forma)
+            self.grupo = ProcessPoolExecutor(max_workers=self.n_trabajadores,
+                                             initializer=_inicializar_trabajador,
+                                             initargs=(arrays,))
+        return self
+
+    def __exit__(self, *excepcion):
+        if self.grupo is not None:
+            self.grupo.shutdown()
+        for shm in self.memorias:
+            shm.close()
+            shm.unlink()
+
+    def evaluar(self, funciones, candidatos, n_patrones, error_optimo):
+        """Evalúa los candidatos (indice_funcion, num_centros) agrupados por función"""
+        grupos = {}
+        for indice, k in candidatos:
+            grupos.setdefault(indice, []).append(k)
+
+        tareas = [(funciones[i][0], funciones[i][1], sorted(tamanos), n_patrones, error_optimo)
+                  for i, tamanos in grupos.items()]
+        if self.grupo is None:
+            resultados = [evaluar_grupo(*tarea[:4], self.datos, tarea[4]) for tarea in tareas]
+        else:
+            resultados = list(self.grupo.map(_tarea_proceso, tareas))
+
+        ensayos = []
+        for indice, grupo in zip(grupos, resultados):
+            for ensayo in grupo:
+                ensayo['indice_funcion'] = indice
+            ensayos.extend(grupo)
+        return ensayos
+
+
+def _expandir_funciones(funciones):
+    """Producto cartesiano de los valores de cada parámetro: [(nombre, parametros)]"""
+    expandidas = []
+    for nombre, parametros in funciones.items():
+        claves = list(parametros)
+        valores = [parametros[c] if isinstance(parametros[c], (list, tuple)) else [parametros[c]]
+                   for c in claves]
+        for combinacion in itertools.product(*valores):
+            expandidas.append((nombre, dict(zip(claves, combinacion))))
+    return expandidas
+
+
+def _rondas_halving(n_candidatos, n_patrones, k_max, eta):
+    """Patrones usados en cada ronda: crecen eta veces hasta usar todos en la última"""
+    n_rondas = 1 + int(np.floor(np.log(max(n_candidatos, 1)) / np.log(eta)))
+    minimo = min(n_patrones, 2 * (k_max + 1))
+    return [max(minimo, n_patrones // eta ** (n_rondas - 1 - r)) for r in range(n_rondas)]
+
+
+def _inicializar_trabajador(arrays):
+    """Abre la memoria compartida una vez por proceso"""
+    datos = {}
+    for nombre, (nombre_shm, forma) in arrays.items():
+        shm = shared_memory.SharedMemory(name=nombre_shm)
+        # Mantener la referencia para que el buffer siga válido
+        _estado_trabajador.setdefault('memorias', []).append(shm)
+        datos[nombre] = np.ndarray(forma, dtype=float, buffer=shm.buf)
+    _estado_trabajador['datos'] = datos
+
+
+def _tarea_proceso(tarea):
+    funcion, parametros, tamanos, n_patrones, error_optimo = tarea
+    return evaluar_grupo(funcion, parametros, tamanos, n_patrones,
+                         _estado_trabajador['datos'], error_optimo)
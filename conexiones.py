@@ -0,0 +1,114 @@
+"""
+Grupo de conexiones SQLite para el gestor de persistencia
+Una conexión persistente por hilo, con WAL y pragmas configurables
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+MODOS_SYNCHRONOUS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+class _Conexion(sqlite3.Connection):
+    """Conexión con soporte de referencias débiles (para poder cerrarlas todas)"""
+
+
+class GrupoConexiones:
+    """
+    Conexiones SQLite persistentes, una por hilo
+
+    Cada hilo reutiliza su propia conexión (sqlite3 no permite compartirlas
+    entre hilos), de modo que no se paga la apertura en cada operación y la
+    caché de sentencias preparadas de la conexión se aprovecha entre
+    llamadas. En modo WAL los lectores leen una instantánea consistente y no
+    esperan a que termine una escritura (p. ej. el guardado de un
+    entrenamiento); solo los escritores se serializan entre sí.
+    """
+
+    def __init__(self, db_path, wal=True, synchronous='NORMAL', cache_size_mb=16,
+                 cached_statements=128, timeout=30.0):
+        """
+        Args:
+            db_path: Ruta a la base de datos
+            wal: Usar journal_mode=WAL (lectores concurrentes con un escritor)
+            synchronous: PRAGMA synchronous ('OFF', 'NORMAL', 'FULL', 'EXTRA');
+                         con WAL, 'NORMAL' es seguro ante caídas de la aplicación
+            cache_size_mb: Caché de páginas por conexión en MB
+            cached_statements: Sentencias preparadas que conserva cada conexión
+            timeout: Segundos de espera cuando otro escritor tiene el bloqueo
+        """
+        synchronous = synchronous.upper()
+        if synchronous not in MODOS_SYNCHRONOUS:
+            raise ValueError(f"Modo synchronous no soportado: {synchronous}. "
+                             f"Opciones: {', '.join(MODOS_SYNCHRONOUS)}")
+
+        self.db_path = db_path
+        self.wal = wal
+        self.synchronous = synchronous
+        self.cache_size_mb = cache_size_mb
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._conexiones = weakref.WeakSet()
+        self._candado = threading.Lock()
+
+    def obtener(self):
+        """Conexión del hilo actual (se crea en el primer uso)"""
+        conexion = getattr(self._local, 'conexion', None)
+        # Tras un fork el proceso hijo no debe reutilizar la conexión del padre
+        if conexion is None or self._local.pid != os.getpid():
+            conexion = self._conectar()
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Cursor dentro de una transacción: confirma al salir o revierte si hay error
+        """
+        conexion = self.obtener()
+        cursor = conexion.cursor()
+        try:
+            yield cursor
+            conexion.commit()
+        except BaseException:
+            conexion.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def cerrar(self):
+        """Cierra todas las conexiones abiertas (de cualquier hilo)"""
+        with self._candado:
+            conexiones = list(self._conexiones)
+            self._conexiones.clear()
+        for conexion in conexiones:
+            try:
+                conexion.close()
+            except sqlite3.ProgrammingError:
+                # Conexión creada en otro hilo que sigue vivo: se cierra al terminar ese hilo
+                pass
+        self._local = threading.local()
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   cached_statements=self.cached_statements,
+                                   factory=_Conexion)
+        if self.wal:
+            conexion.execute('PRAGMA journal_mode=WAL')
+        conexion.execute(f'PRAGMA synchronous={self.synchronous}')
+        # Valor negativo: tamaño en KiB en lugar de en páginas
+        conexion.execute(f'PRAGMA cache_size={-int(self.cache_size_mb * 1024)}')
+        conexion.execute('PRAGMA temp_store=MEMORY')
+        # Necesario para ON DELETE CASCADE (SQLite lo desactiva por defecto)
+        conexion.execute('PRAGMA foreign_keys=ON')
+
+        with self._candado:
+            self._conexiones.add(conexion)
+        return conexion
@@ -1,17 +1,25 @@
 """
 Manejador de Datasets para Red Neuronal RBF
 Carga, preprocesa y divide los datos
+
+pandas y scikit-learn se importan dentro de los métodos que los usan, de modo
+que importar este módulo (p. ej. solo para predecir) no paga su costo de carga.
 """
 
-import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
 import os
 
 class DataHandler:
-    def __init__(self):
-        """Inicializa el manejador de datos"""
+    def __init__(self, dtype='float64'):
+        """
+        Inicializa el manejador de datos
+        
+        Args:
+            dtype: Tipo de datos de las entradas preprocesadas ('float64' o 'float32').
+                   La imputación y la normalización se calculan en float64 y el
+                   resultado se convierte al final
+        """
+        self.dtype = np.dtype(dtype)
         self.df = None
         self.X = None
         self.y = None
@@ -19,7 +27,7 @@ class DataHandler:
         self.X_test = None
         self.y_train = None
         self.y_test = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.label_encoder = None
         self.estadisticas = {}
         self.dataset_info = {}
@@ -35,6 +43,8 @@ class DataHandler:
         Returns:
             dict con información del dataset
         """
+        import pandas as pd
+        
         extension = os.path.splitext(ruta_archivo)[1].lower()
         
         try:
@@ -89,6 +99,10 @@ class DataHandler:
         Returns:
             dict con información del preprocesamiento
         """
+        import pandas as pd
+        from sklearn.preprocessing import StandardScaler, LabelEncoder
+        from sklearn.impute import SimpleImputer
+        
         if self.df is None:
             raise ValueError("No hay dataset cargado")
         
@@ -123,13 +137,14 @@ class DataHandler:
             self.y = self.y.reshape(-1, 1)
         
         # Manejar valores faltantes (rellenar con la media)
-        from sklearn.impute import SimpleImputer
         imputer = SimpleImputer(strategy='mean')
         self.X = imputer.fit_transform(self.X)
         
         # Normalizar/Estandarizar variables de entrada
+        self.scaler = StandardScaler()
         if normalizar:
             self.X = self.scaler.fit_transform(self.X)
+        self.X = self.X.astype(self.dtype, copy=False)
         
         # Calcular estadísticas
         self.estadisticas = {
@@ -174,6 +189,8 @@ class DataHandler:
         Returns:
             dict con información de la división
         """
+        from sklearn.model_selection import train_test_split
+        
         if self.X is None or self.y is None:
             raise ValueError("Debe preprocesar los datos primero")
         
@@ -198,6 +215,162 @@ class DataHandler:
         
         return info_division
     
+    def generar_pliegues(self, num_pliegues=5, semilla=42):
+        """
+        Reparte los patrones preprocesados en pliegues para validación cruzada
+        
+        En clasificación los pliegues se estratifican por clase.
+        
+        Args:
+            num_pliegues: Número de pliegues
+            semilla: Semilla para reproducibilidad
+            
+        Returns:
+            Lista de arrays con los índices de validación de cada pliegue
+        """
+        from sklearn.model_selection import KFold, StratifiedKFold
+        
+        if self.X is None or self.y is None:
+            raise ValueError("Debe preprocesar los datos primero")
+        
+        if self.es_clasificacion:
+            etiquetas = self.y.argmax(axis=1) if self.y.ndim > 1 else self.y
+            divisor = StratifiedKFold(n_splits=num_pliegues, shuffle=True, random_state=semilla)
+            return [indices for _, indices in divisor.split(self.X, etiquetas)]
+        
+        divisor = KFold(n_splits=num_pliegues, shuffle=True, random_state=semilla)
+        return [indices for _, indices in divisor.split(self.X)]
+    
+    def ajustar_por_bloques(self, ruta_archivo, columna_salida, tamano_bloque=10000, 
+                            normalizar=True):
+        """
+        Primera pasada sobre un CSV grande: ajusta el scaler y calcula
+        estadísticas sin cargar el archivo completo en memoria
+        
+        Solo admite columnas numéricas (la codificación one-hot no puede
+        decidirse bloque a bloque).
+        
+        Args:
+            ruta_archivo: Ruta al archivo CSV
+            columna_salida: Nombre de la columna objetivo/salida
+            tamano_bloque: Número de filas por bloque
+            normalizar: Si normalizar las variables de entrada
+            
+        Returns:
+            dict con estadísticas del dataset
+        """
+        if os.path.splitext(ruta_archivo)[1].lower() != '.csv':
+            raise ValueError("La lectura por bloques solo soporta archivos CSV")
+        
+        import pandas as pd
+        from sklearn.preprocessing import StandardScaler
+        
+        self.scaler = StandardScaler()
+        suma_X = None
+        conteo_X = None
+        n_patrones = 0
+        suma_y = 0.0
+        suma_y2 = 0.0
+        min_y = np.inf
+        max_y = -np.inf
+        
+        for bloque in pd.read_csv(ruta_archivo, chunksize=tamano_bloque):
+            if columna_salida not in bloque.columns:
+                raise ValueError(f"La columna '{columna_salida}' no existe en el dataset")
+            
+            X_df = bloque.drop(columns=[columna_salida])
+            no_numericas = X_df.select_dtypes(exclude=[np.number]).columns
+            if len(no_numericas) > 0 or not pd.api.types.is_numeric_dtype(bloque[columna_salida]):
+                raise ValueError("La lectura por bloques requiere columnas numéricas")
+            
+            X = X_df.to_numpy(dtype=float)
+            y = bloque[columna_salida].to_numpy(dtype=float)
+            
+            if suma_X is None:
+                suma_X = np.zeros(X.shape[1])
+                conteo_X = np.zeros(X.shape[1])
+                columnas_entrada = list(X_df.columns)
+            
+            # Medias por columna ignorando faltantes (para imputar)
+            validos = ~np.isnan(X)
+            suma_X += np.where(validos, X, 0.0).sum(axis=0)
+            conteo_X += validos.sum(axis=0)
+            
+            if normalizar:
+                self.scaler.partial_fit(X)
+            
+            n_patrones += len(bloque)
+            suma_y += float(y.sum())
+            suma_y2 += float((y ** 2).sum())
+            min_y = min(min_y, float(y.min()))
+            max_y = max(max_y, float(y.max()))
+        
+        if n_patrones == 0:
+            raise ValueError("El archivo no contiene patrones")
+        
+        self._medias_imputacion = suma_X / np.maximum(conteo_X, 1)
+        self._normalizar_bloques = normalizar
+        self.es_clasificacion = False
+        
+        media_y = suma_y / n_patrones
+        self.estadisticas = {
+            'num_entradas': len(columnas_entrada),
+            'num_salidas': 1,
+            'es_clasificacion': False,
+            'rango_y': {
+                'min': min_y,
+                'max': max_y,
+                'media': media_y,
+                'std': float(np.sqrt(max(suma_y2 / n_patrones - media_y ** 2, 0.0)))
+            }
+        }
+        
+        self.dataset_info = {
+            'nombre': os.path.basename(ruta_archivo),
+            'num_patrones': n_patrones,
+            'num_columnas': len(columnas_entrada) + 1,
+            'columnas': columnas_entrada + [columna_salida],
+            'num_entradas': len(columnas_entrada),
+            'num_salidas': 1
+        }
+        
+        return self.estadisticas
+    
+    def iterar_bloques(self, ruta_archivo, columna_salida, tamano_bloque=10000):
+        """
+        Lee un CSV por bloques y genera (X, y) preprocesados
+        
+        Requiere haber llamado antes a ajustar_por_bloques. Para entrenar con
+        RBFNeuralNetwork.entrenar_por_bloques puede pasarse
+        lambda: handler.iterar_bloques(ruta, columna).
+        
+        Args:
+            ruta_archivo: Ruta al archivo CSV
+            columna_salida: Nombre de la columna objetivo/salida
+            tamano_bloque: Número de filas por bloque
+            
+        Yields:
+            Tuplas (X_bloque, y_bloque) con y de forma (n_bloque, 1)
+        """
+        if not hasattr(self, '_medias_imputacion'):
+            raise ValueError("Debe ajustar el dataset por bloques primero")
+        
+        import pandas as pd
+        
+        for bloque in pd.read_csv(ruta_archivo, chunksize=tamano_bloque):
+            X = bloque.drop(columns=[columna_salida]).to_numpy(dtype=float)
+            y = bloque[columna_salida].to_numpy(dtype=float).reshape(-1, 1)
+            
+            # Rellenar faltantes con la media global
+            faltantes = np.isnan(X)
+            if faltantes.any():
+                X[faltantes] = np.take(self._medias_imputacion, np.nonzero(faltantes)[1])
+            
+            if self._normalizar_bloques:
+                X = self.scaler.transform(X)
+            
+            yield X.astype(self.dtype, copy=False), y
+    
     def get_datos_entrenamiento(self):
         """Retorna los datos de entrenamiento"""
         if self.X_train is None:
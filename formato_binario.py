@@ -0,0 +1,261 @@
+"""
+Formato binario de arrays para la persistencia de la Red Neuronal RBF
+Buffers little-endian con una cabecera mínima de dtype y forma, leídos sin copia
+
+Un BLOB es un paquete de arrays con nombre:
+
+    MAGIA (4 bytes) | número de arrays (uint32)
+    por cada array:
+        longitud del nombre (uint16) | nombre (utf-8)
+        longitud del dtype (uint8) | dtype (p. ej. '<f8') | ndim (uint8) | forma (ndim × uint64)
+        relleno hasta múltiplo de 16 | datos en orden C
+
+Todos los enteros de la cabecera son little-endian. Los datos quedan
+alineados a 16 bytes, por lo que np.frombuffer los expone sin copiar (como
+arrays de solo lectura). El escalador y el codificador de etiquetas se
+guardan como sus arrays (mean_, scale_, classes_...) y se reconstruyen con
+clases ligeras que no requieren scikit-learn. Los BLOBs sin la marca son
+filas antiguas serializadas con pickle: como cargarlas puede ejecutar código
+arbitrario, solo se leen con permitir_pickle=True (bases de datos de
+confianza) y pueden convertirse al formato binario con
+StorageManager.convertir_blobs_pickle.
+
+Las bases de datos creadas antes del formato binario (incluida la de
+ejemplo en database/) no cargan sus modelos hasta convertirlas, una sola
+vez y solo si son de confianza:
+
+    python -m rbf --db ruta/a/la/base.db convertir-pickle
+"""
+
+import math
+import pickle
+import struct
+
+import numpy as np
+
+
+MAGIA = b'RBF\x01'
+ALINEACION = 16
+
+# Atributos de estado del escalador y del codificador que se guardan como arrays
+ATRIBUTOS_ESCALADOR = ('mean_', 'scale_', 'var_', 'n_samples_seen_')
+ATRIBUTOS_CODIFICADOR = ('classes_',)
+
+# Marca del tipo de objeto dentro del paquete
+_CLAVE_TIPO = '__tipo__'
+
+
+class EscaladorEstandar:
+    """
+    Estandarizador reconstruido desde sus arrays: (X - mean_) / scale_
+
+    Equivale a transform/inverse_transform de sklearn StandardScaler. Sin
+    mean_ ni scale_ (escalador sin ajustar) actúa como identidad.
+    """
+
+    def __init__(self, mean_=None, scale_=None, var_=None, n_samples_seen_=None):
+        self.mean_ = mean_
+        self.scale_ = scale_
+        self.var_ = var_
+        self.n_samples_seen_ = n_samples_seen_
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.mean_ is not None:
+            X = X - self.mean_
+        if self.scale_ is not None:
+            X = X / self.scale_
+        return X
+
+    def inverse_transform(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.scale_ is not None:
+            X = X * self.scale_
+        if self.mean_ is not None:
+            X = X + self.mean_
+        return X
+
+
+class CodificadorEtiquetas:
+    """Codificador de etiquetas reconstruido desde classes_ (como sklearn LabelEncoder)"""
+
+    def __init__(self, classes_):
+        self.classes_ = classes_
+
+    def transform(self, y):
+        y = np.asarray(y)
+        indices = np.searchsorted(self.classes_, y)
+        indices_validos = np.clip(indices, 0, len(self.classes_) - 1)
+        desconocidas = self.classes_[indices_validos] != y
+        if np.any(desconocidas):
+            raise ValueError(f"Etiquetas no vistas en el entrenamiento: {np.unique(y[desconocidas])}")
+        return indices
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices)]
+
+
+def serializar_arrays(arrays):
+    """
+    Serializa un dict {nombre: array} al formato binario
+
+    Args:
+        arrays: dict de arrays (o escalares) NumPy no objeto
+
+    Returns:
+        bytes
+    """
+    partes = [MAGIA, struct.pack('<I', len(arrays))]
+    posicion = len(MAGIA) + 4
+
+    for nombre, array in arrays.items():
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise TypeError(f"El array '{nombre}' es de tipo objeto y no admite formato binario")
+        # Orden de bytes little-endian explícito y datos contiguos en orden C
+        array = array.astype(array.dtype.newbyteorder('<'), order='C', copy=False)
+
+        nombre_bytes = nombre.encode('utf-8')
+        dtype_bytes = array.dtype.str.encode('ascii')
+        cabecera = (struct.pack('<H', len(nombre_bytes)) + nombre_bytes
+                    + struct.pack('<B', len(dtype_bytes)) + dtype_bytes
+                    + struct.pack('<B', array.ndim)
+                    + struct.pack(f'<{array.ndim}Q', *array.shape))
+        posicion += len(cabecera)
+        relleno = -posicion % ALINEACION
+
+        partes += [cabecera, b'\x00' * relleno, array.tobytes()]
+        posicion += relleno + array.nbytes
+
+    return b''.join(partes)
+
+
+def deserializar_arrays(blob):
+    """
+    Lee un paquete de arrays sin copiar los datos
+
+    Args:
+        blob: bytes (o memoryview) producido por serializar_arrays
+
+    Returns:
+        dict {nombre: array de solo lectura sobre blob}
+    """
+    if not es_formato_binario(blob):
+        raise ValueError("El BLOB no está en formato binario de arrays")
+
+    vista = memoryview(blob)
+    (num_arrays,) = struct.unpack_from('<I', vista, len(MAGIA))
+    posicion = len(MAGIA) + 4
+    arrays = {}
+
+    for _ in range(num_arrays):
+        (longitud,) = struct.unpack_from('<H', vista, posicion)
+        posicion += 2
+        nombre = bytes(vista[posicion:posicion + longitud]).decode('utf-8')
+        posicion += longitud
+
+        (longitud,) = struct.unpack_from('<B', vista, posicion)
+        posicion += 1
+        dtype = np.dtype(bytes(vista[posicion:posicion + longitud]).decode('ascii'))
+        posicion += longitud
+
+        (ndim,) = struct.unpack_from('<B', vista, posicion)
+        posicion += 1
+        forma = struct.unpack_from(f'<{ndim}Q', vista, posicion)
+        posicion += 8 * ndim
+        posicion += -posicion % ALINEACION
+
+        cantidad = math.prod(forma)
+        arrays[nombre] = np.frombuffer(vista, dtype=dtype, count=cantidad, offset=posicion).reshape(forma)
+        posicion += cantidad * dtype.itemsize
+
+    return arrays
+
+
+def es_formato_binario(blob):
+    return blob is not None and bytes(blob[:len(MAGIA)]) == MAGIA
+
+
+def serializar_objeto(objeto):
+    """
+    Serializa un valor de configuracion_modelo
+
+    Arrays, escaladores (mean_/scale_), codificadores (classes_) y dicts de
+    arrays (estado_normal) van en formato binario.
+
+    Returns:
+        bytes, o None si objeto es None
+
+    Raises:
+        TypeError: Si el objeto no tiene representación binaria (nunca se
+                   recurre a pickle al escribir)
+    """
+    if objeto is None:
+        return None
+    if isinstance(objeto, np.ndarray) and not objeto.dtype.hasobject:
+        return serializar_arrays({'': objeto})
+
+    if hasattr(objeto, 'classes_'):
+        clases = np.asarray(objeto.classes_)
+        if clases.dtype.hasobject:
+            # Etiquetas de texto: array unicode de ancho fijo
+            clases = clases.astype(str)
+        return serializar_arrays({_CLAVE_TIPO: np.array('codificador'), 'classes_': clases})
+
+    if _es_escalador(objeto):
+        estado = {nombre: getattr(objeto, nombre) for nombre in ATRIBUTOS_ESCALADOR
+                  if getattr(objeto, nombre, None) is not None}
+        return serializar_arrays({_CLAVE_TIPO: np.array('escalador'), **estado})
+
+    if isinstance(objeto, dict):
+        return serializar_arrays({_CLAVE_TIPO: np.array('dict'), **objeto})
+
+    raise TypeError(f"Tipo no soportado por el formato binario: {type(objeto).__name__}")
+
+
+def deserializar_objeto(blob, permitir_pickle=False):
+    """
+    Inversa de serializar_objeto
+
+    Args:
+        blob: bytes en formato binario (o None)
+        permitir_pickle: Leer con pickle los BLOBs antiguos sin la marca. Solo
+                         para bases de datos de confianza: pickle puede
+                         ejecutar código arbitrario al cargar. Sin él, las
+                         bases de datos antiguas fallan al cargar hasta
+                         convertirlas con 'python -m rbf convertir-pickle'
+
+    Returns:
+        array, EscaladorEstandar, CodificadorEtiquetas, dict de arrays u objeto
+
+    Raises:
+        pickle.UnpicklingError: Si el BLOB no está en formato binario y no se
+                                permitió pickle
+    """
+    if blob is None:
+        return None
+    if not es_formato_binario(blob):
+        if not permitir_pickle:
+            raise pickle.UnpicklingError(
+                "El BLOB no está en formato binario (fila antigua serializada con pickle) "
+                "y no se carga por seguridad. Si la base de datos es de confianza, "
+                "conviértala con 'python -m rbf convertir-pickle'")
+        return pickle.loads(blob)
+
+    arrays = deserializar_arrays(blob)
+    tipo = arrays.pop(_CLAVE_TIPO, None)
+    if tipo is None:
+        return arrays['']
+
+    tipo = tipo.item()
+    if tipo == 'escalador':
+        return EscaladorEstandar(**arrays)
+    if tipo == 'codificador':
+        return CodificadorEtiquetas(arrays['classes_'])
+    return arrays
+
+
+def _es_escalador(objeto):
+    return (isinstance(objeto, EscaladorEstandar)
+            or type(objeto).__name__ == 'StandardScaler'
+            or any(hasattr(objeto, nombre) for nombre in ('mean_', 'scale_')))
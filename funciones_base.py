@@ -0,0 +1,221 @@
+"""
+Funciones de base radial para la Red Neuronal RBF
+Registro de kernels vectorizados con parámetros declarados
+"""
+
+import numpy as np
+
+
+REGISTRO_FUNCIONES_BASE = {}
+
+# Nombres guardados por versiones anteriores en la columna funcion_activacion
+ALIAS_FUNCIONES_BASE = {
+    'd² × ln(d)': 'thin_plate',
+}
+
+
+def registrar_funcion_base(clase):
+    """Decorador que agrega una función de base radial al registro por su nombre"""
+    if not clase.nombre:
+        raise ValueError("La función de base debe declarar un nombre")
+    REGISTRO_FUNCIONES_BASE[clase.nombre] = clase
+    return clase
+
+
+class FuncionBaseRadial:
+    """
+    Clase base de las funciones de base radial
+
+    Cada subclase declara su nombre, su fórmula y sus parámetros con sus
+    valores por defecto, e implementa desde_cuadradas, que evalúa la función
+    sobre distancias al cuadrado (en sitio si se indica out).
+    """
+
+    nombre = None
+    formula = None
+    parametros_por_defecto = {}
+
+    def __init__(self, **parametros):
+        desconocidos = set(parametros) - set(self.parametros_por_defecto)
+        if desconocidos:
+            raise ValueError(f"Parámetros no soportados para '{self.nombre}': "
+                             f"{', '.join(sorted(desconocidos))}")
+
+        self.parametros = dict(self.parametros_por_defecto)
+        self.parametros.update({clave: float(valor) for clave, valor in parametros.items()})
+
+        for clave, valor in self.parametros.items():
+            if valor <= 0:
+                raise ValueError(f"El parámetro '{clave}' debe ser positivo")
+
+    @property
+    def radio_soporte(self):
+        """Distancia a partir de la cual la función vale cero (None si no tiene soporte compacto)"""
+        return None
+
+    def __call__(self, distancia):
+        """
+        Evalúa la función sobre distancias euclidianas
+
+        Args:
+            distancia: Distancias euclidianas
+
+        Returns:
+            Valores de activación
+        """
+        return self.desde_cuadradas(np.square(np.asarray(distancia, dtype=float)))
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        """
+        Evalúa la función sobre distancias al cuadrado
+
+        Args:
+            distancia_cuadrada: Distancias euclidianas al cuadrado
+            out: Array opcional donde escribir el resultado (puede ser la entrada)
+
+        Returns:
+            Valores de activación
+        """
+        raise NotImplementedError
+
+    def a_dict(self):
+        """Representación serializable (nombre y parámetros)"""
+        return {'nombre': self.nombre, 'parametros': dict(self.parametros)}
+
+    def __repr__(self):
+        parametros = ', '.join(f"{clave}={valor}" for clave, valor in self.parametros.items())
+        return f"{type(self).__name__}({parametros})"
+
+
+@registrar_funcion_base
+class ThinPlateSpline(FuncionBaseRadial):
+    """FA(d) = d² × ln(d), calculada como ½ × d² × ln(d²)"""
+
+    nombre = 'thin_plate'
+    formula = 'd² × ln(d)'
+
+    # Filas del búfer temporal usado para el logaritmo
+    FILAS_BUFER = 2048
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        # Evitar log(0): d < epsilon equivale a d² < epsilon²
+        epsilon = 1e-10
+        out = np.maximum(distancia_cuadrada, epsilon ** 2, out=out)
+
+        if not out.flags.c_contiguous or out.ndim == 0:
+            np.multiply(out, np.log(out), out=out)
+            out *= 0.5
+            return out
+
+        # El logaritmo se escribe en un búfer reutilizado por sub-bloques de filas,
+        # de modo que el único array completo es el propio resultado
+        out_2d = out.reshape(-1, out.shape[-1]) if out.ndim > 1 else out.reshape(1, -1)
+        filas = max(1, min(out_2d.shape[0], self.FILAS_BUFER))
+        logaritmo = np.empty((filas, out_2d.shape[1]), dtype=out.dtype)
+        for inicio in range(0, out_2d.shape[0], filas):
+            bloque = out_2d[inicio:inicio + filas]
+            buffer = np.log(bloque, out=logaritmo[:bloque.shape[0]])
+            np.multiply(bloque, buffer, out=bloque)
+
+        out *= 0.5
+        return out
+
+
+@registrar_funcion_base
+class Gaussiana(FuncionBaseRadial):
+    """FA(d) = exp(-(ε·d)²)"""
+
+    nombre = 'gaussiana'
+    formula = 'exp(-(ε·d)²)'
+    parametros_por_defecto = {'epsilon': 1.0}
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        out = np.multiply(distancia_cuadrada, -self.parametros['epsilon'] ** 2, out=out)
+        return np.exp(out, out=out)
+
+
+@registrar_funcion_base
+class Multicuadratica(FuncionBaseRadial):
+    """FA(d) = sqrt(1 + (ε·d)²)"""
+
+    nombre = 'multicuadratica'
+    formula = '√(1 + (ε·d)²)'
+    parametros_por_defecto = {'epsilon': 1.0}
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        out = np.multiply(distancia_cuadrada, self.parametros['epsilon'] ** 2, out=out)
+        out += 1.0
+        return np.sqrt(out, out=out)
+
+
+@registrar_funcion_base
+class MulticuadraticaInversa(FuncionBaseRadial):
+    """FA(d) = 1 / sqrt(1 + (ε·d)²)"""
+
+    nombre = 'multicuadratica_inversa'
+    formula = '1 / √(1 + (ε·d)²)'
+    parametros_por_defecto = {'epsilon': 1.0}
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        out = np.multiply(distancia_cuadrada, self.parametros['epsilon'] ** 2, out=out)
+        out += 1.0
+        np.sqrt(out, out=out)
+        return np.reciprocal(out, out=out)
+
+
+@registrar_funcion_base
+class Wendland(FuncionBaseRadial):
+    """
+    Wendland C2 de soporte compacto: FA(d) = (1 - r)⁴₊ · (4r + 1), r = d / radio
+
+    Vale exactamente cero para d ≥ radio, por lo que Φ es dispersa cuando el
+    radio es pequeño frente a la separación entre patrones y centros.
+    """
+
+    nombre = 'wendland'
+    formula = '(1 - d/ρ)⁴₊ · (4d/ρ + 1)'
+    parametros_por_defecto = {'radio': 1.0}
+
+    @property
+    def radio_soporte(self):
+        return self.parametros['radio']
+
+    def desde_cuadradas(self, distancia_cuadrada, out=None):
+        # r = d / radio, recortado a [0, 1] para anular fuera del soporte
+        out = np.sqrt(distancia_cuadrada, out=out)
+        out *= 1.0 / self.parametros['radio']
+        np.minimum(out, 1.0, out=out)
+
+        factor = 4.0 * out + 1.0
+        np.subtract(1.0, out, out=out)
+        np.square(out, out=out)
+        np.square(out, out=out)
+        out *= factor
+        return out
+
+
+def crear_funcion_base(funcion='thin_plate', **parametros):
+    """
+    Crea una función de base radial a partir de su nombre
+
+    Args:
+        funcion: Nombre registrado (o alias antiguo) o instancia de FuncionBaseRadial
+        **parametros: Parámetros de la función (p. ej. epsilon, radio)
+
+    Returns:
+        Instancia de FuncionBaseRadial
+    """
+    if isinstance(funcion, FuncionBaseRadial):
+        return funcion
+
+    nombre = ALIAS_FUNCIONES_BASE.get(funcion, funcion)
+    if nombre not in REGISTRO_FUNCIONES_BASE:
+        raise ValueError(f"Función de activación no soportada: {funcion}. "
+                         f"Opciones: {', '.join(REGISTRO_FUNCIONES_BASE)}")
+
+    return REGISTRO_FUNCIONES_BASE[nombre](**parametros)
+
+
+def funcion_base_desde_dict(datos):
+    """Reconstruye una función de base a partir de a_dict()"""
+    return crear_funcion_base(datos['nombre'], **datos.get('parametros', {}))
@@ -0,0 +1,85 @@
+"""
+Instrumentación por etapas para la Red Neuronal RBF
+Tiempo de reloj, tiempo de CPU y memoria pico de cada etapa del entrenamiento
+"""
+
+import time
+import tracemalloc
+
+
+class MedidorEtapas:
+    """
+    Mide etapas consecutivas de una operación
+
+    Cada llamada a marcar cierra la etapa en curso y empieza la siguiente, de
+    modo que el código medido no necesita reestructurarse en bloques. La
+    memoria pico es la máxima memoria asignada durante la etapa (según
+    tracemalloc) por encima de la que había al comenzarla; incluye los
+    buffers de NumPy.
+    """
+
+    def __init__(self, medir_memoria=True):
+        """
+        Args:
+            medir_memoria: Si medir la memoria pico con tracemalloc
+        """
+        self.medir_memoria = medir_memoria
+        self.registros = []
+        self._inicio_tracemalloc = False
+        self._reloj = None
+        self._cpu = None
+        self._memoria_base = 0
+
+    def iniciar(self):
+        """Comienza la primera etapa"""
+        self.registros = []
+        if self.medir_memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        self._reiniciar_marcas()
+        return self
+
+    def marcar(self, etapa, **datos):
+        """
+        Cierra la etapa en curso
+
+        Args:
+            etapa: Nombre de la etapa
+            **datos: Información adicional a guardar en el registro
+
+        Returns:
+            dict con 'etapa', 'tiempo', 'tiempo_cpu' y 'memoria_pico' (bytes, None
+            si no se mide la memoria)
+        """
+        tiempo = time.perf_counter() - self._reloj
+        tiempo_cpu = time.process_time() - self._cpu
+        memoria_pico = None
+        if self.medir_memoria and tracemalloc.is_tracing():
+            _, pico = tracemalloc.get_traced_memory()
+            memoria_pico = max(pico - self._memoria_base, 0)
+
+        registro = {'etapa': etapa, 'tiempo': tiempo, 'tiempo_cpu': tiempo_cpu,
+                    'memoria_pico': memoria_pico, **datos}
+        self.registros.append(registro)
+        self._reiniciar_marcas()
+        return registro
+
+    def detener(self):
+        """Detiene tracemalloc si lo inició este medidor y retorna los registros"""
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+        return self.registros
+
+    def etapa_dominante(self):
+        """Registro de la etapa con mayor tiempo de reloj (None si no hay registros)"""
+        if not self.registros:
+            return None
+        return max(self.registros, key=lambda registro: registro['tiempo'])
+
+    def _reiniciar_marcas(self):
+        if self.medir_memoria and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memoria_base, _ = tracemalloc.get_traced_memory()
+        self._reloj = time.perf_counter()
+        self._cpu = time.process_time()
@@ -14,6 +14,12 @@ from datetime import datetime
 from data_handler import DataHandler
 from rbf_model import RBFNeuralNetwork
 from storage_manager import StorageManager
+from funciones_base import REGISTRO_FUNCIONES_BASE
+from seleccion_centros import ESTRATEGIAS_CENTROS
+from busqueda_hiperparametros import buscar_hiperparametros
+
+# Modelos que se leen de la base de datos por cada página de la lista
+MODELOS_POR_PAGINA = 100
 
 class RBFApp:
     def __init__(self, root):
@@ -38,6 +44,11 @@ class RBFApp:
         self.num_centros = tk.IntVar(value=5)
         self.error_optimo = tk.DoubleVar(value=0.1)
         self.porcentaje_train = tk.DoubleVar(value=70.0)
+        self.funcion_activacion = tk.StringVar(value='thin_plate')
+        self.parametro_activacion = tk.DoubleVar(value=1.0)
+        self.estrategia_centros = tk.StringVar(value='aleatoria')
+        self.usar_ols = tk.BooleanVar(value=False)
+        self.usar_float32 = tk.BooleanVar(value=False)
         
         # Crear interfaz
         self.crear_interfaz()
@@ -177,12 +188,40 @@ class RBFApp:
         ttk.Label(config_frame, text="(Clasif: 0.3-0.5, Regr: 0.1-0.3)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=1, column=2, sticky='w', padx=5)
         
         ttk.Label(config_frame, text="Función de Activación:").grid(row=2, column=0, sticky='w', padx=5, pady=5)
-        ttk.Label(config_frame, text="FA(d) = d² × ln(d)", font=('Courier', 10, 'bold')).grid(row=2, column=1, padx=5, pady=5, sticky='w')
-        
-        # Botón de configuración automática
-        btn_auto = ttk.Button(config_frame, text=" Configuración Automática", 
+        combo_funcion = ttk.Combobox(config_frame, textvariable=self.funcion_activacion, 
+                                     values=list(REGISTRO_FUNCIONES_BASE), width=25, state='readonly')
+        combo_funcion.grid(row=2, column=1, padx=5, pady=5, sticky='w')
+        combo_funcion.bind('<<ComboboxSelected>>', lambda e: self.actualizar_formula_activacion())
+        self.formula_activacion = ttk.Label(config_frame, font=('Courier', 10, 'bold'))
+        self.formula_activacion.grid(row=2, column=2, padx=5, pady=5, sticky='w')
+        
+        ttk.Label(config_frame, text="Parámetro (ε / radio):").grid(row=3, column=0, sticky='w', padx=5, pady=5)
+        ttk.Entry(config_frame, textvariable=self.parametro_activacion, width=10).grid(row=3, column=1, padx=5, pady=5, sticky='w')
+        ttk.Label(config_frame, text="(Solo para funciones con parámetro)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=3, column=2, sticky='w', padx=5)
+        self.actualizar_formula_activacion()
+        
+        ttk.Label(config_frame, text="Selección de Centros:").grid(row=4, column=0, sticky='w', padx=5, pady=5)
+        ttk.Combobox(config_frame, textvariable=self.estrategia_centros, values=list(ESTRATEGIAS_CENTROS),
+                     width=25, state='readonly').grid(row=4, column=1, padx=5, pady=5, sticky='w')
+        ttk.Label(config_frame, text="(k-means: menos centros para el mismo EG)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=4, column=2, sticky='w', padx=5)
+        
+        ttk.Checkbutton(config_frame, text="Selección OLS (agrega centros hasta converger)", 
+                        variable=self.usar_ols).grid(row=5, column=0, columnspan=2, sticky='w', padx=5, pady=5)
+        ttk.Label(config_frame, text="(El número de centros pasa a ser el máximo)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=5, column=2, sticky='w', padx=5)
+        
+        ttk.Checkbutton(config_frame, text="Precisión simple (float32)", 
+                        variable=self.usar_float32).grid(row=6, column=0, columnspan=2, sticky='w', padx=5, pady=5)
+        ttk.Label(config_frame, text="(Mitad de memoria; los pesos se resuelven en float64)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=6, column=2, sticky='w', padx=5)
+        
+        # Botones de configuración automática y búsqueda de hiperparámetros
+        botones_config = ttk.Frame(config_frame)
+        botones_config.grid(row=7, column=0, columnspan=3, pady=10)
+        btn_auto = ttk.Button(botones_config, text=" Configuración Automática", 
                              command=self.configuracion_automatica)
-        btn_auto.grid(row=3, column=0, columnspan=3, pady=10)
+        btn_auto.pack(side='left', padx=5)
+        self.btn_busqueda = ttk.Button(botones_config, text=" Buscar Hiperparámetros", 
+                                       command=self.iniciar_busqueda_hiperparametros)
+        self.btn_busqueda.pack(side='left', padx=5)
         
         # Botón de entrenamiento
         btn_frame = ttk.Frame(main_frame)
@@ -208,6 +247,16 @@ class RBFApp:
         self.resultados_text = scrolledtext.ScrolledText(resultados_frame, height=15, width=80, state='disabled')
         self.resultados_text.pack(fill='both', expand=True, padx=5, pady=5)
         
+    def actualizar_formula_activacion(self):
+        """Muestra la fórmula de la función de activación seleccionada"""
+        clase = REGISTRO_FUNCIONES_BASE[self.funcion_activacion.get()]
+        self.formula_activacion.config(text=f"FA(d) = {clase.formula}")
+    
+    def obtener_parametros_activacion(self):
+        """Parámetros de la función seleccionada a partir del campo ε / radio"""
+        clase = REGISTRO_FUNCIONES_BASE[self.funcion_activacion.get()]
+        return {clave: self.parametro_activacion.get() for clave in clase.parametros_por_defecto}
+    
     def crear_tab_evaluacion(self):
         """Crea la pestaña de evaluación y visualización"""
         
@@ -314,11 +363,42 @@ class RBFApp:
         ttk.Button(controles_frame, text=" Exportar", 
                   command=self.exportar_modelo_seleccionado).pack(side='left', padx=5)
         
+        # Filtros
+        filtros_frame = ttk.LabelFrame(main_frame, text="Filtros", padding="5")
+        filtros_frame.pack(fill='x', pady=(0, 10))
+        
+        self.filtro_dataset = tk.StringVar()
+        self.filtro_centros_min = tk.StringVar()
+        self.filtro_centros_max = tk.StringVar()
+        self.filtro_fecha_desde = tk.StringVar()
+        self.filtro_fecha_hasta = tk.StringVar()
+        self.filtro_eg_max = tk.StringVar()
+        
+        ttk.Label(filtros_frame, text="Dataset:").grid(row=0, column=0, sticky='w', padx=5, pady=2)
+        ttk.Entry(filtros_frame, textvariable=self.filtro_dataset, width=20).grid(row=0, column=1, padx=5, pady=2, sticky='w')
+        ttk.Label(filtros_frame, text="Centros (mín / máx):").grid(row=0, column=2, sticky='w', padx=5, pady=2)
+        ttk.Entry(filtros_frame, textvariable=self.filtro_centros_min, width=6).grid(row=0, column=3, padx=2, pady=2, sticky='w')
+        ttk.Entry(filtros_frame, textvariable=self.filtro_centros_max, width=6).grid(row=0, column=4, padx=2, pady=2, sticky='w')
+        ttk.Label(filtros_frame, text="EG prueba máx:").grid(row=0, column=5, sticky='w', padx=5, pady=2)
+        ttk.Entry(filtros_frame, textvariable=self.filtro_eg_max, width=8).grid(row=0, column=6, padx=5, pady=2, sticky='w')
+        
+        ttk.Label(filtros_frame, text="Fecha (desde / hasta):").grid(row=1, column=0, sticky='w', padx=5, pady=2)
+        ttk.Entry(filtros_frame, textvariable=self.filtro_fecha_desde, width=20).grid(row=1, column=1, padx=5, pady=2, sticky='w')
+        ttk.Entry(filtros_frame, textvariable=self.filtro_fecha_hasta, width=20).grid(row=1, column=2, columnspan=3, padx=5, pady=2, sticky='w')
+        ttk.Label(filtros_frame, text="(AAAA-MM-DD)", font=('Arial', 8, 'italic'), foreground='#666').grid(row=1, column=5, sticky='w', padx=5)
+        
+        botones_filtros = ttk.Frame(filtros_frame)
+        botones_filtros.grid(row=2, column=0, columnspan=7, sticky='w', pady=(5, 0))
+        ttk.Button(botones_filtros, text=" Filtrar", 
+                  command=self.actualizar_lista_modelos).pack(side='left', padx=5)
+        ttk.Button(botones_filtros, text=" Limpiar", 
+                  command=self.limpiar_filtros_modelos).pack(side='left', padx=5)
+        
         # Lista de modelos
         list_frame = ttk.LabelFrame(main_frame, text="Modelos Entrenados", padding="5")
         list_frame.pack(fill='both', expand=True)
         
-        columns = ('ID', 'Nombre', 'Dataset', 'Fecha', 'Centros', 'Split')
+        columns = ('ID', 'Nombre', 'Dataset', 'Fecha', 'Centros', 'Split', 'EG Prueba')
         self.tree_modelos = ttk.Treeview(list_frame, columns=columns, show='headings', height=15)
         
         for col in columns:
@@ -326,8 +406,10 @@ class RBFApp:
             width = 50 if col == 'ID' else 150
             self.tree_modelos.column(col, width=width)
         
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree_modelos.yview)
-        self.tree_modelos.configure(yscrollcommand=scrollbar.set)
+        # La lista se llena por páginas a medida que se desplaza (ver _al_desplazar_modelos)
+        self.scrollbar_modelos = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree_modelos.yview)
+        self.tree_modelos.configure(yscrollcommand=self._al_desplazar_modelos)
+        scrollbar = self.scrollbar_modelos
         
         self.tree_modelos.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
@@ -438,7 +520,8 @@ class RBFApp:
     def actualizar_combo_modelos(self):
         """Actualiza el combo de modelos disponibles"""
         try:
-            modelos = self.storage.listar_entrenamientos()
+            # Solo los más recientes: el historial completo está en la pestaña Modelos
+            modelos = self.storage.listar_entrenamientos_pagina(limite=MODELOS_POR_PAGINA)['entrenamientos']
             valores = [f"ID {m['id']}: {m['nombre']} ({m['dataset']})" for m in modelos]
             self.combo_modelos_pred['values'] = valores
             
@@ -466,18 +549,9 @@ class RBFApp:
             print(f"CARGANDO MODELO ID: {modelo_id}")
             print(f"{'='*60}")
             
-            # Cargar datos del modelo
-            datos_modelo = self.storage.cargar_entrenamiento(modelo_id)
-            
-            # Recrear el modelo RBF
-            self.modelo_cargado = RBFNeuralNetwork(
-                num_centros=datos_modelo['info']['num_centros'],
-                error_optimo=datos_modelo['info']['error_optimo']
-            )
-            
-            # Restaurar centros y pesos
-            self.modelo_cargado.centros = datos_modelo['modelo']['centros']
-            self.modelo_cargado.pesos = datos_modelo['modelo']['pesos']
+            # Información y métricas; centros, pesos y scaler se leen en la primera predicción
+            self.modelo_cargado = self.storage.cargar_modelo_diferido(modelo_id)
+            datos_modelo = {'info': self.modelo_cargado.info, 'metricas': self.modelo_cargado.metricas}
             
             # Guardar información adicional
             self.modelo_cargado_id = modelo_id
@@ -497,6 +571,7 @@ class RBFApp:
 
  CONFIGURACIÓN:
   • Centros Radiales: {datos_modelo['info']['num_centros']}
+  • Función de Activación: {self.modelo_cargado.funcion_base.formula} {self.modelo_cargado.funcion_base.parametros or ''}
   • Entradas: {datos_modelo['info']['num_entradas']}
   • Salidas: {datos_modelo['info']['num_salidas']}
   • Error Óptimo: {datos_modelo['info']['error_optimo']}
@@ -625,7 +700,7 @@ class RBFApp:
             print(f"✓ Datos de entrada obtenidos: {datos_entrada.shape}")
             
             # Normalizar datos usando el scaler del modelo original
-            scaler = self.modelo_cargado_data['modelo']['scaler']
+            scaler = self.modelo_cargado.modelo['scaler']
             datos_normalizados = scaler.transform(datos_entrada)
             
             print(f"✓ Datos normalizados")
@@ -637,7 +712,7 @@ class RBFApp:
             print(f"{'='*60}\n")
             
             # Decodificar si es clasificación
-            label_encoder = self.modelo_cargado_data['modelo'].get('label_encoder')
+            label_encoder = self.modelo_cargado.modelo.get('label_encoder')
             
             # Mostrar resultados
             self.mostrar_resultados_prediccion(datos_entrada, predicciones, label_encoder)
@@ -939,6 +1014,12 @@ class RBFApp:
             self.num_centros.set(5)
             self.error_optimo.set(0.1)
             self.porcentaje_train.set(70.0)
+            self.funcion_activacion.set('thin_plate')
+            self.parametro_activacion.set(1.0)
+            self.actualizar_formula_activacion()
+            self.estrategia_centros.set('aleatoria')
+            self.usar_ols.set(False)
+            self.usar_float32.set(False)
             
             # Limpiar interfaz - Pestaña Datos
             self.mostrar_en_text(self.info_dataset, "")
@@ -1124,6 +1205,83 @@ NOTA: Puede ajustar manualmente si lo desea.
         except Exception as e:
             messagebox.showerror("Error", f"Error en configuración automática:\n{str(e)}")
     
+    def iniciar_busqueda_hiperparametros(self):
+        """Inicia la búsqueda de hiperparámetros en un hilo separado"""
+        if self.data_handler.X_train is None:
+            messagebox.showwarning("Advertencia", "Debe dividir el dataset primero")
+            return
+        
+        self.btn_busqueda.config(state='disabled')
+        self.progress.start()
+        
+        thread = threading.Thread(target=self.ejecutar_busqueda_hiperparametros)
+        thread.daemon = True
+        thread.start()
+    
+    def ejecutar_busqueda_hiperparametros(self):
+        """Busca número de centros y función de activación sobre los datos de entrenamiento"""
+        try:
+            X_train, y_train = self.data_handler.get_datos_entrenamiento()
+            
+            # Mismo rango que el selector de centros, sin superar la mitad de los patrones
+            maximo_centros = max(2, min(50, len(X_train) // 2))
+            espacio = {
+                'num_centros': list(range(2, maximo_centros + 1)),
+                'funciones': {
+                    'thin_plate': {},
+                    'gaussiana': {'epsilon': [0.5, 1.0, 2.0]},
+                    'multicuadratica': {'epsilon': [0.5, 1.0, 2.0]},
+                    'multicuadratica_inversa': {'epsilon': [0.5, 1.0, 2.0]}
+                }
+            }
+            estrategia = self.estrategia_centros.get()
+            
+            print(f"\n{'='*60}")
+            print("BÚSQUEDA DE HIPERPARÁMETROS (reducción sucesiva)")
+            print(f"{'='*60}")
+            
+            resultado = buscar_hiperparametros(
+                X_train, y_train, espacio, modo='halving',
+                error_optimo=self.error_optimo.get(),
+                estrategia_centros=estrategia if estrategia in ('aleatoria', 'kmeans++') else 'kmeans++',
+                semilla=42,
+                storage=self.storage,
+                dataset_nombre=self.data_handler.get_dataset_info()['nombre']
+            )
+            self.root.after(0, lambda: self.aplicar_busqueda_hiperparametros(resultado))
+            
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Error en la búsqueda:\n{error_msg}"))
+        finally:
+            self.root.after(0, self.progress.stop)
+            self.root.after(0, lambda: self.btn_busqueda.config(state='normal'))
+    
+    def aplicar_busqueda_hiperparametros(self, resultado):
+        """Aplica la mejor configuración encontrada"""
+        mejor = resultado['mejor']
+        
+        self.num_centros.set(mejor['num_centros'])
+        self.funcion_activacion.set(mejor['funcion_activacion'])
+        if mejor['parametros_activacion']:
+            self.parametro_activacion.set(next(iter(mejor['parametros_activacion'].values())))
+        self.actualizar_formula_activacion()
+        
+        print(f"  • Ensayos: {len(resultado['ensayos'])} en {resultado['tiempo']:.2f} s")
+        print(f"  • Función: {mejor['funcion_activacion']} {mejor['parametros_activacion']}")
+        print(f"  • Centros: {mejor['num_centros']}")
+        print(f"  • EG validación: {mejor['eg_validacion']:.6f}")
+        print(f"{'='*60}\n")
+        
+        estado = "converge" if mejor['converge'] else "no alcanza el error óptimo"
+        messagebox.showinfo("Búsqueda de Hiperparámetros", 
+                           f"Mejor configuración ({estado}):\n\n"
+                           f"  • Función: {mejor['funcion_activacion']} {mejor['parametros_activacion']}\n"
+                           f"  • Centros: {mejor['num_centros']}\n"
+                           f"  • EG validación: {mejor['eg_validacion']:.6f}\n\n"
+                           f"{len(resultado['ensayos'])} ensayos en {resultado['tiempo']:.2f} s "
+                           f"(búsqueda ID {resultado['busqueda_id']})")
+    
     # ===== FUNCIONES DE CARGA Y PREPROCESAMIENTO =====
     
     def cargar_dataset(self):
@@ -1249,7 +1407,11 @@ Rango de X (normalizado):
             # Crear modelo
             self.rbf_model = RBFNeuralNetwork(
                 num_centros=self.num_centros.get(),
-                error_optimo=self.error_optimo.get()
+                error_optimo=self.error_optimo.get(),
+                funcion_activacion=self.funcion_activacion.get(),
+                parametros_activacion=self.obtener_parametros_activacion(),
+                estrategia_centros=self.estrategia_centros.get(),
+                dtype='float32' if self.usar_float32.get() else 'float64'
             )
             
             # Obtener datos
@@ -1257,7 +1419,10 @@ Rango de X (normalizado):
             X_test, y_test = self.data_handler.get_datos_prueba()
             
             # Entrenar
-            self.metricas_train = self.rbf_model.entrenar(X_train, y_train)
+            if self.usar_ols.get():
+                self.metricas_train = self.rbf_model.entrenar_ols(X_train, y_train)
+            else:
+                self.metricas_train = self.rbf_model.entrenar(X_train, y_train)
             
             # Evaluar
             self.metricas_test = self.rbf_model.evaluar(X_test, y_test)
@@ -1504,14 +1669,18 @@ Estado:                      {estado_conv}
                 'centros': self.rbf_model.centros,
                 'pesos': self.rbf_model.pesos,
                 'scaler': self.data_handler.get_scaler(),
-                'label_encoder': self.data_handler.get_label_encoder()
+                'label_encoder': self.data_handler.get_label_encoder(),
+                'estado_normal': (self.rbf_model.estado_normal.a_dict() 
+                                  if self.rbf_model.estado_normal is not None else None)
             }
             
             config = {
-                'num_centros': self.num_centros.get(),
+                'num_centros': self.rbf_model.num_centros,
                 'porcentaje_entrenamiento': self.porcentaje_train.get() / 100,
-                'funcion_activacion': 'd² × ln(d)',
-                'error_optimo': self.error_optimo.get()
+                'funcion_activacion': self.rbf_model.funcion_base.nombre,
+                'parametros_activacion': self.rbf_model.funcion_base.parametros,
+                'error_optimo': self.error_optimo.get(),
+                'dtype': self.rbf_model.dtype.name
             }
             
             # Guardar en base de datos
@@ -1523,7 +1692,8 @@ Estado:                      {estado_conv}
                 metricas_train=self.metricas_train,
                 metricas_test=self.metricas_test,
                 estadisticas=self.data_handler.get_estadisticas(),
-                descripcion="Modelo entrenado desde la aplicación"
+                descripcion="Modelo entrenado desde la aplicación",
+                etapas=self.rbf_model.historia_entrenamiento.get('etapas')
             )
             
             messagebox.showinfo("Éxito", f"Modelo guardado con ID: {entrenamiento_id}")
@@ -1533,22 +1703,88 @@ Estado:                      {estado_conv}
             messagebox.showerror("Error", f"Error al guardar modelo:\n{str(e)}")
     
     def actualizar_lista_modelos(self):
-        """Actualiza la lista de modelos guardados"""
+        """Actualiza la lista de modelos guardados (primera página con los filtros actuales)"""
+        filtros = self._filtros_modelos()
+        if filtros is None:
+            return
+        
         self.tree_modelos.delete(*self.tree_modelos.get_children())
+        self._filtros_lista_modelos = filtros
+        self._cursor_modelos = None
+        self._hay_mas_modelos = True
+        self._cargando_modelos = False
+        self._cargar_pagina_modelos()
+    
+    def limpiar_filtros_modelos(self):
+        """Quita los filtros de la lista de modelos"""
+        for variable in (self.filtro_dataset, self.filtro_centros_min, self.filtro_centros_max,
+                         self.filtro_fecha_desde, self.filtro_fecha_hasta, self.filtro_eg_max):
+            variable.set('')
+        self.actualizar_lista_modelos()
+    
+    def _filtros_modelos(self):
+        """Lee los filtros de la pestaña Modelos (None si alguno no es válido)"""
+        try:
+            texto = {
+                'dataset_nombre': self.filtro_dataset.get().strip(),
+                'num_centros_min': self.filtro_centros_min.get().strip(),
+                'num_centros_max': self.filtro_centros_max.get().strip(),
+                'fecha_desde': self.filtro_fecha_desde.get().strip(),
+                'fecha_hasta': self.filtro_fecha_hasta.get().strip(),
+                'eg_prueba_max': self.filtro_eg_max.get().strip()
+            }
+            filtros = {clave: valor or None for clave, valor in texto.items()}
+            for clave in ('num_centros_min', 'num_centros_max'):
+                if filtros[clave] is not None:
+                    filtros[clave] = int(filtros[clave])
+            if filtros['eg_prueba_max'] is not None:
+                filtros['eg_prueba_max'] = float(filtros['eg_prueba_max'])
+            for clave in ('fecha_desde', 'fecha_hasta'):
+                if filtros[clave] is not None:
+                    datetime.strptime(filtros[clave][:10], '%Y-%m-%d')
+            return filtros
+        except ValueError:
+            messagebox.showwarning("Advertencia", 
+                                  "Filtros inválidos: centros enteros, EG numérico y fechas AAAA-MM-DD")
+            return None
+    
+    def _cargar_pagina_modelos(self):
+        """Agrega a la lista la página siguiente de modelos"""
+        if not self._hay_mas_modelos:
+            self._cargando_modelos = False
+            return
         
+        self._cargando_modelos = True
         try:
-            modelos = self.storage.listar_entrenamientos()
-            for modelo in modelos:
+            pagina = self.storage.listar_entrenamientos_pagina(
+                limite=MODELOS_POR_PAGINA, despues_de=self._cursor_modelos,
+                **self._filtros_lista_modelos)
+            for modelo in pagina['entrenamientos']:
+                eg_prueba = modelo['eg_prueba']
                 self.tree_modelos.insert('', 'end', values=(
                     modelo['id'],
                     modelo['nombre'],
                     modelo['dataset'],
                     modelo['fecha'],
                     modelo['num_centros'],
-                    modelo['split']
+                    modelo['split'],
+                    f"{eg_prueba:.6f}" if eg_prueba is not None else '-'
                 ))
+            self._cursor_modelos = pagina['siguiente']
+            self._hay_mas_modelos = pagina['siguiente'] is not None
         except Exception as e:
+            self._hay_mas_modelos = False
             messagebox.showerror("Error", f"Error al cargar modelos:\n{str(e)}")
+        finally:
+            self._cargando_modelos = False
+    
+    def _al_desplazar_modelos(self, inicio, fin):
+        """Actualiza la barra de desplazamiento y pide otra página al acercarse al final"""
+        self.scrollbar_modelos.set(inicio, fin)
+        if float(fin) > 0.9 and self._hay_mas_modelos and not self._cargando_modelos:
+            # Cada evento de desplazamiento llama aquí: se programa una sola carga
+            self._cargando_modelos = True
+            self.root.after_idle(self._cargar_pagina_modelos)
     
     def cargar_modelo_seleccionado(self):
         """Carga el modelo seleccionado y muestra información detallada"""
@@ -1561,7 +1797,8 @@ Estado:                      {estado_conv}
             item = self.tree_modelos.item(seleccion[0])
             modelo_id = item['values'][0]
             
-            datos = self.storage.cargar_entrenamiento(modelo_id)
+            # Solo información y métricas: no hace falta deserializar el modelo
+            datos = self.storage.obtener_metadatos(modelo_id)
             
             info_completa = f"""
 ╔═══════════════════════════════════════════════════════════════╗
@@ -1634,18 +1871,42 @@ MÉTRICAS:
 
 
 class TextRedirector:
-    """Redirige la salida de print a un widget de texto"""
+    """
+    Redirige la salida de print a un widget de texto
+    
+    write solo acumula el texto en un búfer (es seguro llamarlo desde el hilo
+    de entrenamiento); el hilo de Tk lo vuelca cada INTERVALO_MS con una única
+    inserción, en lugar de un insert y un see por cada llamada a print.
+    """
+    
+    INTERVALO_MS = 100
+    
     def __init__(self, widget):
         self.widget = widget
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.widget.after(self.INTERVALO_MS, self.volcar)
 
     def write(self, text):
-        self.widget.config(state='normal')
-        self.widget.insert(tk.END, text)
-        self.widget.see(tk.END)
-        self.widget.config(state='disabled')
+        with self.lock:
+            self.buffer.append(text)
         
     def flush(self):
         pass
+    
+    def volcar(self):
+        """Inserta el texto acumulado en el widget y reprograma el siguiente volcado"""
+        with self.lock:
+            texto = ''.join(self.buffer)
+            self.buffer.clear()
+        
+        if texto:
+            self.widget.config(state='normal')
+            self.widget.insert(tk.END, texto)
+            self.widget.see(tk.END)
+            self.widget.config(state='disabled')
+        
+        self.widget.after(self.INTERVALO_MS, self.volcar)
 
 
 def main():
@@ -0,0 +1,292 @@
+"""
+Migraciones del esquema de la base de datos de la Red Neuronal RBF
+Cada migración se aplica una sola vez y queda registrada en version_esquema
+"""
+
+from datetime import datetime
+
+
+def _esquema_inicial(cursor):
+    """Tablas originales y columnas agregadas en versiones anteriores"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS entrenamientos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            dataset_nombre TEXT NOT NULL,
+            fecha_creacion TEXT NOT NULL,
+            num_patrones INTEGER,
+            num_entradas INTEGER,
+            num_salidas INTEGER,
+            num_centros INTEGER,
+            porcentaje_entrenamiento REAL,
+            funcion_activacion TEXT,
+            error_optimo REAL,
+            descripcion TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS configuracion_modelo (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entrenamiento_id INTEGER,
+            centros_radiales BLOB,
+            pesos BLOB,
+            scaler_params BLOB,
+            label_encoder BLOB,
+            FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metricas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entrenamiento_id INTEGER,
+            conjunto TEXT,
+            eg REAL,
+            mae REAL,
+            rmse REAL,
+            converge INTEGER,
+            FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS estadisticas_dataset (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entrenamiento_id INTEGER,
+            estadisticas_json TEXT,
+            FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS etapas_entrenamiento (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entrenamiento_id INTEGER,
+            orden INTEGER,
+            etapa TEXT,
+            tiempo REAL,
+            tiempo_cpu REAL,
+            memoria_pico INTEGER,
+            FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS busquedas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha_creacion TEXT NOT NULL,
+            modo TEXT,
+            dataset_nombre TEXT,
+            espacio_json TEXT,
+            num_ensayos INTEGER,
+            mejor_funcion TEXT,
+            mejor_parametros TEXT,
+            mejor_num_centros INTEGER,
+            mejor_eg_validacion REAL,
+            duracion REAL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ensayos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            busqueda_id INTEGER,
+            ronda INTEGER,
+            funcion_activacion TEXT,
+            parametros_activacion TEXT,
+            num_centros INTEGER,
+            num_patrones INTEGER,
+            metodo TEXT,
+            condicion REAL,
+            eg_entrenamiento REAL,
+            rmse_entrenamiento REAL,
+            eg_validacion REAL,
+            rmse_validacion REAL,
+            converge INTEGER,
+            duracion REAL,
+            FOREIGN KEY (busqueda_id) REFERENCES busquedas(id)
+        )
+    ''')
+
+    # Columnas agregadas después de la primera versión (bases de datos existentes)
+    _agregar_columna_si_falta(cursor, 'entrenamientos', 'parametros_activacion', 'TEXT')
+    _agregar_columna_si_falta(cursor, 'entrenamientos', 'version', 'INTEGER DEFAULT 1')
+    _agregar_columna_si_falta(cursor, 'entrenamientos', 'entrenamiento_padre_id', 'INTEGER')
+    _agregar_columna_si_falta(cursor, 'configuracion_modelo', 'estado_normal', 'BLOB')
+    _agregar_columna_si_falta(cursor, 'entrenamientos', 'dtype', 'TEXT')
+
+
+# Tablas hijas reconstruidas con ON DELETE CASCADE (SQLite no permite alterar
+# una clave foránea existente)
+TABLAS_EN_CASCADA = {
+    'configuracion_modelo': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entrenamiento_id INTEGER REFERENCES entrenamientos(id) ON DELETE CASCADE,
+        centros_radiales BLOB,
+        pesos BLOB,
+        scaler_params BLOB,
+        label_encoder BLOB,
+        estado_normal BLOB
+    ''',
+    'metricas': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entrenamiento_id INTEGER REFERENCES entrenamientos(id) ON DELETE CASCADE,
+        conjunto TEXT,
+        eg REAL,
+        mae REAL,
+        rmse REAL,
+        converge INTEGER
+    ''',
+    'estadisticas_dataset': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entrenamiento_id INTEGER REFERENCES entrenamientos(id) ON DELETE CASCADE,
+        estadisticas_json TEXT
+    ''',
+    'etapas_entrenamiento': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entrenamiento_id INTEGER REFERENCES entrenamientos(id) ON DELETE CASCADE,
+        orden INTEGER,
+        etapa TEXT,
+        tiempo REAL,
+        tiempo_cpu REAL,
+        memoria_pico INTEGER
+    ''',
+    'ensayos': '''
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        busqueda_id INTEGER REFERENCES busquedas(id) ON DELETE CASCADE,
+        ronda INTEGER,
+        funcion_activacion TEXT,
+        parametros_activacion TEXT,
+        num_centros INTEGER,
+        num_patrones INTEGER,
+        metodo TEXT,
+        condicion REAL,
+        eg_entrenamiento REAL,
+        rmse_entrenamiento REAL,
+        eg_validacion REAL,
+        rmse_validacion REAL,
+        converge INTEGER,
+        duracion REAL
+    '''
+}
+
+
+def _claves_foraneas_en_cascada(cursor):
+    """Reconstruye las tablas hijas con ON DELETE CASCADE conservando sus filas"""
+    for tabla, columnas in TABLAS_EN_CASCADA.items():
+        cursor.execute(f'CREATE TABLE {tabla}_nueva ({columnas})')
+        cursor.execute(f'PRAGMA table_info({tabla})')
+        nombres = ', '.join(fila[1] for fila in cursor.fetchall())
+        cursor.execute(f'INSERT INTO {tabla}_nueva ({nombres}) SELECT {nombres} FROM {tabla}')
+        cursor.execute(f'DROP TABLE {tabla}')
+        cursor.execute(f'ALTER TABLE {tabla}_nueva RENAME TO {tabla}')
+
+    # Filas huérfanas de borrados parciales anteriores (sin claves foráneas activas)
+    for tabla in ('configuracion_modelo', 'metricas', 'estadisticas_dataset', 'etapas_entrenamiento'):
+        cursor.execute(f'DELETE FROM {tabla} WHERE entrenamiento_id NOT IN (SELECT id FROM entrenamientos)')
+    cursor.execute('DELETE FROM ensayos WHERE busqueda_id NOT IN (SELECT id FROM busquedas)')
+
+
+def _indices(cursor):
+    """Índices sobre las claves foráneas y el orden del listado"""
+    for tabla in ('configuracion_modelo', 'metricas', 'estadisticas_dataset', 'etapas_entrenamiento'):
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{tabla}_entrenamiento '
+                       f'ON {tabla}(entrenamiento_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ensayos_busqueda ON ensayos(busqueda_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_entrenamientos_fecha '
+                   'ON entrenamientos(fecha_creacion)')
+
+
+def _indice_dataset_fecha(cursor):
+    """Índice para el listado paginado filtrado por dataset"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_entrenamientos_dataset_fecha '
+                   'ON entrenamientos(dataset_nombre, fecha_creacion)')
+
+
+# (versión, descripción, función); las versiones son consecutivas desde 1
+MIGRACIONES = [
+    (1, 'Esquema inicial', _esquema_inicial),
+    (2, 'Claves foráneas con ON DELETE CASCADE', _claves_foraneas_en_cascada),
+    (3, 'Índices sobre entrenamiento_id, busqueda_id y fecha_creacion', _indices),
+    (4, 'Índice por dataset y fecha para el listado paginado', _indice_dataset_fecha),
+]
+
+VERSION_ACTUAL = MIGRACIONES[-1][0]
+
+
+def version_esquema(conexion):
+    """Versión del esquema aplicada (0 si la base de datos no tiene tabla de versiones)"""
+    fila = conexion.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'version_esquema'"
+    ).fetchone()
+    if fila is None:
+        return 0
+    return conexion.execute('SELECT COALESCE(MAX(version), 0) FROM version_esquema').fetchone()[0]
+
+
+def aplicar_migraciones(conexion):
+    """
+    Aplica en orden las migraciones pendientes
+
+    Cada migración corre en su propia transacción, junto con su registro en
+    version_esquema, de modo que una falla no deja el esquema a medias. Las
+    bases de datos anteriores al control de versiones (sin version_esquema)
+    empiezan en la versión 0; el esquema inicial es idempotente sobre ellas.
+
+    Args:
+        conexion: Conexión sqlite3 (fuera de una transacción)
+
+    Returns:
+        Lista de versiones aplicadas
+    """
+    if version_esquema(conexion) >= VERSION_ACTUAL:
+        return []
+
+    # Las reconstrucciones de tablas requieren desactivar las claves foráneas,
+    # lo que SQLite solo permite fuera de una transacción
+    claves_foraneas = conexion.execute('PRAGMA foreign_keys').fetchone()[0]
+    conexion.execute('PRAGMA foreign_keys=OFF')
+    aplicadas = []
+    try:
+        conexion.execute('''
+            CREATE TABLE IF NOT EXISTS version_esquema (
+                version INTEGER PRIMARY KEY,
+                descripcion TEXT,
+                fecha_aplicacion TEXT NOT NULL
+            )
+        ''')
+        conexion.commit()
+
+        for version, descripcion, migracion in MIGRACIONES:
+            cursor = conexion.cursor()
+            # IMMEDIATE: toma el bloqueo de escritura antes de releer la versión,
+            # por si otro proceso está migrando la misma base de datos
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                if version_esquema(conexion) >= version:
+                    conexion.rollback()
+                    continue
+                migracion(cursor)
+                cursor.execute('INSERT INTO version_esquema (version, descripcion, fecha_aplicacion) '
+                               'VALUES (?, ?, ?)',
+                               (version, descripcion, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                conexion.commit()
+                aplicadas.append(version)
+            except Exception:
+                conexion.rollback()
+                raise
+            finally:
+                cursor.close()
+    finally:
+        conexion.execute(f'PRAGMA foreign_keys={"ON" if claves_foraneas else "OFF"}')
+
+    return aplicadas
+
+
+def _agregar_columna_si_falta(cursor, tabla, columna, tipo):
+    """Agrega una columna a una tabla existente si todavía no la tiene"""
+    cursor.execute(f'PRAGMA table_info({tabla})')
+    columnas = [fila[1] for fila in cursor.fetchall()]
+    if columna not in columnas:
+        cursor.execute(f'ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}')
@@ -0,0 +1,175 @@
+"""
+Motores de cálculo de distancias para la Red Neuronal RBF
+Implementaciones intercambiables de la distancia euclidiana patrón-centro
+"""
+
+import numpy as np
+
+
+class MotorDistancias:
+    """Interfaz común de los motores de distancias"""
+
+    nombre = None
+
+    def distancias_cuadradas(self, X, centros, out=None):
+        """
+        Calcula las distancias euclidianas al cuadrado entre patrones y centros
+
+        Args:
+            X: Matriz de patrones (n_patrones, n_caracteristicas)
+            centros: Matriz de centros (n_centros, n_caracteristicas)
+            out: Matriz opcional (n_patrones, n_centros) donde escribir el resultado
+
+        Returns:
+            Matriz de distancias al cuadrado (n_patrones, n_centros)
+        """
+        raise NotImplementedError
+
+    def calcular(self, X, centros, out=None):
+        """
+        Calcula las distancias euclidianas entre patrones y centros
+
+        Args:
+            X: Matriz de patrones (n_patrones, n_caracteristicas)
+            centros: Matriz de centros (n_centros, n_caracteristicas)
+            out: Matriz opcional (n_patrones, n_centros) donde escribir el resultado
+
+        Returns:
+            Matriz de distancias (n_patrones, n_centros)
+        """
+        d2 = self.distancias_cuadradas(X, centros, out=out)
+        return np.sqrt(d2, out=d2)
+
+    def iterar_bloques(self, n_patrones, n_centros, itemsize=8):
+        """
+        Genera los rangos de filas en que el motor divide el cálculo
+
+        Args:
+            n_patrones: Número de patrones
+            n_centros: Número de centros
+            itemsize: Tamaño en bytes de cada elemento
+
+        Yields:
+            slice con las filas de cada bloque
+        """
+        yield slice(0, n_patrones)
+
+
+class MotorDistanciasBucle(MotorDistancias):
+    """Implementación de referencia con doble bucle (lenta, solo para verificación)"""
+
+    nombre = 'bucle'
+
+    def distancias_cuadradas(self, X, centros, out=None):
+        n_patrones = X.shape[0]
+        n_centros = centros.shape[0]
+        if out is None:
+            out = np.zeros((n_patrones, n_centros))
+
+        for i in range(n_patrones):
+            for j in range(n_centros):
+                # Distancia euclidiana al cuadrado: sum((X_p - R_j)^2)
+                out[i, j] = np.sum((X[i] - centros[j]) ** 2)
+
+        return out
+
+
+class MotorDistanciasVectorizado(MotorDistancias):
+    """
+    Cálculo vectorizado con la expansión ||x||² + ||c||² - 2·x·cᵀ
+
+    Usa un único producto matricial (BLAS) en lugar de bucles de Python.
+    """
+
+    nombre = 'vectorizado'
+
+    def distancias_cuadradas(self, X, centros, out=None):
+        norma_x = np.einsum('ij,ij->i', X, X)
+        norma_c = np.einsum('ij,ij->i', centros, centros)
+        return _expansion_cuadrada(X, centros, norma_x, norma_c, out)
+
+
+class MotorDistanciasBloques(MotorDistancias):
+    """
+    Cálculo vectorizado por bloques de filas con memoria temporal acotada
+
+    Ningún bloque intermedio supera memoria_maxima_mb, de modo que el espacio
+    de trabajo no depende del número de patrones.
+    """
+
+    nombre = 'bloques'
+
+    def __init__(self, memoria_maxima_mb=64):
+        """
+        Args:
+            memoria_maxima_mb: Memoria máxima (MB) por bloque de trabajo
+        """
+        if memoria_maxima_mb <= 0:
+            raise ValueError("memoria_maxima_mb debe ser positivo")
+        self.memoria_maxima_mb = memoria_maxima_mb
+
+    def filas_por_bloque(self, n_centros, itemsize=8):
+        """Número de filas que caben en un bloque de memoria_maxima_mb"""
+        bytes_maximos = self.memoria_maxima_mb * 1024 * 1024
+        return max(1, int(bytes_maximos // (max(n_centros, 1) * itemsize)))
+
+    def iterar_bloques(self, n_patrones, n_centros, itemsize=8):
+        paso = self.filas_por_bloque(n_centros, itemsize)
+        for inicio in range(0, n_patrones, paso):
+            yield slice(inicio, min(inicio + paso, n_patrones))
+
+    def distancias_cuadradas(self, X, centros, out=None):
+        n_patrones = X.shape[0]
+        n_centros = centros.shape[0]
+        if out is None:
+            out = np.empty((n_patrones, n_centros), dtype=np.result_type(X, centros))
+
+        norma_c = np.einsum('ij,ij->i', centros, centros)
+        for filas in self.iterar_bloques(n_patrones, n_centros, out.itemsize):
+            bloque = X[filas]
+            norma_x = np.einsum('ij,ij->i', bloque, bloque)
+            _expansion_cuadrada(bloque, centros, norma_x, norma_c, out[filas])
+
+        return out
+
+
+def _expansion_cuadrada(X, centros, norma_x, norma_c, out=None):
+    """Evalúa ||x||² + ||c||² - 2·x·cᵀ en sitio, recortando negativos por redondeo"""
+    out = np.matmul(X, centros.T, out=out)
+    out *= -2.0
+    out += norma_x[:, np.newaxis]
+    out += norma_c[np.newaxis, :]
+    # La cancelación numérica puede producir valores ligeramente negativos
+    np.maximum(out, 0.0, out=out)
+    return out
+
+
+MOTORES_DISTANCIA = {
+    MotorDistanciasVectorizado.nombre: MotorDistanciasVectorizado,
+    MotorDistanciasBloques.nombre: MotorDistanciasBloques,
+    MotorDistanciasBucle.nombre: MotorDistanciasBucle,
+}
+
+
+def crear_motor_distancias(motor='vectorizado', memoria_maxima_mb=None):
+    """
+    Crea un motor de distancias a partir de su nombre
+
+    Args:
+        motor: Nombre del motor ('vectorizado', 'bloques', 'bucle') o instancia
+        memoria_maxima_mb: Memoria máxima por bloque (solo motor 'bloques')
+
+    Returns:
+        Instancia de MotorDistancias
+    """
+    if isinstance(motor, MotorDistancias):
+        return motor
+
+    if motor not in MOTORES_DISTANCIA:
+        raise ValueError(f"Motor de distancias no soportado: {motor}. "
+                         f"Opciones: {', '.join(MOTORES_DISTANCIA)}")
+
+    if motor == MotorDistanciasBloques.nombre and memoria_maxima_mb is not None:
+        return MotorDistanciasBloques(memoria_maxima_mb)
+
+    return MOTORES_DISTANCIA[motor]()
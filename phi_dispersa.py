@@ -0,0 +1,126 @@
+"""
+Matriz Φ dispersa para funciones de base de soporte compacto
+Solo se calculan los pares patrón-centro dentro del radio de soporte
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+from scipy.spatial import cKDTree
+
+
+class IndiceCentros:
+    """
+    Índice espacial (KD-tree) sobre los centros radiales
+
+    Se construye una vez por conjunto de centros y se reutiliza en cada
+    llamada a construir_phi_dispersa.
+    """
+
+    def __init__(self, centros):
+        self.centros = np.asarray(centros, dtype=float)
+        self.arbol = cKDTree(self.centros)
+
+    def vecinos(self, X, radio):
+        """
+        Pares (patrón, centro) a distancia menor o igual que radio
+
+        Returns:
+            (filas, columnas, distancias) como arrays planos
+        """
+        arbol_X = cKDTree(np.asarray(X, dtype=float))
+        pares = arbol_X.sparse_distance_matrix(self.arbol, radio, output_type='ndarray')
+        return pares['i'], pares['j'], pares['v']
+
+
+def construir_phi_dispersa(X, funcion_base, indice):
+    """
+    Construye Φ como matriz CSR evaluando solo los pares dentro del soporte
+
+    El costo es proporcional al número de elementos no nulos y no a n × k.
+
+    Args:
+        X: Matriz de patrones (n_patrones, n_caracteristicas)
+        funcion_base: Función de base con radio_soporte (p. ej. Wendland)
+        indice: IndiceCentros de los centros radiales
+
+    Returns:
+        Matriz Φ dispersa (n_patrones, n_centros) en formato CSR
+    """
+    radio = funcion_base.radio_soporte
+    if radio is None:
+        raise ValueError(f"La función '{funcion_base.nombre}' no tiene soporte compacto")
+
+    filas, columnas, distancias = indice.vecinos(X, radio)
+    valores = funcion_base.desde_cuadradas(np.square(distancias))
+
+    # Los pares justo en el borde del soporte valen cero: no almacenarlos
+    no_nulos = valores != 0.0
+    phi = sparse.csr_matrix(
+        (valores[no_nulos], (filas[no_nulos], columnas[no_nulos])),
+        shape=(len(X), len(indice.centros))
+    )
+    phi.sum_duplicates()
+    return phi
+
+
+def construir_matriz_interpolacion_dispersa(phi):
+    """Construye A = [1 | Φ] en formato CSR"""
+    unos = sparse.csr_matrix(np.ones((phi.shape[0], 1)))
+    return sparse.hstack([unos, phi], format='csr')
+
+
+def resolver_disperso(A, y):
+    """
+    Resuelve las ecuaciones normales A^T A · W = A^T y con álgebra dispersa
+
+    G = A^T A conserva la dispersión de Φ (dos centros solo interactúan si
+    sus soportes se solapan) y se factoriza con LU dispersa. Si G es
+    singular (centros sin patrones en su soporte) se recurre a LSQR sobre A.
+
+    Args:
+        A: Matriz de interpolación dispersa (n_patrones, n_centros + 1)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+
+    Returns:
+        (pesos, info) con 'metodo', 'condicion' y 'residuo'
+    """
+    G = (A.T @ A).tocsc()
+    b = A.T @ y
+
+    try:
+        factor = sparse_linalg.splu(G)
+        pesos = factor.solve(np.asarray(b, dtype=float))
+        metodo = 'lu_disperso'
+        condicion = _estimar_condicion(G, factor)
+    except RuntimeError:
+        # Factor exactamente singular
+        columnas_y = y.reshape(len(y), -1)
+        pesos = np.column_stack([
+            sparse_linalg.lsqr(A, columnas_y[:, j], atol=1e-12, btol=1e-12)[0]
+            for j in range(columnas_y.shape[1])
+        ])
+        pesos = pesos.reshape((A.shape[1],) + y.shape[1:])
+        metodo = 'lsqr'
+        condicion = None
+
+    info = {
+        'metodo_solicitado': 'disperso',
+        'metodo': metodo,
+        'condicion': condicion,
+        'residuo': float(np.linalg.norm(A @ pesos - y)),
+        'no_nulos': int(A.nnz)
+    }
+    return pesos, info
+
+
+def _estimar_condicion(G, factor):
+    """cond(A) ≈ sqrt(||G||₁ · ||G⁻¹||₁) con estimadores de norma, sin formar G⁻¹"""
+    n = G.shape[0]
+    inversa = sparse_linalg.LinearOperator(
+        (n, n), matvec=factor.solve, rmatvec=lambda v: factor.solve(v, trans='T'), dtype=float
+    )
+    if n < 4:
+        # onenormest requiere al menos 4 columnas
+        return float(np.sqrt(np.linalg.cond(G.toarray(), 1)))
+    return float(np.sqrt(sparse_linalg.onenormest(G) * sparse_linalg.onenormest(inversa)))
@@ -0,0 +1,146 @@
+"""
+Predicción paralela para la Red Neuronal RBF
+Reparte las filas de entrada entre un grupo de hilos o de procesos
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+BACKENDS_PARALELOS = ('hilos', 'procesos')
+
+# Estado de cada proceso trabajador (se fija en el inicializador)
+_estado_trabajador = {}
+
+
+def predecir_paralelo(modelo, X, n_trabajadores=None, backend='hilos', tamano_lote=10000):
+    """
+    Realiza predicciones repartiendo las filas de X entre varios trabajadores
+
+    Con 'hilos' cada trabajador ejecuta la misma ruta vectorizada que
+    RBFNeuralNetwork.predecir; NumPy libera el GIL en los productos
+    matriciales y ufuncs, por lo que los hilos trabajan en paralelo real.
+    Con 'procesos' los centros, los pesos, la entrada y la salida se
+    comparten mediante memoria compartida, sin copiarlos a cada proceso.
+
+    Conviene limitar los hilos de BLAS (p. ej. OMP_NUM_THREADS=1) para no
+    sobresuscribir los núcleos.
+
+    Args:
+        modelo: RBFNeuralNetwork entrenada
+        X: Datos de entrada (n_patrones, n_caracteristicas)
+        n_trabajadores: Número de trabajadores (por defecto, núcleos disponibles)
+        backend: 'hilos' o 'procesos'
+        tamano_lote: Patrones por tarea; acota la memoria temporal de cada trabajador
+
+    Returns:
+        Predicciones (n_patrones, n_salidas), iguales a las de predecir
+        salvo diferencias de redondeo del BLAS
+    """
+    if backend not in BACKENDS_PARALELOS:
+        raise ValueError(f"Backend no soportado: {backend}. "
+                         f"Opciones: {', '.join(BACKENDS_PARALELOS)}")
+    if modelo.centros is None or modelo.pesos is None:
+        raise ValueError("La red debe ser entrenada primero")
+    if tamano_lote <= 0:
+        raise ValueError("tamano_lote debe ser positivo")
+
+    X = np.ascontiguousarray(X, dtype=float)
+    n_trabajadores = n_trabajadores or os.cpu_count() or 1
+    rangos = _dividir_filas(len(X), n_trabajadores, tamano_lote)
+
+    if n_trabajadores == 1 or len(rangos) <= 1:
+        return modelo.predecir(X, tamano_lote=tamano_lote)
+
+    if backend == 'hilos':
+        return _predecir_hilos(modelo, X, rangos, n_trabajadores)
+    return _predecir_procesos(modelo, X, rangos, n_trabajadores)
+
+
+def _dividir_filas(n_patrones, n_trabajadores, tamano_lote):
+    """Rangos (inicio, fin) de como máximo tamano_lote filas, repartidos entre trabajadores"""
+    paso = min(tamano_lote, max(1, -(-n_patrones // n_trabajadores)))
+    return [(inicio, min(inicio + paso, n_patrones)) for inicio in range(0, n_patrones, paso)]
+
+
+def _predecir_hilos(modelo, X, rangos, n_trabajadores):
+    y_pred = np.empty((len(X),) + modelo.pesos.shape[1:])
+
+    def tarea(rango):
+        inicio, fin = rango
+        y_pred[inicio:fin] = modelo._predecir_lote(X[inicio:fin])
+
+    with ThreadPoolExecutor(max_workers=n_trabajadores) as grupo:
+        # list() propaga las excepciones de los trabajadores
+        list(grupo.map(tarea, rangos))
+
+    return y_pred
+
+
+def _predecir_procesos(modelo, X, rangos, n_trabajadores):
+    forma_salida = (len(X),) + modelo.pesos.shape[1:]
+    bloques = {}
+
+    try:
+        bloques['X'] = copiar_a_memoria_compartida(X)
+        bloques['centros'] = copiar_a_memoria_compartida(np.asarray(modelo.centros, dtype=float))
+        bloques['pesos'] = copiar_a_memoria_compartida(np.asarray(modelo.pesos, dtype=float))
+        bloques['salida'] = crear_memoria_compartida(forma_salida)
+
+        especificacion = {
+            'configuracion': modelo.obtener_configuracion(),
+            'arrays': {nombre: (shm.name, forma) for nombre, (shm, forma) in bloques.items()}
+        }
+
+        with ProcessPoolExecutor(max_workers=n_trabajadores,
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(especificacion,)) as grupo:
+            list(grupo.map(_tarea_proceso, rangos))
+
+        shm_salida, _ = bloques['salida']
+        return np.ndarray(forma_salida, dtype=float, buffer=shm_salida.buf).copy()
+
+    finally:
+        for shm, _ in bloques.values():
+            shm.close()
+            shm.unlink()
+
+
+def crear_memoria_compartida(forma):
+    nbytes = max(int(np.prod(forma)) * np.dtype(float).itemsize, 1)
+    return shared_memory.SharedMemory(create=True, size=nbytes), forma
+
+
+def copiar_a_memoria_compartida(array):
+    shm, forma = crear_memoria_compartida(array.shape)
+    np.ndarray(forma, dtype=float, buffer=shm.buf)[...] = array
+    return shm, forma
+
+
+def _inicializar_trabajador(especificacion):
+    """Abre la memoria compartida y reconstruye el modelo una vez por proceso"""
+    from rbf_model import RBFNeuralNetwork
+
+    arrays = {}
+    for nombre, (nombre_shm, forma) in especificacion['arrays'].items():
+        shm = shared_memory.SharedMemory(name=nombre_shm)
+        # Mantener la referencia para que el buffer siga válido
+        _estado_trabajador.setdefault('memorias', []).append(shm)
+        arrays[nombre] = np.ndarray(forma, dtype=float, buffer=shm.buf)
+
+    modelo = RBFNeuralNetwork(**especificacion['configuracion'])
+    modelo.centros = arrays['centros']
+    modelo.pesos = arrays['pesos']
+
+    _estado_trabajador['modelo'] = modelo
+    _estado_trabajador['X'] = arrays['X']
+    _estado_trabajador['salida'] = arrays['salida']
+
+
+def _tarea_proceso(rango):
+    inicio, fin = rango
+    modelo = _estado_trabajador['modelo']
+    _estado_trabajador['salida'][inicio:fin] = modelo._predecir_lote(_estado_trabajador['X'][inicio:fin])
@@ -0,0 +1,429 @@
+"""
+Interfaz de línea de comandos para la Red Neuronal RBF
+Entrena, evalúa, predice, lista y exporta modelos sin interfaz gráfica
+
+No importa tkinter, matplotlib ni PIL (salvo --graficos, que carga
+matplotlib solo al graficar), de modo que funciona en servidores sin
+pantalla y en planificadores de tareas.
+
+Uso:
+    python -m rbf entrenar datos.csv --columna-salida y [--centros 10] [--nombre modelo]
+    python -m rbf evaluar ID datos.csv --columna-salida y
+    python -m rbf predecir ID [entrada.csv | -] [--archivo-salida pred.csv]
+    python -m rbf listar [--dataset nombre] [--desde AAAA-MM-DD] [--eg-max 0.1] [--limite 20]
+    python -m rbf exportar ID destino.pkl
+    python -m rbf convertir-pickle   (solo bases de datos de confianza)
+
+Los modelos de bases de datos anteriores al formato binario (como la de
+ejemplo en database/) no se cargan por defecto, porque leerlos requiere
+pickle. Si la base de datos es de confianza, conviértala una sola vez con
+'convertir-pickle'; --permitir-pickle los carga sin convertirlos.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from funciones_base import REGISTRO_FUNCIONES_BASE
+from seleccion_centros import ESTRATEGIAS_CENTROS
+from storage_manager import StorageManager
+
+
+# Modelos leídos por consulta al listar
+_TAMANO_PAGINA = 500
+
+
+def comando_entrenar(args):
+    """Carga, preprocesa, divide, entrena, evalúa y guarda un modelo"""
+    from data_handler import DataHandler
+    from rbf_model import RBFNeuralNetwork
+
+    data_handler = DataHandler()
+    data_handler.cargar_dataset(args.dataset)
+    data_handler.preprocesar_datos(args.columna_salida, normalizar=True)
+    data_handler.dividir_datos(porcentaje_entrenamiento=args.porcentaje / 100, semilla=args.semilla)
+
+    parametros = None
+    if args.parametro is not None:
+        clase = REGISTRO_FUNCIONES_BASE[args.activacion]
+        parametros = {clave: args.parametro for clave in clase.parametros_por_defecto}
+
+    modelo = RBFNeuralNetwork(
+        num_centros=args.centros,
+        error_optimo=args.error_optimo,
+        funcion_activacion=args.activacion,
+        parametros_activacion=parametros,
+        estrategia_centros=args.estrategia,
+        semilla=args.semilla,
+        dtype='float32' if args.float32 else 'float64',
+        verbosidad=args.verbosidad
+    )
+
+    X_train, y_train = data_handler.get_datos_entrenamiento()
+    X_test, y_test = data_handler.get_datos_prueba()
+
+    if args.ols:
+        metricas_train = modelo.entrenar_ols(X_train, y_train)
+    else:
+        metricas_train = modelo.entrenar(X_train, y_train)
+    metricas_test = modelo.evaluar(X_test, y_test)
+
+    if args.graficos:
+        modelo.generar_graficos(X_train, y_train, X_test, y_test,
+                                metricas_train, metricas_test, ruta_salida=args.graficos)
+
+    resultado = {
+        'num_centros': modelo.num_centros,
+        'entrenamiento': _metricas_serializables(metricas_train),
+        'prueba': _metricas_serializables(metricas_test)
+    }
+
+    if not args.no_guardar:
+        storage = _storage(args)
+        resultado['id'] = storage.guardar_entrenamiento(
+            nombre=args.nombre,
+            dataset_info=data_handler.get_dataset_info(),
+            config={
+                'num_centros': modelo.num_centros,
+                'porcentaje_entrenamiento': args.porcentaje / 100,
+                'funcion_activacion': modelo.funcion_base.nombre,
+                'parametros_activacion': modelo.funcion_base.parametros,
+                'error_optimo': args.error_optimo,
+                'dtype': modelo.dtype.name
+            },
+            modelo_data={
+                'centros': modelo.centros,
+                'pesos': modelo.pesos,
+                'scaler': data_handler.get_scaler(),
+                'label_encoder': data_handler.get_label_encoder(),
+                'estado_normal': (modelo.estado_normal.a_dict()
+                                  if modelo.estado_normal is not None else None)
+            },
+            metricas_train=metricas_train,
+            metricas_test=metricas_test,
+            estadisticas=data_handler.get_estadisticas(),
+            descripcion="Modelo entrenado desde la línea de comandos",
+            etapas=modelo.historia_entrenamiento.get('etapas')
+        )
+
+    print(json.dumps(resultado, indent=2))
+    return 0
+
+
+def comando_evaluar(args):
+    """Evalúa un modelo guardado sobre un dataset con la columna de salida"""
+    import numpy as np
+    import pandas as pd
+
+    modelo, datos_modelo = _cargar_modelo(args)
+    df = pd.read_csv(args.dataset)
+    if args.columna_salida not in df.columns:
+        raise ValueError(f"La columna '{args.columna_salida}' no existe en el dataset")
+
+    X = _entradas_numericas(df.drop(columns=[args.columna_salida]), modelo, datos_modelo)
+    y = df[args.columna_salida]
+
+    label_encoder = datos_modelo['modelo'].get('label_encoder')
+    if label_encoder is not None:
+        y = label_encoder.transform(y)
+    else:
+        y = y.to_numpy(dtype=float).reshape(-1, 1)
+
+    y_pred = np.concatenate(list(modelo.predecir_por_lotes(
+        _normalizar(X, datos_modelo), tamano_lote=args.tamano_lote)))
+    metricas = modelo.calcular_metricas(y, y_pred)
+
+    print(json.dumps(_metricas_serializables(metricas), indent=2))
+    return 0
+
+
+def comando_predecir(args):
+    """
+    Predice en streaming: lee la entrada por lotes (archivo o stdin) y escribe
+    cada lote de predicciones en cuanto está listo
+    """
+    modelo, datos_modelo = _cargar_modelo(args)
+    label_encoder = datos_modelo['modelo'].get('label_encoder')
+
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, newline='')
+    salida = sys.stdout if args.archivo_salida is None else open(args.archivo_salida, 'w', newline='')
+
+    try:
+        escritor = csv.writer(salida)
+        encabezado_escrito = False
+        total = 0
+
+        for lote in _leer_lotes(entrada, args.tamano_lote):
+            predicciones = modelo.predecir(_normalizar(lote, datos_modelo))
+
+            if not encabezado_escrito:
+                escritor.writerow(_encabezado_prediccion(lote.shape[1], predicciones.shape[1],
+                                                         label_encoder, args.solo_prediccion))
+                encabezado_escrito = True
+
+            columnas = _columnas_prediccion(predicciones, label_encoder)
+            filas = columnas if args.solo_prediccion else [
+                list(entrada_fila) + fila for entrada_fila, fila in zip(lote.tolist(), columnas)]
+            escritor.writerows(filas)
+            salida.flush()
+            total += len(lote)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"{total} predicciones", file=sys.stderr)
+    return 0
+
+
+def comando_listar(args):
+    """Lista los modelos guardados, del más reciente al más antiguo"""
+    storage = _storage(args)
+    filtros = {
+        'dataset_nombre': args.dataset,
+        'num_centros_min': args.centros_min,
+        'num_centros_max': args.centros_max,
+        'fecha_desde': args.desde,
+        'fecha_hasta': args.hasta,
+        'eg_prueba_max': args.eg_max,
+        'solo_convergentes': args.convergentes
+    }
+
+    # Se recorre por páginas: la salida empieza sin esperar a leer todo el historial
+    def modelos():
+        restantes = args.limite
+        cursor = None
+        while restantes is None or restantes > 0:
+            limite = _TAMANO_PAGINA if restantes is None else min(restantes, _TAMANO_PAGINA)
+            pagina = storage.listar_entrenamientos_pagina(limite=limite, despues_de=cursor, **filtros)
+            yield from pagina['entrenamientos']
+            if restantes is not None:
+                restantes -= len(pagina['entrenamientos'])
+            cursor = pagina['siguiente']
+            if cursor is None:
+                break
+
+    if args.json:
+        print(json.dumps(list(modelos()), indent=2))
+        return 0
+
+    print(f"{'ID':>5}  {'Nombre':<30} {'Dataset':<25} {'Fecha':<20} {'Centros':>7} {'Split':>6} "
+          f"{'EG Prueba':>10}")
+    for m in modelos():
+        eg_prueba = f"{m['eg_prueba']:.6f}" if m['eg_prueba'] is not None else '-'
+        print(f"{m['id']:>5}  {m['nombre']:<30} {m['dataset']:<25} {m['fecha']:<20} "
+              f"{m['num_centros']:>7} {m['split']:>6} {eg_prueba:>10}")
+    return 0
+
+
+def comando_exportar(args):
+    """Exporta un modelo guardado a un archivo pickle"""
+    _storage(args).exportar_modelo(args.id, args.destino)
+    print(f"Modelo {args.id} exportado a {args.destino}", file=sys.stderr)
+    return 0
+
+
+def comando_convertir_pickle(args):
+    """Reescribe en formato binario las filas antiguas serializadas con pickle"""
+    convertidas = _storage(args).convertir_blobs_pickle()
+    print(f"{convertidas} filas convertidas al formato binario", file=sys.stderr)
+    return 0
+
+
+def _storage(args):
+    return StorageManager(args.db, permitir_pickle=args.permitir_pickle)
+
+
+def _cargar_modelo(args):
+    from rbf_model import RBFNeuralNetwork
+
+    datos_modelo = _storage(args).cargar_entrenamiento(args.id)
+    modelo = RBFNeuralNetwork.desde_entrenamiento(datos_modelo, verbosidad=0)
+    return modelo, datos_modelo
+
+
+def _entradas_numericas(df, modelo, datos_modelo):
+    """
+    Convierte las columnas de entrada como DataHandler.preprocesar_datos
+
+    Los faltantes se rellenan con mean_ del scaler guardado, que coincide con
+    la media usada al imputar en el entrenamiento. La codificación one-hot no
+    se guarda con el modelo, por lo que las columnas no numéricas se rechazan.
+
+    Raises:
+        ValueError: Si hay columnas no numéricas, el número de columnas no
+                    coincide con el modelo o hay faltantes sin medias guardadas
+    """
+    import numpy as np
+    import pandas as pd
+
+    no_numericas = [str(c) for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+    if no_numericas:
+        raise ValueError(f"Columnas no numéricas: {', '.join(no_numericas)}. El modelo guardado "
+                         "no conserva la codificación one-hot del entrenamiento; codifíquelas "
+                         "antes de evaluar")
+
+    X = df.to_numpy(dtype=float)
+    num_entradas = modelo.centros.shape[1]
+    if X.shape[1] != num_entradas:
+        raise ValueError(f"El dataset tiene {X.shape[1]} columnas de entrada y el modelo "
+                         f"espera {num_entradas}")
+
+    faltantes = np.isnan(X)
+    if faltantes.any():
+        scaler = datos_modelo['modelo'].get('scaler')
+        medias = getattr(scaler, 'mean_', None)
+        if medias is None:
+            columnas = [str(c) for c in df.columns[faltantes.any(axis=0)]]
+            raise ValueError(f"Valores faltantes en {', '.join(columnas)} y el modelo no "
+                             "guarda las medias para imputarlos")
+        X[faltantes] = np.take(medias, np.nonzero(faltantes)[1])
+    return X
+
+
+def _normalizar(X, datos_modelo):
+    """Aplica el scaler con el que se entrenó el modelo"""
+    scaler = datos_modelo['modelo'].get('scaler')
+    return scaler.transform(X) if scaler is not None else X
+
+
+def _leer_lotes(flujo, tamano_lote):
+    """
+    Lee filas numéricas separadas por comas o espacios en lotes
+
+    Una primera línea no numérica se toma como encabezado y se descarta.
+
+    Yields:
+        Arrays (tamano_lote, n_caracteristicas); el último puede ser menor
+    """
+    import numpy as np
+
+    filas = []
+    for numero, linea in enumerate(flujo, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            filas.append([float(x) for x in linea.replace(',', ' ').split()])
+        except ValueError:
+            if numero == 1:
+                continue
+            raise ValueError(f"Línea {numero}: valores no numéricos")
+
+        if len(filas) == tamano_lote:
+            yield np.array(filas)
+            filas = []
+
+    if filas:
+        yield np.array(filas)
+
+
+def _encabezado_prediccion(num_entradas, num_salidas, label_encoder, solo_prediccion):
+    # Mismas columnas que la exportación de resultados de la interfaz gráfica
+    encabezado = [] if solo_prediccion else [f'X{i + 1}' for i in range(num_entradas)]
+    if label_encoder is not None:
+        return encabezado + ['Prediccion', 'Prediccion_Valor']
+    if num_salidas == 1:
+        return encabezado + ['Prediccion']
+    return encabezado + [f'Prediccion_{j + 1}' for j in range(num_salidas)]
+
+
+def _columnas_prediccion(predicciones, label_encoder):
+    import numpy as np
+
+    if label_encoder is None:
+        return predicciones.tolist()
+
+    indices = np.round(predicciones).astype(int).flatten()
+    indices = np.clip(indices, 0, len(label_encoder.classes_) - 1)
+    clases = label_encoder.inverse_transform(indices)
+    return [[clase, valor] for clase, valor in zip(clases.tolist(), predicciones.flatten().tolist())]
+
+
+def _metricas_serializables(metricas):
+    return {clave: (bool(valor) if clave == 'Converge' else float(valor))
+            for clave, valor in metricas.items()
+            if clave in ('EG', 'MAE', 'RMSE', 'Converge')}
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='python -m rbf', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default='database/rbf_trainings.db', help='Base de datos de modelos')
+    parser.add_argument('--permitir-pickle', action='store_true',
+                        help='Carga filas antiguas serializadas con pickle (solo bases de datos de confianza)')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    entrenar = subparsers.add_parser('entrenar', aliases=['train'], help='Entrena y guarda un modelo')
+    entrenar.add_argument('dataset', help='Archivo CSV o JSON')
+    entrenar.add_argument('--columna-salida', required=True)
+    entrenar.add_argument('--nombre', default='modelo_cli')
+    entrenar.add_argument('--centros', type=int, default=5)
+    entrenar.add_argument('--error-optimo', type=float, default=0.1)
+    entrenar.add_argument('--porcentaje', type=float, default=70.0, help='Porcentaje de entrenamiento')
+    entrenar.add_argument('--activacion', choices=sorted(REGISTRO_FUNCIONES_BASE), default='thin_plate')
+    entrenar.add_argument('--parametro', type=float, help='ε o radio de la función de activación')
+    entrenar.add_argument('--estrategia', choices=ESTRATEGIAS_CENTROS, default='aleatoria')
+    entrenar.add_argument('--ols', action='store_true', help='Selección de centros por OLS')
+    entrenar.add_argument('--float32', action='store_true')
+    entrenar.add_argument('--semilla', type=int, default=42)
+    entrenar.add_argument('--verbosidad', type=int, default=0)
+    entrenar.add_argument('--graficos', metavar='DIRECTORIO', help='Genera los gráficos en DIRECTORIO')
+    entrenar.add_argument('--no-guardar', action='store_true')
+    entrenar.set_defaults(funcion=comando_entrenar)
+
+    evaluar = subparsers.add_parser('evaluar', aliases=['evaluate'], help='Evalúa un modelo guardado')
+    evaluar.add_argument('id', type=int)
+    evaluar.add_argument('dataset', help='Archivo CSV con la columna de salida')
+    evaluar.add_argument('--columna-salida', required=True)
+    evaluar.add_argument('--tamano-lote', type=int, default=10000)
+    evaluar.set_defaults(funcion=comando_evaluar)
+
+    predecir = subparsers.add_parser('predecir', aliases=['predict'], help='Predice con un modelo guardado')
+    predecir.add_argument('id', type=int)
+    predecir.add_argument('entrada', nargs='?', default='-', help="Archivo CSV o '-' para stdin")
+    predecir.add_argument('--archivo-salida', help='CSV de salida (por defecto stdout)')
+    predecir.add_argument('--tamano-lote', type=int, default=1000)
+    predecir.add_argument('--solo-prediccion', action='store_true', help='No repite las entradas')
+    predecir.set_defaults(funcion=comando_predecir)
+
+    listar = subparsers.add_parser('listar', aliases=['list'], help='Lista los modelos guardados')
+    listar.add_argument('--json', action='store_true')
+    listar.add_argument('--limite', type=int, help='Número máximo de modelos (por defecto, todos)')
+    listar.add_argument('--dataset', help='Solo modelos de este dataset')
+    listar.add_argument('--centros-min', type=int)
+    listar.add_argument('--centros-max', type=int)
+    listar.add_argument('--desde', help='Fecha mínima (AAAA-MM-DD)')
+    listar.add_argument('--hasta', help='Fecha máxima (AAAA-MM-DD, inclusive)')
+    listar.add_argument('--eg-max', type=float, help='EG máximo en el conjunto de prueba')
+    listar.add_argument('--convergentes', action='store_true', help='Solo modelos que convergieron')
+    listar.set_defaults(funcion=comando_listar)
+
+    exportar = subparsers.add_parser('exportar', aliases=['export'], help='Exporta un modelo a pickle')
+    exportar.add_argument('id', type=int)
+    exportar.add_argument('destino')
+    exportar.set_defaults(funcion=comando_exportar)
+
+    convertir = subparsers.add_parser('convertir-pickle', aliases=['convert-pickle'],
+                                      help='Convierte las filas antiguas (pickle) al formato binario; '
+                                           'solo para bases de datos de confianza')
+    convertir.set_defaults(funcion=comando_convertir_pickle)
+
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    try:
+        return args.funcion(args)
+    except BrokenPipeError:
+        # Salida cerrada por el consumidor (p. ej. `| head`)
+        return 0
+    except Exception as e:
+        print(f"✗ Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
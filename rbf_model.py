@@ -4,30 +4,90 @@ Siguiendo la especificación del examen
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 import json
 import os
 
+from motor_distancias import crear_motor_distancias
+from solucionador import (resolver_minimos_cuadrados, AcumuladorNormal, acumulador_desde_dict,
+                          METODOS_SOLUCION)
+from funciones_base import crear_funcion_base
+from seleccion_centros import seleccionar_centros, ESTRATEGIAS_CENTROS
+from seleccion_ols import seleccion_ols
+from instrumentacion import MedidorEtapas
+
+# Tipos de datos admitidos para distancias y Φ (los pesos siempre se resuelven en float64)
+TIPOS_DATOS = ('float64', 'float32')
+
 class RBFNeuralNetwork:
-    def __init__(self, num_centros, error_optimo=0.1):
+    def __init__(self, num_centros, error_optimo=0.1, motor_distancias='vectorizado',
+                 memoria_maxima_mb=None, solucionador='auto', funcion_activacion='thin_plate',
+                 parametros_activacion=None, phi_dispersa=False, estrategia_centros='aleatoria',
+                 semilla=None, dtype='float64', verbosidad=1, al_evento=None,
+                 medir_memoria=True):
         """
         Inicializa la red RBF
         
         Args:
             num_centros: Número de centros radiales (neuronas ocultas)
             error_optimo: Error de aproximación óptimo para convergencia
+            motor_distancias: Motor de cálculo de distancias ('vectorizado', 
+                              'bloques', 'bucle') o instancia de MotorDistancias
+            memoria_maxima_mb: Memoria máxima por bloque para el motor 'bloques'
+            solucionador: Método de mínimos cuadrados ('auto', 'cholesky', 'qr', 'svd')
+            funcion_activacion: Nombre de la función de base radial registrada
+                                ('thin_plate', 'gaussiana', 'multicuadratica',
+                                'multicuadratica_inversa', 'wendland') o instancia
+            parametros_activacion: dict con los parámetros de la función (epsilon, radio)
+            phi_dispersa: Si construir Φ como matriz dispersa (CSR) consultando solo
+                          los centros dentro del radio de soporte. Requiere una
+                          función de soporte compacto (p. ej. 'wendland') y SciPy
+            estrategia_centros: Selección de centros ('aleatoria', 'kmeans++', 
+                                'kmeans', 'kmeans_minibatch')
+            semilla: Semilla para la selección de centros (None = estado global de np.random)
+            dtype: Tipo de datos de distancias, Φ y predicciones ('float64' o 'float32').
+                   Con 'float32' se reduce a la mitad la memoria y el ancho de banda;
+                   el sistema de mínimos cuadrados se resuelve igualmente en float64
+            verbosidad: 0 = sin salida (ni reducciones de diagnóstico como min/max
+                        de Φ), 1 = salida por pasos, 2 = además el tiempo de cada paso
+            al_evento: Función opcional que recibe un dict por evento estructurado
+                       ({'evento': 'paso', 'paso': ..., 'duracion': ...}, 'inicio', 'fin')
+            medir_memoria: Si medir la memoria pico de cada etapa con tracemalloc
+                           (el tiempo de reloj y de CPU se miden siempre)
         """
+        if solucionador not in METODOS_SOLUCION:
+            raise ValueError(f"Solucionador no soportado: {solucionador}")
+        if estrategia_centros not in ESTRATEGIAS_CENTROS:
+            raise ValueError(f"Estrategia de centros no soportada: {estrategia_centros}")
+        if np.dtype(dtype).name not in TIPOS_DATOS:
+            raise ValueError(f"Tipo de datos no soportado: {dtype}. Opciones: {', '.join(TIPOS_DATOS)}")
+        
         self.num_centros = num_centros
         self.error_optimo = error_optimo
+        self.motor_distancias = crear_motor_distancias(motor_distancias, memoria_maxima_mb)
+        self.solucionador = solucionador
+        self.funcion_base = crear_funcion_base(funcion_activacion, **(parametros_activacion or {}))
+        if phi_dispersa and self.funcion_base.radio_soporte is None:
+            raise ValueError("phi_dispersa requiere una función de activación de soporte compacto")
+        self.phi_dispersa = phi_dispersa
+        self.estrategia_centros = estrategia_centros
+        self.semilla = semilla
+        self.dtype = np.dtype(dtype)
+        self.verbosidad = verbosidad
+        self.al_evento = al_evento
+        self.medir_memoria = medir_memoria
+        self._medidor = None
+        self._indice_centros = None
+        self.info_solucion = {}
         self.centros = None
         self.pesos = None
         self.phi_train = None
+        self.estado_normal = None
         self.historia_entrenamiento = {}
         
     def funcion_activacion(self, distancia):
         """
-        Función de activación radial: FA(d) = d^2 * ln(d)
+        Función de activación radial configurada (por defecto FA(d) = d^2 * ln(d))
         Maneja el caso especial cuando d ≈ 0
         
         Args:
@@ -36,10 +96,7 @@ class RBFNeuralNetwork:
         Returns:
             Valor de activación
         """
-        # Evitar log(0) agregando un epsilon pequeño
-        epsilon = 1e-10
-        d = np.where(distancia < epsilon, epsilon, distancia)
-        return (d ** 2) * np.log(d)
+        return self.funcion_base(distancia)
     
     def calcular_distancias(self, X, centros):
         """
@@ -52,16 +109,64 @@ class RBFNeuralNetwork:
         Returns:
             Matriz de distancias (n_patrones, n_centros)
         """
-        n_patrones = X.shape[0]
-        n_centros = centros.shape[0]
-        distancias = np.zeros((n_patrones, n_centros))
+        # Distancia euclidiana: sqrt(sum((X_p - R_j)^2)), delegada al motor configurado
+        X = np.asarray(X, dtype=self.dtype)
+        centros = np.asarray(centros, dtype=self.dtype)
+        return self.motor_distancias.calcular(X, centros)
+    
+    def funcion_activacion_cuadrada(self, distancia_cuadrada, out=None):
+        """
+        Función de activación evaluada sobre distancias al cuadrado
+        
+        Evita la raíz cuadrada cuando la función lo permite (para d^2 * ln(d)
+        se usa ½ * d^2 * ln(d^2)). Con out=distancia_cuadrada el cálculo se
+        hace en sitio.
+        
+        Args:
+            distancia_cuadrada: Distancias euclidianas al cuadrado
+            out: Array opcional donde escribir el resultado
+            
+        Returns:
+            Valor de activación
+        """
+        return self.funcion_base.desde_cuadradas(distancia_cuadrada, out=out)
+    
+    def calcular_phi(self, X, centros):
+        """
+        Calcula la matriz Φ directamente desde patrones y centros
+        
+        Kernel fusionado: por cada bloque de filas del motor de distancias se
+        obtienen las distancias al cuadrado y se les aplica la activación en
+        sitio, sin materializar la matriz de distancias ni calcular raíces.
+        En modo phi_dispersa solo se evalúan los pares dentro del soporte.
+        
+        Args:
+            X: Matriz de patrones (n_patrones, n_caracteristicas)
+            centros: Matriz de centros (n_centros, n_caracteristicas)
+            
+        Returns:
+            Matriz Φ (Phi) de activaciones (n_patrones, n_centros), densa (en el
+            dtype de la red) o CSR
+        """
+        if self.phi_dispersa:
+            X = np.asarray(X, dtype=float)
+            centros = np.asarray(centros, dtype=float)
+            from phi_dispersa import IndiceCentros, construir_phi_dispersa
+            
+            # El índice espacial se construye una sola vez por conjunto de centros
+            if self._indice_centros is None or not np.array_equal(self._indice_centros.centros, centros):
+                self._indice_centros = IndiceCentros(centros)
+            return construir_phi_dispersa(X, self.funcion_base, self._indice_centros)
         
-        for i in range(n_patrones):
-            for j in range(n_centros):
-                # Distancia euclidiana: sqrt(sum((X_p - R_j)^2))
-                distancias[i, j] = np.sqrt(np.sum((X[i] - centros[j]) ** 2))
+        X = np.asarray(X, dtype=self.dtype)
+        centros = np.asarray(centros, dtype=self.dtype)
+        phi = np.empty((X.shape[0], centros.shape[0]), dtype=self.dtype)
         
-        return distancias
+        for filas in self.motor_distancias.iterar_bloques(X.shape[0], centros.shape[0], phi.itemsize):
+            bloque = self.motor_distancias.distancias_cuadradas(X[filas], centros, out=phi[filas])
+            self.funcion_activacion_cuadrada(bloque, out=bloque)
+        
+        return phi
     
     def calcular_activaciones(self, distancias):
         """
@@ -75,6 +180,19 @@ class RBFNeuralNetwork:
         """
         return self.funcion_activacion(distancias)
     
+    def seleccionar_centros(self, X):
+        """
+        Selecciona los centros radiales con la estrategia configurada
+        
+        Args:
+            X: Matriz de patrones (n_patrones, n_caracteristicas)
+            
+        Returns:
+            Matriz de centros (num_centros, n_caracteristicas)
+        """
+        return seleccionar_centros(X, self.num_centros, self.estrategia_centros,
+                                   semilla=self.semilla, motor=self.motor_distancias)
+    
     def construir_matriz_interpolacion(self, phi):
         """
         Construye la matriz de interpolación A = [1 | Φ]
@@ -86,8 +204,14 @@ class RBFNeuralNetwork:
         Returns:
             Matriz A de interpolación
         """
-        unos = np.ones((phi.shape[0], 1))
-        A = np.hstack([unos, phi])
+        if self.phi_dispersa:
+            from phi_dispersa import construir_matriz_interpolacion_dispersa
+            return construir_matriz_interpolacion_dispersa(phi)
+        
+        # A siempre en float64: el sistema se resuelve en doble precisión
+        A = np.empty((phi.shape[0], phi.shape[1] + 1))
+        A[:, 0] = 1.0
+        A[:, 1:] = phi
         return A
     
     def entrenar(self, X_train, y_train):
@@ -101,132 +225,581 @@ class RBFNeuralNetwork:
         Returns:
             dict con información del entrenamiento
         """
-        print("=" * 60)
-        print("INICIANDO ENTRENAMIENTO DE RED RBF")
-        print("=" * 60)
-        
-        # Paso 1: Inicializar centros radiales aleatoriamente
-        print("\n[Paso 1] Inicializando centros radiales...")
-        n_caracteristicas = X_train.shape[0]
-        
-        # Seleccionar centros aleatorios del conjunto de entrenamiento
-        indices_centros = np.random.choice(n_caracteristicas, 
-                                          self.num_centros, 
-                                          replace=False)
-        self.centros = X_train[indices_centros].copy()
-        
-        print(f"  ✓ {self.num_centros} centros inicializados")
-        print(f"  ✓ Forma de centros: {self.centros.shape}")
-        
-        # Paso 2: Calcular distancias
-        print("\n[Paso 2] Calculando distancias entre patrones y centros...")
-        distancias = self.calcular_distancias(X_train, self.centros)
-        print(f"  ✓ Matriz de distancias: {distancias.shape}")
-        print(f"  ✓ Rango de distancias: [{distancias.min():.4f}, {distancias.max():.4f}]")
-        
-        # Paso 3: Calcular activaciones (Φ)
-        print("\n[Paso 3] Aplicando función de activación radial...")
-        self.phi_train = self.calcular_activaciones(distancias)
-        print(f"  ✓ Matriz Φ (Phi): {self.phi_train.shape}")
-        print(f"  ✓ Rango de activaciones: [{self.phi_train.min():.4f}, {self.phi_train.max():.4f}]")
+        self._log("=" * 60)
+        self._log("INICIANDO ENTRENAMIENTO DE RED RBF")
+        self._log("=" * 60)
+        self._iniciar_pasos('entrenar', num_patrones=len(X_train), num_centros=self.num_centros)
+        
+        # Paso 1: Inicializar centros radiales
+        self._log("\n[Paso 1] Inicializando centros radiales...")
+        self.centros = self.seleccionar_centros(X_train)
+        
+        self._log(f"  ✓ {self.num_centros} centros inicializados (estrategia: {self.estrategia_centros})")
+        self._log(f"  ✓ Forma de centros: {self.centros.shape}")
+        self._fin_paso('centros')
+        
+        # Pasos 2 y 3: Distancias y activaciones (Φ) con el kernel fusionado
+        self._log("\n[Pasos 2-3] Calculando distancias y aplicando función de activación radial...")
+        self.phi_train = self.calcular_phi(X_train, self.centros)
+        self._fin_paso('distancias_activaciones')
+        if self.verbosidad:
+            # Reducciones completas sobre Φ: solo para mostrarlas
+            self._log(f"  ✓ Matriz Φ (Phi): {self.phi_train.shape}")
+            self._log(f"  ✓ Rango de activaciones: [{self.phi_train.min():.4f}, {self.phi_train.max():.4f}]")
+            if self.phi_dispersa:
+                densidad = self.phi_train.nnz / max(self.phi_train.shape[0] * self.phi_train.shape[1], 1)
+                self._log(f"  ✓ Φ dispersa: {self.phi_train.nnz} no nulos ({densidad:.2%})")
         
         # Paso 4: Construir matriz de interpolación
-        print("\n[Paso 4] Construyendo matriz de interpolación A = [1 | Φ]...")
+        self._log("\n[Paso 4] Construyendo matriz de interpolación A = [1 | Φ]...")
         A = self.construir_matriz_interpolacion(self.phi_train)
-        print(f"  ✓ Matriz A: {A.shape}")
+        self._log(f"  ✓ Matriz A: {A.shape}")
+        self._fin_paso('matriz_interpolacion')
         
         # Paso 5: Calcular pesos usando mínimos cuadrados
-        # W = (A^T * A)^-1 * A^T * y
-        print("\n[Paso 5] Calculando pesos mediante mínimos cuadrados...")
-        print("  Fórmula: W = (A^T * A)^-1 * A^T * y")
-        
-        try:
-            # Calcular (A^T * A)
-            ATA = np.dot(A.T, A)
-            print(f"  ✓ A^T * A calculado: {ATA.shape}")
-            
-            # Invertir (A^T * A)
-            ATA_inv = np.linalg.inv(ATA)
-            print(f"  ✓ (A^T * A)^-1 calculado")
-            
-            # Calcular W
-            self.pesos = np.dot(np.dot(ATA_inv, A.T), y_train)
-            print(f"  ✓ Pesos W calculados: {self.pesos.shape}")
-            print(f"  ✓ W0 (umbral): {self.pesos[0]}")
-            print(f"  ✓ W1...Wn (pesos): {self.pesos[1:5]}..." if len(self.pesos) > 5 else f"  ✓ W1...Wn: {self.pesos[1:]}")
-            
-        except np.linalg.LinAlgError:
-            print("  ✗ Error: Matriz singular. Usando pseudoinversa...")
-            self.pesos = np.dot(np.linalg.pinv(A), y_train)
+        # W = argmin ||A * W - y||, resuelto por factorización (sin invertir A^T * A)
+        self._log("\n[Paso 5] Calculando pesos mediante mínimos cuadrados...")
+        estado = None
+        if self.phi_dispersa:
+            from phi_dispersa import resolver_disperso
+            self.pesos, self.info_solucion = resolver_disperso(A, y_train)
+        else:
+            estado = AcumuladorNormal(A.shape[1] - 1, y_train.shape[1] if np.ndim(y_train) > 1 else None)
+            self.pesos, self.info_solucion = resolver_minimos_cuadrados(A, y_train, self.solucionador,
+                                                                        acumulador=estado)
+        self._log(f"  ✓ Método: {self.info_solucion['metodo']} (solicitado: {self.info_solucion['metodo_solicitado']})")
+        if self.info_solucion['condicion'] is not None:
+            self._log(f"  ✓ Condición estimada de A: {self.info_solucion['condicion']:.3e}")
+        self._log(f"  ✓ Residuo ||A·W - y||: {self.info_solucion['residuo']:.6f}")
+        self._log(f"  ✓ Pesos W calculados: {self.pesos.shape}")
+        self._log(f"  ✓ W0 (umbral): {self.pesos[0]}")
+        self._log(f"  ✓ W1...Wn (pesos): {self.pesos[1:5]}..." if len(self.pesos) > 5 else f"  ✓ W1...Wn: {self.pesos[1:]}")
+        
+        # Conservar A^T A y A^T y para actualizar los pesos con datos nuevos: por
+        # Cholesky ya están formadas; en los demás caminos se forman al primer uso
+        if estado is not None and estado.num_patrones:
+            self.estado_normal = estado
+        else:
+            phi, y = self.phi_train, y_train
+            self._diferir_estado_normal(lambda: self._crear_estado_normal(phi, y))
+        self._fin_paso('solucion', metodo=self.info_solucion['metodo'])
         
         # Paso 6: Predicción y cálculo de métricas
-        print("\n[Paso 6] Evaluando modelo en conjunto de entrenamiento...")
+        self._log("\n[Paso 6] Evaluando modelo en conjunto de entrenamiento...")
         y_pred = self.predecir(X_train)
         metricas = self.calcular_metricas(y_train, y_pred)
+        self._fin_paso('evaluacion')
         
-        print(f"\n  MÉTRICAS DE ENTRENAMIENTO:")
-        print(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
-        print(f"  ├─ MAE: {metricas['MAE']:.6f}")
-        print(f"  ├─ RMSE: {metricas['RMSE']:.6f}")
-        print(f"  └─ Convergencia: {'✓ SÍ' if metricas['Converge'] else '✗ NO'}")
+        self._log(f"\n  MÉTRICAS DE ENTRENAMIENTO:")
+        self._log(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
+        self._log(f"  ├─ MAE: {metricas['MAE']:.6f}")
+        self._log(f"  ├─ RMSE: {metricas['RMSE']:.6f}")
+        self._log(f"  └─ Convergencia: {'✓ SÍ' if metricas['Converge'] else '✗ NO'}")
         
         if metricas['Converge']:
-            print(f"\n  ¡Éxito! EG ({metricas['EG']:.6f}) ≤ Error Óptimo ({self.error_optimo})")
+            self._log(f"\n  ¡Éxito! EG ({metricas['EG']:.6f}) ≤ Error Óptimo ({self.error_optimo})")
         else:
             porcentaje = (metricas['EG'] / self.error_optimo) * 100
-            print(f"\n  ⚠️ No converge: EG ({metricas['EG']:.6f}) > Error Óptimo ({self.error_optimo})")
-            print(f"  📊 Alcanzado: {porcentaje:.1f}% del objetivo")
+            self._log(f"\n  ⚠️ No converge: EG ({metricas['EG']:.6f}) > Error Óptimo ({self.error_optimo})")
+            self._log(f"  📊 Alcanzado: {porcentaje:.1f}% del objetivo")
             
             if porcentaje < 150:
-                print(f"\n  💡 SUGERENCIA: Está muy cerca!")
-                print(f"     → Aumentar centros a {self.num_centros + 3}")
+                self._log(f"\n  💡 SUGERENCIA: Está muy cerca!")
+                self._log(f"     → Aumentar centros a {self.num_centros + 3}")
             else:
                 centros_sugeridos = min(self.num_centros + 5, 30)
                 error_sugerido = round(metricas['EG'] * 1.1, 3)
-                print(f"\n  💡 SUGERENCIAS:")
-                print(f"     Opción 1: Aumentar centros a {centros_sugeridos}")
-                print(f"     Opción 2: Ajustar error óptimo a {error_sugerido}")
-                print(f"     Opción 3: Usar 'Configuración Automática' en la app")
+                self._log(f"\n  💡 SUGERENCIAS:")
+                self._log(f"     Opción 1: Aumentar centros a {centros_sugeridos}")
+                self._log(f"     Opción 2: Ajustar error óptimo a {error_sugerido}")
+                self._log(f"     Opción 3: Usar 'Configuración Automática' en la app")
         
         # Guardar historia
         self.historia_entrenamiento = {
             'num_patrones': X_train.shape[0],
             'num_caracteristicas': X_train.shape[1],
             'num_centros': self.num_centros,
+            'solucion': self.info_solucion,
+            'metricas': metricas
+        }
+        
+        self.historia_entrenamiento['etapas'] = self._terminar_pasos()
+        self._emitir('fin', metricas=metricas, etapas=self.historia_entrenamiento['etapas'])
+        self._log("\n" + "=" * 60)
+        self._log("ENTRENAMIENTO COMPLETADO")
+        self._log("=" * 60 + "\n")
+        
+        return metricas
+    
+    def entrenar_ols(self, X_train, y_train, num_candidatos=500):
+        """
+        Entrena la red RBF seleccionando centros por mínimos cuadrados ortogonales
+        
+        Parte de un conjunto de candidatos tomados de los patrones y agrega
+        centros de uno en uno (el que más reduce el error), actualizando una
+        factorización QR de forma incremental. Se detiene en cuanto
+        EG ≤ error_optimo, con lo que se obtiene el modelo más pequeño que
+        converge; num_centros actúa como límite superior.
+        
+        Args:
+            X_train: Datos de entrenamiento (n_patrones, n_caracteristicas)
+            y_train: Etiquetas de entrenamiento (n_patrones, n_salidas)
+            num_candidatos: Tamaño del conjunto de centros candidatos
+            
+        Returns:
+            dict con métricas del entrenamiento
+        """
+        self._log("=" * 60)
+        self._log("INICIANDO ENTRENAMIENTO OLS DE RED RBF")
+        self._log("=" * 60)
+        self._iniciar_pasos('entrenar_ols', num_patrones=len(X_train), num_centros=self.num_centros)
+        
+        # Paso 1: Conjunto de candidatos
+        self._log("\n[Paso 1] Seleccionando centros candidatos...")
+        num_candidatos = min(max(num_candidatos, self.num_centros), X_train.shape[0])
+        rng = np.random.RandomState(self.semilla) if self.semilla is not None else np.random
+        indices_candidatos = np.sort(rng.choice(X_train.shape[0], num_candidatos, replace=False))
+        candidatos = np.asarray(X_train[indices_candidatos], dtype=float)
+        self._log(f"  ✓ {num_candidatos} candidatos, máximo {self.num_centros} centros")
+        self._fin_paso('centros')
+        
+        # Pasos 2-3: Φ de todos los candidatos
+        self._log("\n[Pasos 2-3] Calculando activaciones de los candidatos...")
+        phi_candidatos = self.calcular_phi(X_train, candidatos)
+        if hasattr(phi_candidatos, 'toarray'):
+            phi_candidatos = phi_candidatos.toarray()
+        self._log(f"  ✓ Matriz Φ de candidatos: {phi_candidatos.shape}")
+        self._fin_paso('distancias_activaciones')
+        
+        # Pasos 4-5: Selección hacia adelante con QR incremental
+        self._log("\n[Pasos 4-5] Selección hacia adelante con QR incremental...")
+        indices, self.pesos, historial = seleccion_ols(phi_candidatos, y_train, 
+                                                       self.error_optimo, self.num_centros)
+        del phi_candidatos
+        
+        self.centros = candidatos[indices]
+        # Ecuaciones normales al primer uso, recalculando Φ de los centros elegidos
+        centros = self.centros
+        self._diferir_estado_normal(
+            lambda: self._crear_estado_normal(self.calcular_phi(X_train, centros), y_train))
+        self.num_centros = len(indices)
+        self.phi_train = None
+        self.info_solucion = {'metodo': 'ols', 'metodo_solicitado': 'ols', 
+                              'condicion': None, 'residuo': None}
+        self._log(f"  ✓ Centros seleccionados: {self.num_centros}")
+        if historial:
+            self._log(f"  ✓ EG: {historial[0]:.6f} (1 centro) → {historial[-1]:.6f} ({len(historial)} centros)")
+        self._fin_paso('solucion', metodo='ols')
+        
+        # Paso 6: Métricas
+        self._log("\n[Paso 6] Evaluando modelo en conjunto de entrenamiento...")
+        metricas = self.calcular_metricas(y_train, self.predecir(X_train))
+        self._fin_paso('evaluacion')
+        
+        self._log(f"\n  MÉTRICAS DE ENTRENAMIENTO:")
+        self._log(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
+        self._log(f"  ├─ MAE: {metricas['MAE']:.6f}")
+        self._log(f"  ├─ RMSE: {metricas['RMSE']:.6f}")
+        self._log(f"  └─ Convergencia: {'✓ SÍ' if metricas['Converge'] else '✗ NO'}")
+        
+        if not metricas['Converge']:
+            self._log(f"\n  💡 SUGERENCIA: Aumentar el máximo de centros o el número de candidatos")
+        
+        self.historia_entrenamiento = {
+            'num_patrones': X_train.shape[0],
+            'num_caracteristicas': X_train.shape[1],
+            'num_centros': self.num_centros,
+            'num_candidatos': num_candidatos,
+            'historial_ols': historial,
+            'solucion': self.info_solucion,
+            'metricas': metricas
+        }
+        
+        self.historia_entrenamiento['etapas'] = self._terminar_pasos()
+        self._emitir('fin', metricas=metricas, etapas=self.historia_entrenamiento['etapas'])
+        self._log("\n" + "=" * 60)
+        self._log("ENTRENAMIENTO COMPLETADO")
+        self._log("=" * 60 + "\n")
+        
+        return metricas
+    
+    def entrenar_por_bloques(self, bloques, centros=None):
+        """
+        Entrena la red RBF por bloques sin cargar todo el conjunto en memoria
+        
+        Solo se acumulan G = A^T A ((k+1)×(k+1)) y b = A^T y ((k+1)×m), y se
+        resuelve una única vez al final; la memoria no depende del número de
+        patrones.
+        
+        Args:
+            bloques: Iterable de tuplas (X_bloque, y_bloque), o función sin
+                     argumentos que devuelve un iterable nuevo en cada llamada.
+                     Con una función se hace una segunda pasada para calcular
+                     EG y MAE; con un iterable simple solo se obtiene el RMSE.
+            centros: Centros radiales fijos; si es None se seleccionan del
+                     primer bloque con la estrategia configurada
+            
+        Returns:
+            dict con métricas del entrenamiento
+        """
+        self._log("=" * 60)
+        self._log("INICIANDO ENTRENAMIENTO POR BLOQUES DE RED RBF")
+        self._log("=" * 60)
+        self._iniciar_pasos('entrenar_por_bloques', num_centros=self.num_centros)
+        
+        reiterable = callable(bloques)
+        iterador = iter(bloques() if reiterable else bloques)
+        
+        try:
+            X_bloque, y_bloque = next(iterador)
+        except StopIteration:
+            raise ValueError("No se recibió ningún bloque de datos")
+        
+        # Paso 1: Centros radiales
+        self._log("\n[Paso 1] Inicializando centros radiales...")
+        if centros is None:
+            if X_bloque.shape[0] < self.num_centros:
+                raise ValueError("El primer bloque tiene menos patrones que centros")
+            self.centros = self.seleccionar_centros(X_bloque)
+        else:
+            self.centros = np.asarray(centros, dtype=float).copy()
+            self.num_centros = self.centros.shape[0]
+        self._log(f"  ✓ {self.num_centros} centros inicializados")
+        self._fin_paso('centros')
+        
+        # Pasos 2-4: Acumular ecuaciones normales bloque a bloque
+        self._log("\n[Pasos 2-4] Acumulando A^T * A y A^T * y por bloques...")
+        y_bloque = np.asarray(y_bloque)
+        num_salidas = y_bloque.shape[1] if y_bloque.ndim > 1 else None
+        acumulador = AcumuladorNormal(self.num_centros, num_salidas)
+        num_bloques = 0
+        num_caracteristicas = X_bloque.shape[1]
+        
+        while True:
+            acumulador.agregar(self.calcular_phi(X_bloque, self.centros), y_bloque)
+            num_bloques += 1
+            try:
+                X_bloque, y_bloque = next(iterador)
+            except StopIteration:
+                break
+        
+        self._log(f"  ✓ {num_bloques} bloques, {acumulador.num_patrones} patrones")
+        self._log(f"  ✓ A^T * A: {acumulador.G.shape}, A^T * y: {acumulador.b.shape}")
+        self._fin_paso('acumulacion', num_bloques=num_bloques, num_patrones=acumulador.num_patrones)
+        
+        # Paso 5: Resolver una sola vez
+        self._log("\n[Paso 5] Calculando pesos mediante mínimos cuadrados...")
+        metodo = 'svd' if self.solucionador == 'svd' else 'cholesky'
+        self.pesos, self.info_solucion = acumulador.resolver(metodo)
+        self.estado_normal = acumulador
+        self.phi_train = None
+        self._log(f"  ✓ Método: {self.info_solucion['metodo']} (ecuaciones normales)")
+        self._log(f"  ✓ Condición estimada de A: {self.info_solucion['condicion']:.3e}")
+        self._log(f"  ✓ Pesos W calculados: {self.pesos.shape}")
+        self._fin_paso('solucion', metodo=self.info_solucion['metodo'])
+        
+        # Paso 6: Métricas
+        self._log("\n[Paso 6] Evaluando modelo en conjunto de entrenamiento...")
+        rmse = self.info_solucion['residuo'] / np.sqrt(acumulador.num_patrones)
+        if reiterable:
+            metricas = self._metricas_por_bloques(bloques())
+        else:
+            metricas = {'EG': None, 'MAE': None, 'RMSE': float(rmse), 'Converge': None}
+            self._log("  ⚠️ Bloques no reiterables: EG y MAE no disponibles")
+        self._fin_paso('evaluacion')
+        
+        self._log(f"\n  MÉTRICAS DE ENTRENAMIENTO:")
+        if metricas['EG'] is not None:
+            self._log(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
+            self._log(f"  ├─ MAE: {metricas['MAE']:.6f}")
+        self._log(f"  ├─ RMSE: {metricas['RMSE']:.6f}")
+        if metricas['Converge'] is not None:
+            self._log(f"  └─ Convergencia: {'✓ SÍ' if metricas['Converge'] else '✗ NO'}")
+        
+        self.historia_entrenamiento = {
+            'num_patrones': acumulador.num_patrones,
+            'num_caracteristicas': num_caracteristicas,
+            'num_centros': self.num_centros,
+            'num_bloques': num_bloques,
+            'solucion': self.info_solucion,
             'metricas': metricas
         }
         
-        print("\n" + "=" * 60)
-        print("ENTRENAMIENTO COMPLETADO")
-        print("=" * 60 + "\n")
+        self.historia_entrenamiento['etapas'] = self._terminar_pasos()
+        self._emitir('fin', metricas=metricas, etapas=self.historia_entrenamiento['etapas'])
+        self._log("\n" + "=" * 60)
+        self._log("ENTRENAMIENTO COMPLETADO")
+        self._log("=" * 60 + "\n")
+        
+        return metricas
+    
+    def actualizar(self, X_nuevo, y_nuevo):
+        """
+        Actualiza los pesos con nuevos patrones sin reentrenar desde cero
+        
+        Los centros quedan fijos; los patrones nuevos se suman a las ecuaciones
+        normales conservadas (G = A^T A, b = A^T y) y se vuelve a factorizar G
+        con Cholesky. El costo es O(n_nuevos·k² + k³), independiente de los
+        patrones ya vistos, y los pesos resultantes son los mismos que se
+        obtendrían entrenando con todos los datos y los mismos centros.
+        
+        Args:
+            X_nuevo: Patrones nuevos (n_nuevos, n_caracteristicas)
+            y_nuevo: Salidas deseadas de los patrones nuevos
+            
+        Returns:
+            dict con métricas del modelo actualizado sobre los patrones nuevos
+        """
+        self._verificar_entrenada()
+        if self.estado_normal is None:
+            raise ValueError("El modelo no conserva sus ecuaciones normales; "
+                             "debe entrenarse de nuevo para poder actualizarlo")
+        
+        y_nuevo = np.asarray(y_nuevo, dtype=float)
+        forma_salida = self.estado_normal.b.shape[1:]
+        if y_nuevo.reshape(len(y_nuevo), -1).shape[1] != (forma_salida[0] if forma_salida else 1):
+            raise ValueError("y_nuevo no tiene el mismo número de salidas que el modelo")
+        
+        self.estado_normal.agregar(self.calcular_phi(X_nuevo, self.centros), y_nuevo)
+        metodo = 'svd' if self.solucionador == 'svd' else 'cholesky'
+        self.pesos, self.info_solucion = self.estado_normal.resolver(metodo)
+        self.phi_train = None
+        
+        metricas = self.calcular_metricas(y_nuevo.reshape((len(y_nuevo),) + forma_salida), 
+                                          self.predecir(X_nuevo))
+        
+        self.historia_entrenamiento['num_patrones'] = self.estado_normal.num_patrones
+        self.historia_entrenamiento['solucion'] = self.info_solucion
+        self.historia_entrenamiento['actualizaciones'] = self.historia_entrenamiento.get('actualizaciones', 0) + 1
+        
+        self._log(f"  ✓ Modelo actualizado con {len(X_nuevo)} patrones "
+                  f"({self.estado_normal.num_patrones} en total), EG del lote: {metricas['EG']:.6f}")
         
         return metricas
     
-    def predecir(self, X):
+    def _log(self, *mensaje, nivel=1):
+        """Escribe el mensaje si la verbosidad de la red alcanza nivel"""
+        if self.verbosidad >= nivel:
+            print(*mensaje)
+    
+    def _emitir(self, evento, **datos):
+        """Envía un evento estructurado a al_evento, si se configuró"""
+        if self.al_evento is not None:
+            self.al_evento({'evento': evento, **datos})
+    
+    def _iniciar_pasos(self, operacion, **datos):
+        """Marca el inicio de una operación cuyos pasos se van a medir"""
+        if self._medidor is not None:
+            # Operación anterior interrumpida por una excepción
+            self._medidor.detener()
+        self._emitir('inicio', operacion=operacion, **datos)
+        self._medidor = MedidorEtapas(self.medir_memoria).iniciar()
+    
+    def _fin_paso(self, paso, **datos):
+        """Cierra el paso actual: registra tiempo, CPU y memoria, y empieza el siguiente"""
+        registro = self._medidor.marcar(paso)
+        self._emitir('paso', paso=paso, duracion=registro['tiempo'], tiempo_cpu=registro['tiempo_cpu'],
+                     memoria_pico=registro['memoria_pico'], **datos)
+        if registro['memoria_pico'] is not None:
+            self._log(f"  ⏱ {paso}: {registro['tiempo']:.4f} s (CPU {registro['tiempo_cpu']:.4f} s, "
+                      f"pico {registro['memoria_pico'] / 2**20:.1f} MB)", nivel=2)
+        else:
+            self._log(f"  ⏱ {paso}: {registro['tiempo']:.4f} s (CPU {registro['tiempo_cpu']:.4f} s)", nivel=2)
+        return registro
+    
+    def _terminar_pasos(self):
+        """Cierra la medición y retorna los registros de cada etapa"""
+        etapas = self._medidor.detener()
+        self._medidor = None
+        return etapas
+    
+    @property
+    def estado_normal(self):
+        """
+        Ecuaciones normales G = A^T A y b = A^T y (AcumuladorNormal) del entrenamiento
+        
+        Se forman al primer acceso (actualizar o guardar el modelo) cuando el
+        solucionador no las dejó formadas, para no pagar su costo en cada
+        entrenamiento.
+        """
+        if self._estado_normal is None and self._generar_estado_normal is not None:
+            self._estado_normal = self._generar_estado_normal()
+            self._generar_estado_normal = None
+        return self._estado_normal
+    
+    @estado_normal.setter
+    def estado_normal(self, estado):
+        self._estado_normal = estado
+        self._generar_estado_normal = None
+    
+    def _diferir_estado_normal(self, generar):
+        self._estado_normal = None
+        self._generar_estado_normal = generar
+    
+    def _crear_estado_normal(self, phi, y):
+        """Acumula las ecuaciones normales de un entrenamiento completo"""
+        y = np.asarray(y)
+        estado = AcumuladorNormal(phi.shape[1], y.shape[1] if y.ndim > 1 else None)
+        estado.agregar(phi, y)
+        return estado
+    
+    def _metricas_por_bloques(self, bloques):
+        """Calcula EG, MAE y RMSE recorriendo los bloques una segunda vez"""
+        suma_abs = 0.0
+        suma_cuad = 0.0
+        n_total = 0
+        n_elementos = 0
+        
+        for X_bloque, y_bloque in bloques:
+            y_bloque = np.asarray(y_bloque)
+            diferencia = y_bloque - self.predecir(X_bloque).reshape(y_bloque.shape)
+            suma_abs += float(np.sum(np.abs(diferencia)))
+            suma_cuad += float(np.sum(diferencia ** 2))
+            n_total += len(y_bloque)
+            n_elementos += diferencia.size
+        
+        # Mismas definiciones que calcular_metricas
+        eg = suma_abs / n_total
+        return {
+            'EG': float(eg),
+            'MAE': float(suma_abs / n_elementos),
+            'RMSE': float(np.sqrt(suma_cuad / n_elementos)),
+            'Converge': eg <= self.error_optimo
+        }
+    
+    def predecir(self, X, tamano_lote=None):
         """
         Realiza predicciones con la red entrenada
         
         Args:
             X: Datos de entrada (n_patrones, n_caracteristicas)
+            tamano_lote: Número de patrones por lote; acota la memoria temporal
+                         a tamano_lote × num_centros. None procesa todo de una vez
             
         Returns:
             Predicciones (n_patrones, n_salidas)
         """
-        if self.centros is None or self.pesos is None:
-            raise ValueError("La red debe ser entrenada primero")
+        self._verificar_entrenada()
         
-        # Calcular distancias y activaciones
-        distancias = self.calcular_distancias(X, self.centros)
-        phi = self.calcular_activaciones(distancias)
+        if tamano_lote is None or tamano_lote >= len(X):
+            return self._predecir_lote(X)
         
-        # Construir matriz A
-        A = self.construir_matriz_interpolacion(phi)
+        y_pred = np.empty((len(X),) + self.pesos.shape[1:])
+        inicio = 0
+        for lote in self.predecir_por_lotes(X, tamano_lote):
+            y_pred[inicio:inicio + len(lote)] = lote
+            inicio += len(lote)
         
-        # Calcular predicciones: y_pred = A * W
-        y_pred = np.dot(A, self.pesos)
+        return y_pred
+    
+    def predecir_por_lotes(self, X, tamano_lote=10000):
+        """
+        Genera las predicciones lote a lote
+        
+        Acepta un array (se recorre en porciones de tamano_lote filas) o un
+        iterable de bloques de entrada, de modo que la memoria temporal queda
+        acotada por tamano_lote × num_centros sin importar el tamaño total.
+        
+        Args:
+            X: Datos de entrada (array) o iterable de arrays de entrada
+            tamano_lote: Número de patrones por lote
+            
+        Yields:
+            Predicciones de cada lote
+        """
+        self._verificar_entrenada()
+        if tamano_lote <= 0:
+            raise ValueError("tamano_lote debe ser positivo")
+        
+        if isinstance(X, np.ndarray):
+            for inicio in range(0, len(X), tamano_lote):
+                yield self._predecir_lote(X[inicio:inicio + tamano_lote])
+        else:
+            for bloque in X:
+                bloque = np.asarray(bloque, dtype=float)
+                for inicio in range(0, len(bloque), tamano_lote):
+                    yield self._predecir_lote(bloque[inicio:inicio + tamano_lote])
+    
+    def predecir_paralelo(self, X, n_trabajadores=None, backend='hilos', tamano_lote=10000):
+        """
+        Realiza predicciones repartiendo las filas entre varios hilos o procesos
+        
+        Args:
+            X: Datos de entrada (n_patrones, n_caracteristicas)
+            n_trabajadores: Número de trabajadores (por defecto, núcleos disponibles)
+            backend: 'hilos' o 'procesos' (memoria compartida)
+            tamano_lote: Patrones por tarea
+            
+        Returns:
+            Predicciones (n_patrones, n_salidas)
+        """
+        from prediccion_paralela import predecir_paralelo
+        return predecir_paralelo(self, X, n_trabajadores, backend, tamano_lote)
+    
+    def obtener_configuracion(self):
+        """
+        Retorna los argumentos del constructor que reproducen esta red
+        
+        Returns:
+            dict con la configuración (sin centros ni pesos)
+        """
+        return {
+            'num_centros': self.num_centros,
+            'error_optimo': self.error_optimo,
+            'motor_distancias': self.motor_distancias.nombre,
+            'memoria_maxima_mb': getattr(self.motor_distancias, 'memoria_maxima_mb', None),
+            'solucionador': self.solucionador,
+            'funcion_activacion': self.funcion_base.nombre,
+            'parametros_activacion': dict(self.funcion_base.parametros),
+            'phi_dispersa': self.phi_dispersa,
+            'estrategia_centros': self.estrategia_centros,
+            'semilla': self.semilla,
+            'dtype': self.dtype.name,
+            'verbosidad': self.verbosidad,
+            'medir_memoria': self.medir_memoria
+        }
+    
+    @classmethod
+    def desde_entrenamiento(cls, datos_modelo, **opciones):
+        """
+        Reconstruye una red a partir de StorageManager.cargar_entrenamiento
+        
+        Args:
+            datos_modelo: dict retornado por cargar_entrenamiento
+            **opciones: Argumentos adicionales del constructor (p. ej. motor_distancias)
+            
+        Returns:
+            RBFNeuralNetwork lista para predecir
+        """
+        info = datos_modelo['info']
+        opciones.setdefault('dtype', info.get('dtype') or 'float64')
+        red = cls(
+            num_centros=info['num_centros'],
+            error_optimo=info['error_optimo'],
+            funcion_activacion=info.get('funcion_activacion') or 'thin_plate',
+            parametros_activacion=info.get('parametros_activacion'),
+            **opciones
+        )
+        red.centros = datos_modelo['modelo']['centros']
+        red.pesos = datos_modelo['modelo']['pesos']
+        if datos_modelo['modelo'].get('estado_normal') is not None:
+            red.estado_normal = acumulador_desde_dict(datos_modelo['modelo']['estado_normal'])
+        return red
+    
+    def _predecir_lote(self, X):
+        """Predice un lote: y = Φ * W[1:] + W0, sin construir A = [1 | Φ]"""
+        phi = self.calcular_phi(X, self.centros)
+        
+        # Producto en el dtype de Φ (sgemm en float32) en lugar de promover Φ a float64
+        y_pred = phi @ self.pesos[1:].astype(phi.dtype, copy=False)
+        y_pred += self.pesos[0]
         
         return y_pred
     
+    def _verificar_entrenada(self):
+        if self.centros is None or self.pesos is None:
+            raise ValueError("La red debe ser entrenada primero")
+    
     def calcular_metricas(self, y_real, y_pred):
         """
         Calcula las métricas de evaluación: EG, MAE, RMSE
@@ -272,19 +845,19 @@ class RBFNeuralNetwork:
         Returns:
             dict con métricas
         """
-        print("\n" + "=" * 60)
-        print("EVALUANDO EN CONJUNTO DE PRUEBA")
-        print("=" * 60)
+        self._log("\n" + "=" * 60)
+        self._log("EVALUANDO EN CONJUNTO DE PRUEBA")
+        self._log("=" * 60)
         
         y_pred = self.predecir(X_test)
         metricas = self.calcular_metricas(y_test, y_pred)
         
-        print(f"\n  MÉTRICAS DE PRUEBA:")
-        print(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
-        print(f"  ├─ MAE: {metricas['MAE']:.6f}")
-        print(f"  └─ RMSE: {metricas['RMSE']:.6f}")
+        self._log(f"\n  MÉTRICAS DE PRUEBA:")
+        self._log(f"  ├─ Error General (EG): {metricas['EG']:.6f}")
+        self._log(f"  ├─ MAE: {metricas['MAE']:.6f}")
+        self._log(f"  └─ RMSE: {metricas['RMSE']:.6f}")
         
-        print("\n" + "=" * 60 + "\n")
+        self._log("\n" + "=" * 60 + "\n")
         
         return metricas
     
@@ -299,6 +872,9 @@ class RBFNeuralNetwork:
             metricas_train, metricas_test: Métricas calculadas
             ruta_salida: Directorio donde guardar los gráficos
         """
+        # Importación diferida: matplotlib solo se necesita para graficar
+        import matplotlib.pyplot as plt
+        
         os.makedirs(ruta_salida, exist_ok=True)
         
         # Predicciones
@@ -383,4 +959,4 @@ class RBFNeuralNetwork:
         plt.savefig(f'{ruta_salida}/dispersion_predicciones.png', dpi=300, bbox_inches='tight')
         plt.close()
         
-        print(f"✓ Gráficos guardados en: {ruta_salida}/")
\ No newline at end of file
+        self._log(f"✓ Gráficos guardados en: {ruta_salida}/")
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Selección de centros radiales para la Red Neuronal RBF
+Estrategias aleatoria, k-means++, k-means (Lloyd) y k-means por mini-lotes
+"""
+
+import numpy as np
+
+from motor_distancias import crear_motor_distancias
+
+
+ESTRATEGIAS_CENTROS = ('aleatoria', 'kmeans++', 'kmeans', 'kmeans_minibatch')
+
+
+def seleccionar_centros(X, num_centros, estrategia='aleatoria', semilla=None, motor=None,
+                        max_iteraciones=100, tolerancia=1e-4, tamano_lote=1024):
+    """
+    Selecciona los centros radiales a partir de los patrones
+
+    Args:
+        X: Matriz de patrones (n_patrones, n_caracteristicas); puede ser un
+           np.memmap en la estrategia 'kmeans_minibatch'
+        num_centros: Número de centros a seleccionar
+        estrategia: 'aleatoria', 'kmeans++', 'kmeans' o 'kmeans_minibatch'
+        semilla: Semilla del generador aleatorio (None usa el estado global de np.random)
+        motor: Motor de distancias (por defecto el vectorizado)
+        max_iteraciones: Iteraciones máximas de k-means / mini-lotes
+        tolerancia: Desplazamiento máximo de los centros para considerar convergencia
+        tamano_lote: Patrones por mini-lote ('kmeans_minibatch')
+
+    Returns:
+        Matriz de centros (num_centros, n_caracteristicas)
+    """
+    if estrategia not in ESTRATEGIAS_CENTROS:
+        raise ValueError(f"Estrategia de centros no soportada: {estrategia}. "
+                         f"Opciones: {', '.join(ESTRATEGIAS_CENTROS)}")
+    if num_centros > X.shape[0]:
+        raise ValueError(f"No se pueden seleccionar {num_centros} centros de {X.shape[0]} patrones")
+
+    # Sin semilla se conserva el comportamiento anterior (estado global de np.random)
+    rng = np.random.RandomState(semilla) if semilla is not None else np.random
+    motor = crear_motor_distancias(motor or 'vectorizado')
+
+    if estrategia == 'aleatoria':
+        indices = rng.choice(X.shape[0], num_centros, replace=False)
+        return np.array(X[indices], dtype=float)
+
+    if estrategia == 'kmeans++':
+        return kmeans_plus_plus(X, num_centros, rng)
+
+    if estrategia == 'kmeans':
+        centros = kmeans_plus_plus(X, num_centros, rng)
+        return kmeans_lloyd(X, centros, motor, max_iteraciones, tolerancia, rng)
+
+    # Inicialización k-means++ sobre una muestra para no recorrer todo X
+    tamano_muestra = min(X.shape[0], max(tamano_lote, 10 * num_centros))
+    muestra = X[np.sort(rng.choice(X.shape[0], tamano_muestra, replace=False))]
+    centros = kmeans_plus_plus(np.asarray(muestra, dtype=float), num_centros, rng)
+    return kmeans_minibatch(X, centros, motor, max_iteraciones, tolerancia, tamano_lote, rng)
+
+
+def kmeans_plus_plus(X, num_centros, rng):
+    """
+    Inicialización k-means++: cada nuevo centro se muestrea con probabilidad
+    proporcional a la distancia al cuadrado al centro más cercano
+
+    Returns:
+        Matriz de centros (num_centros, n_caracteristicas) tomados de X
+    """
+    X = np.asarray(X, dtype=float)
+    n_patrones = X.shape[0]
+    indices = np.empty(num_centros, dtype=int)
+    indices[0] = rng.randint(n_patrones)
+
+    distancia_minima = np.sum((X - X[indices[0]]) ** 2, axis=1)
+    for j in range(1, num_centros):
+        total = distancia_minima.sum()
+        if total <= 0:
+            # Quedan solo puntos repetidos: completar con índices no elegidos
+            restantes = np.setdiff1d(np.arange(n_patrones), indices[:j])
+            indices[j:] = rng.choice(restantes, num_centros - j, replace=False)
+            break
+        indices[j] = rng.choice(n_patrones, p=distancia_minima / total)
+        np.minimum(distancia_minima, np.sum((X - X[indices[j]]) ** 2, axis=1), out=distancia_minima)
+
+    return X[indices].copy()
+
+
+def asignar_centros(X, centros, motor):
+    """
+    Asigna cada patrón a su centro más cercano, por bloques del motor
+
+    Returns:
+        (etiquetas, distancias al cuadrado al centro asignado)
+    """
+    etiquetas = np.empty(X.shape[0], dtype=int)
+    distancias = np.empty(X.shape[0])
+    for filas in motor.iterar_bloques(X.shape[0], centros.shape[0]):
+        d2 = motor.distancias_cuadradas(np.asarray(X[filas], dtype=float), centros)
+        etiquetas[filas] = np.argmin(d2, axis=1)
+        distancias[filas] = d2[np.arange(d2.shape[0]), etiquetas[filas]]
+    return etiquetas, distancias
+
+
+def kmeans_lloyd(X, centros, motor, max_iteraciones, tolerancia, rng):
+    """K-means completo (iteraciones de Lloyd) partiendo de los centros dados"""
+    X = np.asarray(X, dtype=float)
+    centros = centros.copy()
+    num_centros = centros.shape[0]
+
+    for _ in range(max_iteraciones):
+        etiquetas, distancias = asignar_centros(X, centros, motor)
+        conteos = np.bincount(etiquetas, minlength=num_centros)
+
+        nuevos = np.zeros_like(centros)
+        np.add.at(nuevos, etiquetas, X)
+
+        vacios = conteos == 0
+        nuevos[~vacios] /= conteos[~vacios, np.newaxis]
+        if vacios.any():
+            # Reubicar los grupos vacíos en los patrones peor representados
+            lejanos = np.argsort(distancias)[::-1][:vacios.sum()]
+            nuevos[vacios] = X[lejanos]
+
+        desplazamiento = np.max(np.sum((nuevos - centros) ** 2, axis=1))
+        centros = nuevos
+        if desplazamiento <= tolerancia ** 2:
+            break
+
+    return centros
+
+
+def kmeans_minibatch(X, centros, motor, max_iteraciones, tolerancia, tamano_lote, rng):
+    """
+    K-means por mini-lotes (Sculley, 2010)
+
+    Cada iteración solo lee tamano_lote patrones, por lo que sirve para
+    conjuntos demasiado grandes para iteraciones de Lloyd completas.
+    """
+    centros = centros.copy()
+    num_centros = centros.shape[0]
+    conteos = np.zeros(num_centros)
+    tamano_lote = min(tamano_lote, X.shape[0])
+
+    for _ in range(max_iteraciones):
+        indices = np.sort(rng.choice(X.shape[0], tamano_lote, replace=False))
+        lote = np.asarray(X[indices], dtype=float)
+        etiquetas, _ = asignar_centros(lote, centros, motor)
+
+        conteos_lote = np.bincount(etiquetas, minlength=num_centros)
+        sumas = np.zeros_like(centros)
+        np.add.at(sumas, etiquetas, lote)
+
+        # c ← (c·v + Σx) / (v + m): media incremental con tasa 1/v por centro
+        actualizados = conteos_lote > 0
+        conteos_nuevos = conteos[actualizados] + conteos_lote[actualizados]
+        nuevos = (centros[actualizados] * conteos[actualizados, np.newaxis]
+                  + sumas[actualizados]) / conteos_nuevos[:, np.newaxis]
+
+        desplazamiento = np.max(np.sum((nuevos - centros[actualizados]) ** 2, axis=1)) if actualizados.any() else 0.0
+        centros[actualizados] = nuevos
+        conteos[actualizados] = conteos_nuevos
+
+        if desplazamiento <= tolerancia ** 2:
+            break
+
+    return centros
@@ -0,0 +1,93 @@
+"""
+Selección de centros por mínimos cuadrados ortogonales (OLS)
+Selección hacia adelante con factorización QR incremental (Chen, Cowan y Grant, 1991)
+"""
+
+import numpy as np
+
+from solucionador import resolver_triangular
+
+
+def seleccion_ols(phi_candidatos, y, error_optimo, max_centros, tolerancia=1e-10):
+    """
+    Agrega centros de uno en uno eligiendo el que más reduce el error residual
+
+    Mantiene Φ_sel = Q·R con Q de columnas ortogonales y R triangular superior
+    de diagonal unitaria. En cada paso las columnas candidatas restantes se
+    ortogonalizan contra la última columna elegida (Gram-Schmidt modificado),
+    de modo que la reducción del error de cada candidata es (pᵀy)² / (pᵀp) y
+    nunca se vuelve a resolver el problema completo.
+
+    Args:
+        phi_candidatos: Activaciones de los candidatos (n_patrones, n_candidatos)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+        error_optimo: Se detiene en cuanto EG ≤ error_optimo
+        max_centros: Número máximo de centros a seleccionar
+        tolerancia: Norma relativa mínima de una candidata para no considerarla
+                    linealmente dependiente de las ya elegidas
+
+    Returns:
+        (indices, pesos, historial) con los índices de los candidatos elegidos en
+        orden, los pesos [W0, W1..Wk] y el EG tras cada centro agregado
+    """
+    Y = np.asarray(y, dtype=float)
+    unidimensional = Y.ndim == 1
+    Y = Y.reshape(len(Y), -1)
+    n_patrones, n_candidatos = phi_candidatos.shape
+    max_centros = min(max_centros, n_candidatos)
+
+    P = np.array(phi_candidatos, dtype=float)
+    normas_originales = np.einsum('ij,ij->j', P, P)
+    disponibles = np.ones(n_candidatos, dtype=bool)
+
+    # Columna de umbral (unos): siempre es la primera base ortogonal
+    q = np.ones(n_patrones)
+    coeficientes = [(q @ P) / n_patrones]
+    P -= np.outer(q, coeficientes[0])
+    g = [(q @ Y) / n_patrones]
+    residuo = Y - np.outer(q, g[0])
+
+    indices = []
+    historial = []
+    eg = np.sum(np.abs(residuo)) / n_patrones
+
+    while len(indices) < max_centros and eg > error_optimo:
+        normas = np.einsum('ij,ij->j', P, P)
+        validas = disponibles & (normas > tolerancia * np.maximum(normas_originales, 1e-300))
+        if not validas.any():
+            break
+
+        # Reducción del error cuadrático de cada candidata
+        reduccion = np.zeros(n_candidatos)
+        proyecciones = P[:, validas].T @ residuo
+        reduccion[validas] = np.sum(proyecciones ** 2, axis=1) / normas[validas]
+        j = int(np.argmax(np.where(validas, reduccion, -np.inf)))
+
+        q = P[:, j].copy()
+        qq = normas[j]
+        indices.append(j)
+        disponibles[j] = False
+
+        g.append((q @ residuo) / qq)
+        residuo -= np.outer(q, g[-1])
+
+        # Ortogonalizar las candidatas restantes contra la nueva columna
+        coeficientes.append((q @ P) / qq)
+        P -= np.outer(q, coeficientes[-1])
+
+        eg = np.sum(np.abs(residuo)) / n_patrones
+        historial.append(float(eg))
+
+    # R (triangular superior, diagonal unitaria) en la base [1, Φ_sel]
+    columnas = [0] + [j + 1 for j in indices]
+    tamano = len(columnas)
+    R = np.eye(tamano)
+    for fila in range(tamano):
+        for col in range(fila + 1, tamano):
+            R[fila, col] = coeficientes[fila][columnas[col] - 1]
+
+    pesos = resolver_triangular(R, np.vstack(g), inferior=False)
+    if unidimensional:
+        pesos = pesos.ravel()
+
+    return indices, pesos, historial
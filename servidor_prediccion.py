@@ -0,0 +1,553 @@
+"""
+Servidor HTTP/JSON de predicción para la Red Neuronal RBF
+Modelos en caché LRU, micro-lotes y percentiles de latencia
+
+Solo usa la biblioteca estándar y NumPy. Los modelos se cargan desde
+StorageManager la primera vez que se piden y quedan en memoria; las
+solicitudes concurrentes se agrupan en una sola llamada vectorizada a
+RBFNeuralNetwork.predecir por modelo.
+
+Endpoints:
+    POST /predecir   {"modelo_id": 1, "entradas": [[x1, x2, ...], ...]}
+    GET  /modelos    Modelos guardados, por páginas (?limite=100&despues_de=<siguiente>)
+    GET  /metricas   Percentiles de latencia por endpoint y código, micro-lotes y caché
+    GET  /salud      Comprobación de vida
+
+Uso:
+    python -m servidor_prediccion [--puerto 8000] [--db database/rbf_trainings.db]
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from rbf_model import RBFNeuralNetwork
+from storage_manager import StorageManager
+
+
+class ModeloServido:
+    """Red lista para predecir con la normalización y decodificación de su entrenamiento"""
+
+    def __init__(self, modelo_id, datos_modelo):
+        self.modelo_id = modelo_id
+        self.red = RBFNeuralNetwork.desde_entrenamiento(datos_modelo, verbosidad=0)
+        self.num_entradas = datos_modelo['info']['num_entradas']
+
+        # Normalización con NumPy a partir de los parámetros del scaler
+        scaler = datos_modelo['modelo'].get('scaler')
+        self.media = getattr(scaler, 'mean_', None)
+        self.escala = getattr(scaler, 'scale_', None)
+
+        label_encoder = datos_modelo['modelo'].get('label_encoder')
+        self.clases = None if label_encoder is None else np.asarray(label_encoder.classes_)
+
+    def normalizar(self, X):
+        if self.media is not None:
+            X = X - self.media
+        if self.escala is not None:
+            X = X / self.escala
+        return X
+
+    def decodificar(self, predicciones):
+        """Clases predichas (None en regresión), igual que la interfaz gráfica"""
+        if self.clases is None:
+            return None
+        indices = np.clip(np.round(predicciones).astype(int).flatten(), 0, len(self.clases) - 1)
+        return self.clases[indices].tolist()
+
+
+class _CargaEnCurso:
+    """Carga de un modelo que otras solicitudes pueden esperar"""
+
+    def __init__(self):
+        self.modelo = None
+        self.error = None
+        self.listo = threading.Event()
+
+
+class CacheModelos:
+    """
+    Caché LRU de modelos por ID de entrenamiento
+
+    Los modelos se cargan fuera del candado: una carga lenta no bloquea a
+    las solicitudes de modelos ya en memoria. Las solicitudes concurrentes
+    del mismo modelo esperan a la carga en curso en lugar de repetirla.
+    """
+
+    def __init__(self, storage, capacidad=8):
+        """
+        Args:
+            storage: StorageManager del que se cargan los modelos
+            capacidad: Número máximo de modelos en memoria
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.storage = storage
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self.esperas = 0
+        self._modelos = OrderedDict()
+        self._en_curso = {}
+        self._candado = threading.Lock()
+
+    def obtener(self, modelo_id):
+        """
+        Retorna el modelo servido, cargándolo si no está en la caché
+
+        Raises:
+            KeyError: Si no existe el entrenamiento
+        """
+        with self._candado:
+            if modelo_id in self._modelos:
+                self._modelos.move_to_end(modelo_id)
+                self.aciertos += 1
+                return self._modelos[modelo_id]
+
+            carga = self._en_curso.get(modelo_id)
+            propia = carga is None
+            if propia:
+                carga = _CargaEnCurso()
+                self._en_curso[modelo_id] = carga
+                self.fallos += 1
+            else:
+                self.esperas += 1
+
+        if not propia:
+            carga.listo.wait()
+            if carga.error is not None:
+                raise carga.error
+            return carga.modelo
+
+        try:
+            try:
+                datos_modelo = self.storage.cargar_entrenamiento(modelo_id)
+            except ValueError as e:
+                raise KeyError(str(e))
+            carga.modelo = ModeloServido(modelo_id, datos_modelo)
+        except Exception as e:
+            carga.error = e
+            raise
+        finally:
+            with self._candado:
+                # Si se invalidó durante la carga, el modelo no se guarda en la caché
+                if self._en_curso.get(modelo_id) is carga:
+                    del self._en_curso[modelo_id]
+                    if carga.error is None:
+                        self._modelos[modelo_id] = carga.modelo
+                        if len(self._modelos) > self.capacidad:
+                            self._modelos.popitem(last=False)
+            carga.listo.set()
+
+        return carga.modelo
+
+    def invalidar(self, modelo_id=None):
+        """Descarta un modelo (o todos) de la caché"""
+        with self._candado:
+            if modelo_id is None:
+                self._modelos.clear()
+                self._en_curso.clear()
+            else:
+                self._modelos.pop(modelo_id, None)
+                self._en_curso.pop(modelo_id, None)
+
+    def estado(self):
+        with self._candado:
+            return {
+                'capacidad': self.capacidad,
+                'modelos': list(self._modelos),
+                'cargando': list(self._en_curso),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'esperas': self.esperas
+            }
+
+
+class _Solicitud:
+    def __init__(self, modelo, X):
+        self.modelo = modelo
+        self.X = X
+        self.resultado = None
+        self.error = None
+        self.listo = threading.Event()
+
+
+class AgrupadorLotes:
+    """
+    Agrupa solicitudes concurrentes en micro-lotes
+
+    Un único hilo trabajador toma la primera solicitud de la cola y espera
+    como mucho espera_ms a que lleguen más (hasta max_filas filas); luego
+    hace una llamada a predecir por modelo con todas las filas juntas y
+    reparte los resultados. Las redes solo se usan desde este hilo.
+    """
+
+    def __init__(self, max_filas=1024, espera_ms=2.0):
+        """
+        Args:
+            max_filas: Filas máximas por micro-lote
+            espera_ms: Espera máxima para completar un micro-lote
+        """
+        self.max_filas = max_filas
+        self.espera = espera_ms / 1000
+        self.num_lotes = 0
+        self.num_solicitudes = 0
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._ejecutar, daemon=True)
+        self._hilo.start()
+
+    def predecir(self, modelo, X):
+        """Encola X y espera sus predicciones (bloquea al hilo que llama)"""
+        solicitud = _Solicitud(modelo, X)
+        self._cola.put(solicitud)
+        solicitud.listo.wait()
+        if solicitud.error is not None:
+            raise solicitud.error
+        return solicitud.resultado
+
+    def detener(self):
+        self._cola.put(None)
+        self._hilo.join()
+
+    def estado(self):
+        return {
+            'lotes': self.num_lotes,
+            'solicitudes': self.num_solicitudes,
+            'solicitudes_por_lote': self.num_solicitudes / self.num_lotes if self.num_lotes else 0.0
+        }
+
+    def _ejecutar(self):
+        while True:
+            primera = self._cola.get()
+            if primera is None:
+                return
+
+            lote = [primera]
+            filas = len(primera.X)
+            limite = time.perf_counter() + self.espera
+            detener = False
+            while filas < self.max_filas:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    solicitud = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if solicitud is None:
+                    detener = True
+                    break
+                lote.append(solicitud)
+                filas += len(solicitud.X)
+
+            self._procesar(lote)
+            if detener:
+                return
+
+    def _procesar(self, lote):
+        self.num_lotes += 1
+        self.num_solicitudes += len(lote)
+
+        por_modelo = {}
+        for solicitud in lote:
+            por_modelo.setdefault(solicitud.modelo.modelo_id, []).append(solicitud)
+
+        for solicitudes in por_modelo.values():
+            modelo = solicitudes[0].modelo
+            try:
+                X = np.vstack([s.X for s in solicitudes])
+                predicciones = modelo.red.predecir(modelo.normalizar(X))
+                inicio = 0
+                for s in solicitudes:
+                    s.resultado = predicciones[inicio:inicio + len(s.X)]
+                    inicio += len(s.X)
+            except Exception as e:
+                for s in solicitudes:
+                    s.error = e
+            finally:
+                for s in solicitudes:
+                    s.listo.set()
+
+
+class RegistroLatencias:
+    """Latencias recientes (ventana deslizante) por endpoint y código de estado"""
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self, ventana=10000):
+        self.ventana = ventana
+        self._latencias = {}
+        self._candado = threading.Lock()
+
+    def registrar(self, endpoint, codigo, segundos):
+        clave = (endpoint, codigo)
+        with self._candado:
+            if clave not in self._latencias:
+                self._latencias[clave] = deque(maxlen=self.ventana)
+            self._latencias[clave].append(segundos)
+
+    def resumen(self):
+        """Percentiles en milisegundos: {endpoint: {código: estadísticas}}"""
+        with self._candado:
+            copia = {clave: np.array(valores) for clave, valores in self._latencias.items()}
+
+        resumen = {}
+        for (endpoint, codigo), valores in sorted(copia.items()):
+            percentiles = np.percentile(valores * 1000, self.PERCENTILES)
+            resumen.setdefault(endpoint, {})[str(codigo)] = {
+                'n': len(valores),
+                **{f'p{p}_ms': float(v) for p, v in zip(self.PERCENTILES, percentiles)},
+                'max_ms': float(valores.max() * 1000)
+            }
+        return resumen
+
+
+# Modelos por página de GET /modelos
+LIMITE_MODELOS_DEFECTO = 100
+LIMITE_MODELOS_MAXIMO = 1000
+
+
+def _cursor_a_texto(cursor):
+    """Cursor (fecha, id) de listar_entrenamientos_pagina como 'fecha|id'"""
+    return None if cursor is None else f"{cursor[0]}|{cursor[1]}"
+
+
+def _texto_a_cursor(texto):
+    fecha, separador, entrenamiento_id = texto.rpartition('|')
+    if not separador:
+        raise ValueError(f"Cursor inválido: {texto}")
+    return fecha, int(entrenamiento_id)
+
+
+class ManejadorPrediccion(BaseHTTPRequestHandler):
+    """Manejador HTTP; el estado compartido vive en self.server"""
+
+    protocol_version = 'HTTP/1.1'
+
+    # Endpoint con el que se registran las rutas inexistentes (no una clave por ruta)
+    RUTA_DESCONOCIDA = '(desconocida)'
+
+    # Cuerpo máximo que se lee para descartarlo; uno mayor cierra la conexión
+    MAXIMO_DESCARTE = 1 << 20
+
+    def do_GET(self):
+        self._atender({
+            '/salud': self._salud,
+            '/modelos': self._listar_modelos,
+            '/metricas': self._metricas
+        })
+
+    def do_POST(self):
+        self._atender({'/predecir': self._predecir})
+
+    def _atender(self, rutas):
+        """
+        Despacha la solicitud y registra su latencia, también en los errores
+
+        La latencia se registra en finally con el código de estado enviado
+        (400, 404 y 500 incluidos), para que los percentiles no omitan las
+        solicitudes fallidas. Con keep-alive, el cuerpo que el manejador no
+        leyó se descarta al terminar para que no se interprete como la
+        siguiente solicitud.
+        """
+        inicio = time.perf_counter()
+        url = urlsplit(self.path)
+        manejador = rutas.get(url.path)
+        endpoint = url.path if manejador is not None else self.RUTA_DESCONOCIDA
+        self._codigo = None
+        self._cuerpo_leido = False
+        try:
+            if manejador is None:
+                self._responder(404, {'error': f"Ruta no encontrada: {url.path}"})
+            else:
+                manejador(parse_qs(url.query))
+        except Exception as e:
+            if self._codigo is not None:
+                # La respuesta ya empezó a enviarse (p. ej. el cliente cerró la conexión)
+                raise
+            self._responder(500, {'error': str(e)})
+        finally:
+            self.server.latencias.registrar(endpoint, self._codigo or 500,
+                                            time.perf_counter() - inicio)
+            self._descartar_cuerpo()
+
+    def _salud(self, parametros):
+        self._responder(200, {'estado': 'ok'})
+
+    def _metricas(self, parametros):
+        self._responder(200, {
+            'latencias': self.server.latencias.resumen(),
+            'micro_lotes': self.server.agrupador.estado(),
+            'cache': self.server.cache.estado()
+        })
+
+    def _predecir(self, parametros):
+        try:
+            cuerpo = json.loads(self._leer_cuerpo() or b'{}')
+            modelo_id = int(cuerpo['modelo_id'])
+            X = np.asarray(cuerpo['entradas'], dtype=float)
+        except (KeyError, TypeError, ValueError) as e:
+            self._responder(400, {'error': f"Solicitud inválida: {e}"})
+            return
+
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        try:
+            modelo = self.server.cache.obtener(modelo_id)
+        except KeyError as e:
+            self._responder(404, {'error': str(e).strip("'\"")})
+            return
+
+        if X.ndim != 2 or X.shape[1] != modelo.num_entradas or len(X) == 0:
+            self._responder(400, {'error': f"Se esperaban filas de {modelo.num_entradas} entradas"})
+            return
+
+        predicciones = self.server.agrupador.predecir(modelo, X)
+
+        respuesta = {'modelo_id': modelo_id, 'predicciones': predicciones.tolist()}
+        clases = modelo.decodificar(predicciones)
+        if clases is not None:
+            respuesta['clases'] = clases
+        self._responder(200, respuesta)
+
+    def _listar_modelos(self, parametros):
+        """Una página de modelos, del más reciente al más antiguo"""
+        try:
+            limite = int(parametros.get('limite', [LIMITE_MODELOS_DEFECTO])[0])
+            if not 1 <= limite <= LIMITE_MODELOS_MAXIMO:
+                raise ValueError(f"limite debe estar entre 1 y {LIMITE_MODELOS_MAXIMO}")
+            despues_de = parametros.get('despues_de', [None])[0]
+            if despues_de is not None:
+                despues_de = _texto_a_cursor(despues_de)
+        except ValueError as e:
+            self._responder(400, {'error': f"Solicitud inválida: {e}"})
+            return
+
+        pagina = self.server.cache.storage.listar_entrenamientos_pagina(
+            limite=limite, despues_de=despues_de)
+        self._responder(200, {
+            'entrenamientos': pagina['entrenamientos'],
+            'siguiente': _cursor_a_texto(pagina['siguiente'])
+        })
+
+    def _longitud_cuerpo(self):
+        """Content-Length de la solicitud, o None si falta o no es válido con cuerpo"""
+        valor = self.headers.get('Content-Length')
+        if valor is None:
+            return None if 'Transfer-Encoding' in self.headers else 0
+        try:
+            longitud = int(valor)
+        except ValueError:
+            return None
+        return longitud if longitud >= 0 else None
+
+    def _leer_cuerpo(self):
+        """
+        Lee el cuerpo completo de la solicitud
+
+        Raises:
+            ValueError: Si Content-Length falta (con cuerpo) o no es válido; la
+                        conexión se cierra porque no se sabe dónde termina
+        """
+        self._cuerpo_leido = True
+        longitud = self._longitud_cuerpo()
+        if longitud is None:
+            self.close_connection = True
+            raise ValueError("Content-Length ausente o inválido")
+        return self.rfile.read(longitud)
+
+    def _descartar_cuerpo(self):
+        if self._cuerpo_leido:
+            return
+        self._cuerpo_leido = True
+        longitud = self._longitud_cuerpo()
+        if longitud is None or longitud > self.MAXIMO_DESCARTE:
+            self.close_connection = True
+        elif longitud:
+            self.rfile.read(longitud)
+
+    def _responder(self, codigo, datos):
+        cuerpo = json.dumps(datos).encode('utf-8')
+        self._codigo = codigo
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        if self.server.verbosidad >= 2:
+            super().log_message(formato, *args)
+
+
+class ServidorPrediccion(ThreadingHTTPServer):
+    """Servidor HTTP con la caché de modelos, el agrupador y el registro de latencias"""
+
+    daemon_threads = True
+    # Cola de conexiones pendientes amplia: las ráfagas concurrentes son el caso de uso
+    request_queue_size = 128
+
+    def __init__(self, direccion, storage=None, capacidad_cache=8, max_filas_lote=1024,
+                 espera_lote_ms=2.0, verbosidad=1):
+        """
+        Args:
+            direccion: Tupla (host, puerto); puerto 0 elige uno libre
+            storage: StorageManager (por defecto, la base de datos de la aplicación)
+            capacidad_cache: Modelos mantenidos en memoria
+            max_filas_lote: Filas máximas por micro-lote
+            espera_lote_ms: Espera máxima para completar un micro-lote
+            verbosidad: 0 silencioso, 1 resumen, 2 registra cada solicitud
+        """
+        super().__init__(direccion, ManejadorPrediccion)
+        self.cache = CacheModelos(storage or StorageManager(), capacidad_cache)
+        self.agrupador = AgrupadorLotes(max_filas_lote, espera_lote_ms)
+        self.latencias = RegistroLatencias()
+        self.verbosidad = verbosidad
+
+    def server_close(self):
+        super().server_close()
+        self.agrupador.detener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--db', default='database/rbf_trainings.db')
+    parser.add_argument('--permitir-pickle', action='store_true',
+                        help='Carga filas antiguas serializadas con pickle (solo bases de datos de confianza)')
+    parser.add_argument('--capacidad-cache', type=int, default=8)
+    parser.add_argument('--max-filas-lote', type=int, default=1024)
+    parser.add_argument('--espera-lote-ms', type=float, default=2.0)
+    parser.add_argument('--precargar', type=int, nargs='*', default=[], metavar='ID',
+                        help='IDs de modelos a cargar al iniciar')
+    parser.add_argument('--verbosidad', type=int, default=1)
+    args = parser.parse_args()
+
+    storage = StorageManager(args.db, permitir_pickle=args.permitir_pickle)
+    servidor = ServidorPrediccion((args.host, args.puerto), storage,
+                                  args.capacidad_cache, args.max_filas_lote,
+                                  args.espera_lote_ms, args.verbosidad)
+    for modelo_id in args.precargar:
+        servidor.cache.obtener(modelo_id)
+
+    if args.verbosidad:
+        print(f"Servidor de predicción en http://{args.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""
+Solucionador de mínimos cuadrados para la Red Neuronal RBF
+Resuelve A·W ≈ y mediante factorizaciones, sin materializar inversas
+"""
+
+import numpy as np
+
+
+METODOS_SOLUCION = ('auto', 'cholesky', 'qr', 'svd')
+
+# Por encima de 1/sqrt(eps) las ecuaciones normales pierden casi toda la precisión
+CONDICION_MAXIMA_NORMALES = 1.0 / np.sqrt(np.finfo(float).eps)
+
+
+def elegir_metodo(n_filas, n_columnas):
+    """
+    Elige el método de solución según la forma del problema
+
+    Para sistemas muy sobredeterminados (muchos más patrones que centros)
+    las ecuaciones normales con Cholesky son las más rápidas y solo ocupan
+    (k+1)×(k+1); en sistemas casi cuadrados se prefiere QR por estabilidad.
+
+    Args:
+        n_filas: Número de patrones
+        n_columnas: Número de columnas de A (centros + umbral)
+
+    Returns:
+        Nombre del método ('cholesky' o 'qr')
+    """
+    if n_filas >= 4 * n_columnas:
+        return 'cholesky'
+    return 'qr'
+
+
+def resolver_minimos_cuadrados(A, y, metodo='auto', rcond=None, acumulador=None):
+    """
+    Resuelve el problema de mínimos cuadrados min ||A·W - y||
+
+    Args:
+        A: Matriz de interpolación (n_patrones, n_columnas)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+        metodo: 'auto', 'cholesky', 'qr' o 'svd'
+        rcond: Umbral relativo de truncamiento de valores singulares
+        acumulador: AcumuladorNormal vacío (opcional; A debe ser [1 | Φ]). Si
+                    se resuelve por Cholesky, G = A^T A y b = A^T y quedan en
+                    él sin volver a calcularlas; en los demás caminos queda vacío
+
+    Returns:
+        (pesos, info) donde info contiene 'metodo', 'condicion' y 'residuo'
+    """
+    _validar_metodo(metodo)
+    n_filas, n_columnas = A.shape
+
+    # Se registra antes de resolver 'auto' para que info refleje lo que pidió el usuario
+    info = {'metodo_solicitado': metodo}
+
+    automatico = metodo == 'auto'
+    if automatico:
+        metodo = elegir_metodo(n_filas, n_columnas)
+
+    if metodo == 'cholesky':
+        G = A.T @ A
+        b = A.T @ y
+        if acumulador is not None:
+            acumulador.establecer(G, b, float(np.sum(np.square(y))), n_filas)
+        try:
+            pesos, condicion = _resolver_cholesky(G, b)
+            info.update({'metodo': 'cholesky', 'condicion': condicion})
+        except np.linalg.LinAlgError:
+            # A^T A no es definida positiva (A con rango deficiente)
+            pesos, condicion, rango = _resolver_svd(A, y, rcond)
+            info.update({'metodo': 'svd', 'condicion': condicion, 'rango': rango})
+        else:
+            # En modo automático, si G está mal condicionada se pierde
+            # demasiada precisión al elevar cond(A) al cuadrado: usar QR
+            if automatico and condicion > CONDICION_MAXIMA_NORMALES:
+                metodo = 'qr'
+
+    if metodo == 'qr':
+        try:
+            pesos, condicion = _resolver_qr(A, y, rcond)
+            info.update({'metodo': 'qr', 'condicion': condicion})
+        except np.linalg.LinAlgError:
+            pesos, condicion, rango = _resolver_svd(A, y, rcond)
+            info.update({'metodo': 'svd', 'condicion': condicion, 'rango': rango})
+
+    elif metodo == 'svd':
+        pesos, condicion, rango = _resolver_svd(A, y, rcond)
+        info.update({'metodo': 'svd', 'condicion': condicion, 'rango': rango})
+
+    info['residuo'] = float(np.linalg.norm(A @ pesos - y))
+    return pesos, info
+
+
+def resolver_ecuaciones_normales(G, b, yty=None, metodo='cholesky', rcond=None):
+    """
+    Resuelve las ecuaciones normales G·W = b con G = A^T A y b = A^T y
+
+    Útil cuando A no está disponible completa (entrenamiento por bloques).
+
+    Args:
+        G: Matriz de Gram (n_columnas, n_columnas)
+        b: Lado derecho A^T y (n_columnas,) o (n_columnas, n_salidas)
+        yty: Suma de cuadrados de y (opcional, para calcular el residuo)
+        metodo: 'auto', 'cholesky' o 'svd' ('qr' no aplica sin A)
+        rcond: Umbral relativo de truncamiento de valores singulares
+
+    Returns:
+        (pesos, info) donde info contiene 'metodo', 'condicion' y 'residuo'
+    """
+    _validar_metodo(metodo)
+    info = {'metodo_solicitado': metodo}
+    if metodo in ('auto', 'qr'):
+        metodo = 'cholesky'
+
+    if metodo == 'cholesky':
+        try:
+            pesos, condicion = _resolver_cholesky(G, b)
+            info.update({'metodo': 'cholesky', 'condicion': condicion})
+        except np.linalg.LinAlgError:
+            pesos, condicion, rango = _resolver_svd_gram(G, b, rcond)
+            info.update({'metodo': 'svd', 'condicion': condicion, 'rango': rango})
+    else:
+        pesos, condicion, rango = _resolver_svd_gram(G, b, rcond)
+        info.update({'metodo': 'svd', 'condicion': condicion, 'rango': rango})
+
+    info['residuo'] = residuo_desde_gram(G, b, pesos, yty)
+    return pesos, info
+
+
+def residuo_desde_gram(G, b, pesos, yty):
+    """
+    Norma del residuo ||A·W - y|| calculada solo con G, b y y^T y
+
+    ||A·W - y||² = y^T y - 2·W^T b + W^T G W
+    """
+    if yty is None:
+        return None
+    cuadrado = float(np.sum(yty) - 2.0 * np.sum(pesos * b) + np.sum(pesos * (G @ pesos)))
+    return float(np.sqrt(max(cuadrado, 0.0)))
+
+
+def _validar_metodo(metodo):
+    if metodo not in METODOS_SOLUCION:
+        raise ValueError(f"Método de solución no soportado: {metodo}. "
+                         f"Opciones: {', '.join(METODOS_SOLUCION)}")
+
+
+def _resolver_cholesky(G, b):
+    """Cholesky G = L·L^T y dos sustituciones triangulares"""
+    L = np.linalg.cholesky(G)
+    z = resolver_triangular(L, b, inferior=True)
+    pesos = resolver_triangular(L.T, z, inferior=False)
+
+    return pesos, _estimar_condicion_cholesky(G, L)
+
+
+def _estimar_condicion_cholesky(G, L):
+    """
+    cond(A) ≈ sqrt(||G||₁ · ||G⁻¹||₁) a partir del factor de Cholesky de G
+
+    Con SciPy usa el estimador de LAPACK (dpocon, O(k²) sobre L); sin SciPy
+    calcula la condición en norma 1 de G directamente. El cociente de la
+    diagonal de L no sirve: puede subestimar cond(A) en más de un orden de
+    magnitud y el cambio automático a QR llegaría tarde.
+    """
+    try:
+        from scipy.linalg.lapack import dpocon
+    except ImportError:
+        return float(np.sqrt(np.linalg.cond(G, 1)))
+
+    rcond, info = dpocon(L, np.linalg.norm(G, 1), uplo='L')
+    if info != 0 or rcond <= 0:
+        return float('inf')
+    return float(np.sqrt(1.0 / rcond))
+
+
+def _resolver_qr(A, y, rcond):
+    """QR reducida A = Q·R y sustitución hacia atrás con R"""
+    Q, R = np.linalg.qr(A)
+    diagonal = np.abs(np.diag(R))
+    umbral = _umbral_rcond(rcond, A.shape) * diagonal.max()
+    if diagonal.min() <= umbral:
+        raise np.linalg.LinAlgError("R con rango deficiente")
+
+    pesos = resolver_triangular(R, Q.T @ y, inferior=False)
+    condicion = float(diagonal.max() / diagonal.min())
+    return pesos, condicion
+
+
+def _resolver_svd(A, y, rcond):
+    """SVD truncada: descarta valores singulares menores que rcond·s_max"""
+    U, s, Vt = np.linalg.svd(A, full_matrices=False)
+    mascara = s > _umbral_rcond(rcond, A.shape) * s[0]
+    inv_s = np.zeros_like(s)
+    inv_s[mascara] = 1.0 / s[mascara]
+
+    proyeccion = U.T @ y
+    proyeccion = inv_s[:, np.newaxis] * proyeccion if proyeccion.ndim > 1 else inv_s * proyeccion
+    pesos = Vt.T @ proyeccion
+
+    condicion = float(s[0] / s[mascara][-1])
+    return pesos, condicion, int(mascara.sum())
+
+
+def _resolver_svd_gram(G, b, rcond):
+    """Descomposición espectral de G = V·Λ·V^T truncada (equivale a SVD de A)"""
+    autovalores, V = np.linalg.eigh(G)
+    autovalores = autovalores[::-1]
+    V = V[:, ::-1]
+
+    # Los valores singulares de A son sqrt(λ)
+    s = np.sqrt(np.clip(autovalores, 0.0, None))
+    if rcond is not None:
+        mascara = s > rcond * s[0]
+    else:
+        # G tiene precisión eps·λ_max, por lo que el umbral se aplica sobre λ
+        mascara = autovalores > _umbral_rcond(None, G.shape) * autovalores[0]
+    inv_lambda = np.zeros_like(s)
+    inv_lambda[mascara] = 1.0 / autovalores[mascara]
+
+    proyeccion = V.T @ b
+    proyeccion = inv_lambda[:, np.newaxis] * proyeccion if proyeccion.ndim > 1 else inv_lambda * proyeccion
+    pesos = V @ proyeccion
+
+    condicion = float(s[0] / s[mascara][-1])
+    return pesos, condicion, int(mascara.sum())
+
+
+def _umbral_rcond(rcond, forma):
+    if rcond is not None:
+        return rcond
+    return np.finfo(float).eps * max(forma)
+
+
+def resolver_triangular(T, B, inferior):
+    """Sustitución triangular (SciPy si está disponible, NumPy en su defecto)"""
+    try:
+        from scipy.linalg import solve_triangular
+    except ImportError:
+        return np.linalg.solve(T, B)
+    return solve_triangular(T, B, lower=inferior, check_finite=False)
+
+
+class AcumuladorNormal:
+    """
+    Acumula las ecuaciones normales G = A^T A y b = A^T y por bloques
+
+    A = [1 | Φ] nunca se construye: la columna de unos se incorpora de forma
+    implícita, por lo que la memoria es (k+1)×(k+1) + (k+1)×m sin importar
+    el número de patrones.
+    """
+
+    # Filas convertidas a float64 a la vez cuando Φ llega en precisión simple
+    FILAS_CONVERSION = 4096
+
+    def __init__(self, num_centros, num_salidas=None):
+        """
+        Args:
+            num_centros: Número de centros (columnas de Φ)
+            num_salidas: Número de salidas (None si y es unidimensional)
+        """
+        n_columnas = num_centros + 1
+        forma_b = (n_columnas,) if num_salidas is None else (n_columnas, num_salidas)
+        self.G = np.zeros((n_columnas, n_columnas))
+        self.b = np.zeros(forma_b)
+        self.yty = 0.0
+        self.num_patrones = 0
+
+    def agregar(self, phi, y):
+        """
+        Incorpora un bloque de activaciones y salidas
+
+        Args:
+            phi: Activaciones del bloque (n_bloque, num_centros), densa o dispersa
+            y: Salidas del bloque (n_bloque,) o (n_bloque, num_salidas)
+        """
+        disperso = hasattr(phi, 'toarray')
+        if not disperso:
+            phi = np.asarray(phi)
+            if phi.dtype != np.float64:
+                # Φ en precisión simple: acumular en float64 por sub-bloques
+                # para no duplicar Φ completa en memoria
+                y = np.asarray(y, dtype=float).reshape((phi.shape[0],) + self.b.shape[1:])
+                for inicio in range(0, phi.shape[0], self.FILAS_CONVERSION):
+                    fin = inicio + self.FILAS_CONVERSION
+                    self.agregar(phi[inicio:fin].astype(float), y[inicio:fin])
+                return
+        y = np.asarray(y, dtype=float).reshape((phi.shape[0],) + self.b.shape[1:])
+
+        # Bloques de G y b correspondientes a la columna de unos
+        self.G[0, 0] += phi.shape[0]
+        suma_phi = np.asarray(phi.sum(axis=0)).ravel()
+        self.G[0, 1:] += suma_phi
+        self.G[1:, 0] += suma_phi
+        producto = phi.T @ phi
+        self.G[1:, 1:] += producto.toarray() if disperso else producto
+
+        self.b[0] += y.sum(axis=0)
+        self.b[1:] += phi.T @ y
+
+        self.yty += float(np.sum(y * y))
+        self.num_patrones += phi.shape[0]
+
+    def establecer(self, G, b, yty, num_patrones):
+        """Toma ecuaciones normales ya formadas (p. ej. por el camino de Cholesky)"""
+        self.G[...] = G
+        self.b[...] = np.reshape(b, self.b.shape)
+        self.yty = yty
+        self.num_patrones = num_patrones
+
+    def resolver(self, metodo='cholesky', rcond=None):
+        """
+        Resuelve las ecuaciones normales acumuladas
+
+        Returns:
+            (pesos, info) igual que resolver_ecuaciones_normales
+        """
+        if self.num_patrones == 0:
+            raise ValueError("No se ha acumulado ningún bloque")
+        return resolver_ecuaciones_normales(self.G, self.b, self.yty, metodo, rcond)
+
+    def a_dict(self):
+        """Representación serializable (solo arrays y escalares)"""
+        return {'G': self.G, 'b': self.b, 'yty': self.yty, 'num_patrones': self.num_patrones}
+
+
+def acumulador_desde_dict(datos):
+    """Reconstruye un AcumuladorNormal a partir de a_dict()"""
+    b = np.asarray(datos['b'], dtype=float)
+    acumulador = AcumuladorNormal(b.shape[0] - 1, b.shape[1] if b.ndim > 1 else None)
+    acumulador.G[...] = datos['G']
+    acumulador.b[...] = b
+    acumulador.yty = float(datos['yty'])
+    acumulador.num_patrones = int(datos['num_patrones'])
+    return acumulador
@@ -3,188 +3,189 @@ Gestor de Persistencia para Red Neuronal RBF
 Almacena entrenamientos, configuraciones y resultados en SQLite
 """
 
-import sqlite3
 import json
 import pickle
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from conexiones import GrupoConexiones
+from formato_binario import serializar_objeto, deserializar_objeto, es_formato_binario
+from funciones_base import crear_funcion_base
+from migraciones import aplicar_migraciones
+
 class StorageManager:
-    def __init__(self, db_path='database/rbf_trainings.db'):
-        """Inicializa el gestor de persistencia"""
+    # Bases de datos cuyo esquema ya se verificó en este proceso
+    _bases_inicializadas = set()
+    _candado_esquema = threading.Lock()
+    
+    def __init__(self, db_path='database/rbf_trainings.db', wal=True, synchronous='NORMAL',
+                 cache_size_mb=16, cached_statements=128, permitir_pickle=False):
+        """
+        Inicializa el gestor de persistencia
+        
+        Args:
+            db_path: Ruta a la base de datos SQLite
+            wal: Usar journal_mode=WAL (las lecturas no esperan a las escrituras)
+            synchronous: PRAGMA synchronous ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+            cache_size_mb: Caché de páginas por conexión en MB
+            cached_statements: Sentencias preparadas que conserva cada conexión
+            permitir_pickle: Cargar las filas antiguas serializadas con pickle
+                             (solo bases de datos de confianza). Sin él, los
+                             modelos guardados antes del formato binario no
+                             cargan hasta ejecutar convertir_blobs_pickle
+                             ('python -m rbf convertir-pickle')
+        """
         self.db_path = db_path
+        self.permitir_pickle = permitir_pickle
         
         # Crear directorio si no existe
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        # Crear base de datos y tablas
-        self._init_database()
+        # Una conexión persistente por hilo
+        self._conexiones = GrupoConexiones(db_path, wal=wal, synchronous=synchronous,
+                                           cache_size_mb=cache_size_mb,
+                                           cached_statements=cached_statements)
+        
+        # Crear base de datos y tablas (una sola vez por proceso y base de datos)
+        ruta = os.path.abspath(db_path)
+        with self._candado_esquema:
+            if ruta not in self._bases_inicializadas or not os.path.exists(ruta):
+                self._init_database()
+                self._bases_inicializadas.add(ruta)
+    
+    def cerrar(self):
+        """Cierra las conexiones abiertas por este gestor"""
+        self._conexiones.cerrar()
     
     def _init_database(self):
-        """Crea las tablas necesarias en la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Tabla principal de entrenamientos
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS entrenamientos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                dataset_nombre TEXT NOT NULL,
-                fecha_creacion TEXT NOT NULL,
-                num_patrones INTEGER,
-                num_entradas INTEGER,
-                num_salidas INTEGER,
-                num_centros INTEGER,
-                porcentaje_entrenamiento REAL,
-                funcion_activacion TEXT,
-                error_optimo REAL,
-                descripcion TEXT
-            )
-        ''')
-        
-        # Tabla de configuración del modelo
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configuracion_modelo (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entrenamiento_id INTEGER,
-                centros_radiales BLOB,
-                pesos BLOB,
-                scaler_params BLOB,
-                label_encoder BLOB,
-                FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
-            )
-        ''')
-        
-        # Tabla de métricas
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS metricas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entrenamiento_id INTEGER,
-                conjunto TEXT,
-                eg REAL,
-                mae REAL,
-                rmse REAL,
-                converge INTEGER,
-                FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
-            )
-        ''')
-        
-        # Tabla de estadísticas del dataset
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS estadisticas_dataset (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entrenamiento_id INTEGER,
-                estadisticas_json TEXT,
-                FOREIGN KEY (entrenamiento_id) REFERENCES entrenamientos(id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Crea las tablas o aplica las migraciones pendientes del esquema"""
+        aplicar_migraciones(self._conexiones.obtener())
     
     def guardar_entrenamiento(self, nombre, dataset_info, config, modelo_data, 
-                             metricas_train, metricas_test, estadisticas, descripcion=""):
+                             metricas_train, metricas_test, estadisticas, descripcion="",
+                             version=1, entrenamiento_padre_id=None, etapas=None):
         """
         Guarda un entrenamiento completo en la base de datos
         
         Args:
             nombre: Nombre del entrenamiento
             dataset_info: Información del dataset (dict)
-            config: Configuración del modelo (dict)
-            modelo_data: Datos del modelo entrenado (dict con centros, pesos, scaler, encoder)
+            config: Configuración del modelo (dict con num_centros, porcentaje_entrenamiento,
+                    funcion_activacion, parametros_activacion, error_optimo y dtype)
+            modelo_data: Datos del modelo entrenado (dict con centros, pesos, scaler, encoder
+                         y, opcionalmente, estado_normal para actualizaciones posteriores)
             metricas_train: Métricas del conjunto de entrenamiento
             metricas_test: Métricas del conjunto de prueba
             estadisticas: Estadísticas del dataset
             descripcion: Descripción opcional
+            version: Número de versión del modelo
+            entrenamiento_padre_id: ID de la versión anterior (None si es la primera)
+            etapas: Registros por etapa (historia_entrenamiento['etapas']), opcional
         
         Returns:
             id del entrenamiento guardado
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            # Insertar información principal
-            cursor.execute('''
-                INSERT INTO entrenamientos 
-                (nombre, dataset_nombre, fecha_creacion, num_patrones, num_entradas, 
-                 num_salidas, num_centros, porcentaje_entrenamiento, funcion_activacion, 
-                 error_optimo, descripcion)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                nombre,
-                dataset_info['nombre'],
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                dataset_info['num_patrones'],
-                dataset_info['num_entradas'],
-                dataset_info['num_salidas'],
-                config['num_centros'],
-                config['porcentaje_entrenamiento'],
-                config['funcion_activacion'],
-                config['error_optimo'],
-                descripcion
-            ))
-            
-            entrenamiento_id = cursor.lastrowid
-            
-            # Guardar configuración del modelo (serializado con pickle)
-            cursor.execute('''
-                INSERT INTO configuracion_modelo 
-                (entrenamiento_id, centros_radiales, pesos, scaler_params, label_encoder)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                entrenamiento_id,
-                pickle.dumps(modelo_data['centros']),
-                pickle.dumps(modelo_data['pesos']),
-                pickle.dumps(modelo_data['scaler']),
-                pickle.dumps(modelo_data.get('label_encoder'))
-            ))
-            
-            # Guardar métricas de entrenamiento
-            cursor.execute('''
-                INSERT INTO metricas (entrenamiento_id, conjunto, eg, mae, rmse, converge)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                entrenamiento_id,
-                'Entrenamiento',
-                metricas_train['EG'],
-                metricas_train['MAE'],
-                metricas_train['RMSE'],
-                1 if metricas_train['Converge'] else 0
-            ))
-            
-            # Guardar métricas de prueba
-            cursor.execute('''
-                INSERT INTO metricas (entrenamiento_id, conjunto, eg, mae, rmse, converge)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                entrenamiento_id,
-                'Prueba',
-                metricas_test['EG'],
-                metricas_test['MAE'],
-                metricas_test['RMSE'],
-                0  # No aplica convergencia en prueba
-            ))
+            with self._conexiones.transaccion() as cursor:
+                # Insertar información principal
+                cursor.execute('''
+                    INSERT INTO entrenamientos 
+                    (nombre, dataset_nombre, fecha_creacion, num_patrones, num_entradas, 
+                     num_salidas, num_centros, porcentaje_entrenamiento, funcion_activacion, 
+                     error_optimo, descripcion, parametros_activacion, version, 
+                     entrenamiento_padre_id, dtype)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    nombre,
+                    dataset_info['nombre'],
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    dataset_info['num_patrones'],
+                    dataset_info['num_entradas'],
+                    dataset_info['num_salidas'],
+                    config['num_centros'],
+                    config['porcentaje_entrenamiento'],
+                    config['funcion_activacion'],
+                    config['error_optimo'],
+                    descripcion,
+                    json.dumps(config.get('parametros_activacion') or {}),
+                    version,
+                    entrenamiento_padre_id,
+                    config.get('dtype', 'float64')
+                ))
+                
+                entrenamiento_id = cursor.lastrowid
+                
+                # Guardar configuración del modelo (arrays en formato binario, ver formato_binario)
+                cursor.execute('''
+                    INSERT INTO configuracion_modelo 
+                    (entrenamiento_id, centros_radiales, pesos, scaler_params, label_encoder, 
+                     estado_normal)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    entrenamiento_id,
+                    serializar_objeto(modelo_data['centros']),
+                    serializar_objeto(modelo_data['pesos']),
+                    serializar_objeto(modelo_data['scaler']),
+                    serializar_objeto(modelo_data.get('label_encoder')),
+                    serializar_objeto(modelo_data.get('estado_normal'))
+                ))
+                
+                # Guardar métricas de entrenamiento
+                cursor.execute('''
+                    INSERT INTO metricas (entrenamiento_id, conjunto, eg, mae, rmse, converge)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    entrenamiento_id,
+                    'Entrenamiento',
+                    metricas_train['EG'],
+                    metricas_train['MAE'],
+                    metricas_train['RMSE'],
+                    1 if metricas_train['Converge'] else 0
+                ))
+                
+                # Guardar métricas de prueba
+                cursor.execute('''
+                    INSERT INTO metricas (entrenamiento_id, conjunto, eg, mae, rmse, converge)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    entrenamiento_id,
+                    'Prueba',
+                    metricas_test['EG'],
+                    metricas_test['MAE'],
+                    metricas_test['RMSE'],
+                    0  # No aplica convergencia en prueba
+                ))
+                
+                # Guardar estadísticas
+                cursor.execute('''
+                    INSERT INTO estadisticas_dataset (entrenamiento_id, estadisticas_json)
+                    VALUES (?, ?)
+                ''', (
+                    entrenamiento_id,
+                    json.dumps(estadisticas)
+                ))
+                
+                # Guardar tiempos y memoria por etapa
+                if etapas:
+                    cursor.executemany('''
+                        INSERT INTO etapas_entrenamiento 
+                        (entrenamiento_id, orden, etapa, tiempo, tiempo_cpu, memoria_pico)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', [(
+                        entrenamiento_id,
+                        orden,
+                        registro['etapa'],
+                        registro['tiempo'],
+                        registro['tiempo_cpu'],
+                        registro['memoria_pico']
+                    ) for orden, registro in enumerate(etapas)])
             
-            # Guardar estadísticas
-            cursor.execute('''
-                INSERT INTO estadisticas_dataset (entrenamiento_id, estadisticas_json)
-                VALUES (?, ?)
-            ''', (
-                entrenamiento_id,
-                json.dumps(estadisticas)
-            ))
-            
-            conn.commit()
             return entrenamiento_id
             
         except Exception as e:
-            conn.rollback()
             raise Exception(f"Error al guardar entrenamiento: {str(e)}")
-        finally:
-            conn.close()
     
     def cargar_entrenamiento(self, entrenamiento_id):
         """
@@ -193,74 +194,371 @@ class StorageManager:
         Returns:
             dict con toda la información del entrenamiento
         """
-        conn = sqlite3.connect(self.db_path)
+        resultado = self.obtener_metadatos(entrenamiento_id)
+        resultado['modelo'] = self.cargar_configuracion_modelo(entrenamiento_id)
+        resultado['estadisticas'] = self._cargar_estadisticas(entrenamiento_id)
+        resultado['etapas'] = self._cargar_etapas(entrenamiento_id)
+        return resultado
+    
+    def obtener_metadatos(self, entrenamiento_id):
+        """
+        Información y métricas de un entrenamiento, sin leer el modelo
+        
+        Una sola consulta por clave primaria (las métricas se unen por el
+        índice de entrenamiento_id); no lee ni deserializa los BLOBs de
+        configuracion_modelo, por lo que sirve para mostrar modelos sin
+        cargarlos.
+        
+        Returns:
+            dict con 'info' y 'metricas' (mismo formato que cargar_entrenamiento)
+        """
+        conn = self._conexiones.obtener()
         cursor = conn.cursor()
         
         try:
-            # Cargar información principal
-            cursor.execute('SELECT * FROM entrenamientos WHERE id = ?', (entrenamiento_id,))
-            entrenamiento = cursor.fetchone()
-            
-            if not entrenamiento:
-                raise ValueError(f"No se encontró el entrenamiento con ID {entrenamiento_id}")
-            
-            # Cargar configuración del modelo
-            cursor.execute('SELECT * FROM configuracion_modelo WHERE entrenamiento_id = ?', 
-                          (entrenamiento_id,))
+            cursor.execute('''
+                SELECT e.id, e.nombre, e.dataset_nombre, e.fecha_creacion, e.num_patrones,
+                       e.num_entradas, e.num_salidas, e.num_centros, e.porcentaje_entrenamiento,
+                       e.funcion_activacion, e.error_optimo, e.descripcion,
+                       e.parametros_activacion, e.version, e.entrenamiento_padre_id, e.dtype,
+                       mt.eg, mt.mae, mt.rmse, mt.converge, mp.eg, mp.mae, mp.rmse
+                FROM entrenamientos e
+                LEFT JOIN metricas mt ON mt.entrenamiento_id = e.id AND mt.conjunto = 'Entrenamiento'
+                LEFT JOIN metricas mp ON mp.entrenamiento_id = e.id AND mp.conjunto = 'Prueba'
+                WHERE e.id = ?
+            ''', (entrenamiento_id,))
+            fila = cursor.fetchone()
+        finally:
+            cursor.close()
+        
+        if not fila:
+            raise ValueError(f"No se encontró el entrenamiento con ID {entrenamiento_id}")
+        
+        return {
+            'info': {
+                'id': fila[0],
+                'nombre': fila[1],
+                'dataset_nombre': fila[2],
+                'fecha_creacion': fila[3],
+                'num_patrones': fila[4],
+                'num_entradas': fila[5],
+                'num_salidas': fila[6],
+                'num_centros': fila[7],
+                'porcentaje_entrenamiento': fila[8],
+                'funcion_activacion': fila[9],
+                'error_optimo': fila[10],
+                'descripcion': fila[11],
+                'parametros_activacion': json.loads(fila[12]) if fila[12] else {},
+                'version': fila[13] or 1,
+                'entrenamiento_padre_id': fila[14],
+                'dtype': fila[15] or 'float64'
+            },
+            'metricas': {
+                'entrenamiento': {
+                    'EG': fila[16],
+                    'MAE': fila[17],
+                    'RMSE': fila[18],
+                    'Converge': bool(fila[19])
+                },
+                'prueba': {
+                    'EG': fila[20],
+                    'MAE': fila[21],
+                    'RMSE': fila[22]
+                }
+            }
+        }
+    
+    def cargar_configuracion_modelo(self, entrenamiento_id):
+        """
+        Centros, pesos, scaler, label encoder y estado normal de un entrenamiento
+        
+        Returns:
+            dict 'modelo' de cargar_entrenamiento
+        """
+        conn = self._conexiones.obtener()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                SELECT centros_radiales, pesos, scaler_params, label_encoder, estado_normal
+                FROM configuracion_modelo WHERE entrenamiento_id = ?
+            ''', (entrenamiento_id,))
             config = cursor.fetchone()
+        finally:
+            cursor.close()
+        
+        if not config:
+            raise ValueError(f"No se encontró el modelo del entrenamiento con ID {entrenamiento_id}")
+        
+        # Sin copia en formato binario; las filas antiguas (pickle) solo con permitir_pickle
+        return {
+            'centros': deserializar_objeto(config[0], self.permitir_pickle),
+            'pesos': deserializar_objeto(config[1], self.permitir_pickle),
+            'scaler': deserializar_objeto(config[2], self.permitir_pickle),
+            'label_encoder': deserializar_objeto(config[3], self.permitir_pickle),
+            'estado_normal': deserializar_objeto(config[4], self.permitir_pickle)
+        }
+    
+    def convertir_blobs_pickle(self):
+        """
+        Reescribe en formato binario las filas antiguas de configuracion_modelo
+        
+        Lee los BLOBs serializados con pickle, por lo que solo debe usarse con
+        bases de datos de confianza. Después de convertirlas, las filas se
+        cargan sin permitir_pickle.
+        
+        Returns:
+            Número de filas convertidas
+        """
+        columnas = ('centros_radiales', 'pesos', 'scaler_params', 'label_encoder', 'estado_normal')
+        try:
+            with self._conexiones.transaccion() as cursor:
+                cursor.execute(f"SELECT id, {', '.join(columnas)} FROM configuracion_modelo")
+                actualizaciones = []
+                for fila in cursor.fetchall():
+                    blobs = [serializar_objeto(deserializar_objeto(blob, permitir_pickle=True))
+                             if blob is not None and not es_formato_binario(blob) else blob
+                             for blob in fila[1:]]
+                    if blobs != list(fila[1:]):
+                        actualizaciones.append((*blobs, fila[0]))
+                
+                cursor.executemany(f"UPDATE configuracion_modelo SET {' = ?, '.join(columnas)} = ? "
+                                   f"WHERE id = ?", actualizaciones)
             
-            # Cargar métricas
-            cursor.execute('SELECT * FROM metricas WHERE entrenamiento_id = ?', 
-                          (entrenamiento_id,))
-            metricas = cursor.fetchall()
+            return len(actualizaciones)
             
-            # Cargar estadísticas
+        except Exception as e:
+            raise Exception(f"Error al convertir filas antiguas: {str(e)}")
+    
+    def cargar_modelo_diferido(self, entrenamiento_id, **opciones):
+        """
+        Modelo cuyos arrays se leen y deserializan recién al primer uso
+        
+        Args:
+            entrenamiento_id: ID del entrenamiento
+            **opciones: Argumentos del constructor de la red (p. ej. verbosidad)
+        
+        Returns:
+            ModeloDiferido con info y métricas ya disponibles
+        """
+        return ModeloDiferido(self, self.obtener_metadatos(entrenamiento_id), **opciones)
+    
+    def _cargar_estadisticas(self, entrenamiento_id):
+        conn = self._conexiones.obtener()
+        cursor = conn.cursor()
+        try:
             cursor.execute('SELECT estadisticas_json FROM estadisticas_dataset WHERE entrenamiento_id = ?', 
                           (entrenamiento_id,))
             estadisticas = cursor.fetchone()
+        finally:
+            cursor.close()
+        return json.loads(estadisticas[0]) if estadisticas else {}
+    
+    def _cargar_etapas(self, entrenamiento_id):
+        conn = self._conexiones.obtener()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT etapa, tiempo, tiempo_cpu, memoria_pico FROM etapas_entrenamiento 
+                WHERE entrenamiento_id = ? ORDER BY orden
+            ''', (entrenamiento_id,))
+            return [{'etapa': fila[0], 'tiempo': fila[1], 'tiempo_cpu': fila[2], 'memoria_pico': fila[3]}
+                    for fila in cursor.fetchall()]
+        finally:
+            cursor.close()
+    
+    def guardar_version(self, entrenamiento_padre_id, modelo_data, metricas_train, 
+                        metricas_test, num_patrones=None, descripcion=""):
+        """
+        Guarda un modelo actualizado como nueva versión de un entrenamiento
+        
+        La configuración, el dataset y las estadísticas se toman de la versión
+        anterior, que se conserva sin cambios.
+        
+        Args:
+            entrenamiento_padre_id: ID de la versión anterior
+            modelo_data: Datos del modelo actualizado (mismo formato que guardar_entrenamiento)
+            metricas_train: Métricas de entrenamiento del modelo actualizado
+            metricas_test: Métricas de prueba del modelo actualizado
+            num_patrones: Patrones acumulados (por defecto, los de la versión anterior)
+            descripcion: Descripción opcional
+        
+        Returns:
+            id de la nueva versión
+        """
+        info = self.obtener_metadatos(entrenamiento_padre_id)['info']
+        version = info['version'] + 1
+        
+        dataset_info = {
+            'nombre': info['dataset_nombre'],
+            'num_patrones': num_patrones if num_patrones is not None else info['num_patrones'],
+            'num_entradas': info['num_entradas'],
+            'num_salidas': info['num_salidas']
+        }
+        config = {
+            'num_centros': info['num_centros'],
+            'porcentaje_entrenamiento': info['porcentaje_entrenamiento'],
+            'funcion_activacion': info['funcion_activacion'],
+            'parametros_activacion': info['parametros_activacion'],
+            'error_optimo': info['error_optimo'],
+            'dtype': info['dtype']
+        }
+        nombre_base = info['nombre'].rsplit(' v', 1)[0] if info['version'] > 1 else info['nombre']
+        
+        return self.guardar_entrenamiento(
+            nombre=f"{nombre_base} v{version}",
+            dataset_info=dataset_info,
+            config=config,
+            modelo_data=modelo_data,
+            metricas_train=metricas_train,
+            metricas_test=metricas_test,
+            estadisticas=self._cargar_estadisticas(entrenamiento_padre_id),
+            descripcion=descripcion or f"Actualización de la versión {info['version']} (ID {info['id']})",
+            version=version,
+            entrenamiento_padre_id=entrenamiento_padre_id
+        )
+    
+    def resumen_etapas(self, dataset_nombre=None):
+        """
+        Tiempo y memoria promedio de cada etapa entre los entrenamientos guardados
+        
+        Permite detectar regresiones y la etapa dominante por dataset.
+        
+        Args:
+            dataset_nombre: Limitar el resumen a un dataset (None = todos)
+        
+        Returns:
+            Lista de diccionarios por etapa, ordenada por tiempo promedio descendente
+        """
+        conn = self._conexiones.obtener()
+        cursor = conn.cursor()
+        
+        consulta = '''
+            SELECT e.etapa, COUNT(*), AVG(e.tiempo), MAX(e.tiempo), AVG(e.tiempo_cpu), 
+                   MAX(e.memoria_pico)
+            FROM etapas_entrenamiento e
+            JOIN entrenamientos t ON t.id = e.entrenamiento_id
+        '''
+        parametros = ()
+        if dataset_nombre is not None:
+            consulta += ' WHERE t.dataset_nombre = ?'
+            parametros = (dataset_nombre,)
+        consulta += ' GROUP BY e.etapa ORDER BY AVG(e.tiempo) DESC'
+        
+        cursor.execute(consulta, parametros)
+        resumen = []
+        for row in cursor.fetchall():
+            resumen.append({
+                'etapa': row[0],
+                'num_entrenamientos': row[1],
+                'tiempo_promedio': row[2],
+                'tiempo_maximo': row[3],
+                'tiempo_cpu_promedio': row[4],
+                'memoria_pico_maxima': row[5]
+            })
+        
+        cursor.close()
+        return resumen
+    
+    def guardar_busqueda(self, modo, dataset_nombre, espacio, ensayos, mejor, duracion):
+        """
+        Registra una búsqueda de hiperparámetros y todos sus ensayos
+        
+        Args:
+            modo: Modo de búsqueda ('rejilla', 'aleatoria', 'halving')
+            dataset_nombre: Nombre del dataset
+            espacio: Espacio de búsqueda (dict serializable a JSON)
+            ensayos: Lista de ensayos de buscar_hiperparametros
+            mejor: Ensayo elegido
+            duracion: Duración total en segundos
+        
+        Returns:
+            id de la búsqueda guardada
+        """
+        try:
+            with self._conexiones.transaccion() as cursor:
+                cursor.execute('''
+                    INSERT INTO busquedas 
+                    (fecha_creacion, modo, dataset_nombre, espacio_json, num_ensayos, mejor_funcion, 
+                     mejor_parametros, mejor_num_centros, mejor_eg_validacion, duracion)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    modo,
+                    dataset_nombre,
+                    json.dumps(espacio),
+                    len(ensayos),
+                    mejor['funcion_activacion'],
+                    json.dumps(mejor['parametros_activacion']),
+                    mejor['num_centros'],
+                    mejor['eg_validacion'],
+                    duracion
+                ))
+                
+                busqueda_id = cursor.lastrowid
+                
+                cursor.executemany('''
+                    INSERT INTO ensayos 
+                    (busqueda_id, ronda, funcion_activacion, parametros_activacion, num_centros, 
+                     num_patrones, metodo, condicion, eg_entrenamiento, rmse_entrenamiento, 
+                     eg_validacion, rmse_validacion, converge, duracion)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    busqueda_id,
+                    e['ronda'],
+                    e['funcion_activacion'],
+                    json.dumps(e['parametros_activacion']),
+                    e['num_centros'],
+                    e['num_patrones'],
+                    e['metodo'],
+                    e['condicion'],
+                    e['eg_entrenamiento'],
+                    e['rmse_entrenamiento'],
+                    e['eg_validacion'],
+                    e['rmse_validacion'],
+                    1 if e['converge'] else 0,
+                    e['tiempo']
+                ) for e in ensayos])
             
-            # Construir objeto de respuesta
-            resultado = {
-                'info': {
-                    'id': entrenamiento[0],
-                    'nombre': entrenamiento[1],
-                    'dataset_nombre': entrenamiento[2],
-                    'fecha_creacion': entrenamiento[3],
-                    'num_patrones': entrenamiento[4],
-                    'num_entradas': entrenamiento[5],
-                    'num_salidas': entrenamiento[6],
-                    'num_centros': entrenamiento[7],
-                    'porcentaje_entrenamiento': entrenamiento[8],
-                    'funcion_activacion': entrenamiento[9],
-                    'error_optimo': entrenamiento[10],
-                    'descripcion': entrenamiento[11]
-                },
-                'modelo': {
-                    'centros': pickle.loads(config[2]),
-                    'pesos': pickle.loads(config[3]),
-                    'scaler': pickle.loads(config[4]),
-                    'label_encoder': pickle.loads(config[5])
-                },
-                'metricas': {
-                    'entrenamiento': {
-                        'EG': metricas[0][3],
-                        'MAE': metricas[0][4],
-                        'RMSE': metricas[0][5],
-                        'Converge': bool(metricas[0][6])
-                    },
-                    'prueba': {
-                        'EG': metricas[1][3],
-                        'MAE': metricas[1][4],
-                        'RMSE': metricas[1][5]
-                    }
-                },
-                'estadisticas': json.loads(estadisticas[0]) if estadisticas else {}
-            }
-            
-            return resultado
+            return busqueda_id
             
-        finally:
-            conn.close()
+        except Exception as e:
+            raise Exception(f"Error al guardar búsqueda: {str(e)}")
+    
+    def listar_ensayos(self, busqueda_id):
+        """
+        Lista los ensayos de una búsqueda, ordenados por EG de validación
+        
+        Returns:
+            Lista de diccionarios con información de cada ensayo
+        """
+        conn = self._conexiones.obtener()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT ronda, funcion_activacion, parametros_activacion, num_centros, num_patrones, 
+                   eg_entrenamiento, eg_validacion, converge, duracion 
+            FROM ensayos 
+            WHERE busqueda_id = ? 
+            ORDER BY eg_validacion
+        ''', (busqueda_id,))
+        
+        ensayos = []
+        for row in cursor.fetchall():
+            ensayos.append({
+                'ronda': row[0],
+                'funcion_activacion': row[1],
+                'parametros_activacion': json.loads(row[2]) if row[2] else {},
+                'num_centros': row[3],
+                'num_patrones': row[4],
+                'eg_entrenamiento': row[5],
+                'eg_validacion': row[6],
+                'converge': bool(row[7]),
+                'duracion': row[8]
+            })
+        
+        cursor.close()
+        return ensayos
     
     def listar_entrenamientos(self):
         """
@@ -269,7 +567,7 @@ class StorageManager:
         Returns:
             Lista de diccionarios con información de cada entrenamiento
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conexiones.obtener()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -290,31 +588,122 @@ class StorageManager:
                 'split': f"{row[5]*100:.0f}%"
             })
         
-        conn.close()
+        cursor.close()
         return entrenamientos
     
-    def eliminar_entrenamiento(self, entrenamiento_id):
-        """Elimina un entrenamiento y todos sus datos asociados"""
-        conn = sqlite3.connect(self.db_path)
+    def listar_entrenamientos_pagina(self, limite=100, despues_de=None, dataset_nombre=None,
+                                     num_centros_min=None, num_centros_max=None,
+                                     fecha_desde=None, fecha_hasta=None,
+                                     eg_prueba_max=None, eg_entrenamiento_max=None,
+                                     solo_convergentes=False):
+        """
+        Lista una página de entrenamientos, del más reciente al más antiguo
+        
+        Paginación por clave (fecha_creacion, id): cada página continúa donde
+        terminó la anterior recorriendo el índice por fecha, por lo que su
+        costo no depende de cuántos entrenamientos haya guardados ni de la
+        posición de la página (a diferencia de OFFSET).
+        
+        Args:
+            limite: Entrenamientos por página
+            despues_de: Cursor 'siguiente' de la página anterior (None = primera página)
+            dataset_nombre: Filtrar por nombre de dataset
+            num_centros_min, num_centros_max: Rango de número de centros
+            fecha_desde, fecha_hasta: Rango de fechas ('AAAA-MM-DD' o 'AAAA-MM-DD HH:MM:SS';
+                                      una fecha sin hora incluye todo el día)
+            eg_prueba_max: EG máximo en el conjunto de prueba
+            eg_entrenamiento_max: EG máximo en el conjunto de entrenamiento
+            solo_convergentes: Solo entrenamientos que convergieron
+        
+        Returns:
+            dict con 'entrenamientos' (lista de diccionarios como listar_entrenamientos,
+            más 'eg_entrenamiento', 'eg_prueba' y 'converge') y 'siguiente' (cursor
+            para la página siguiente, None si no hay más)
+        """
+        condiciones = []
+        parametros = []
+        
+        if dataset_nombre:
+            condiciones.append('e.dataset_nombre = ?')
+            parametros.append(dataset_nombre)
+        if num_centros_min is not None:
+            condiciones.append('e.num_centros >= ?')
+            parametros.append(num_centros_min)
+        if num_centros_max is not None:
+            condiciones.append('e.num_centros <= ?')
+            parametros.append(num_centros_max)
+        if fecha_desde:
+            condiciones.append('e.fecha_creacion >= ?')
+            parametros.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append('e.fecha_creacion <= ?')
+            parametros.append(fecha_hasta + ' 23:59:59' if len(fecha_hasta) == 10 else fecha_hasta)
+        # Las condiciones sobre métricas van dentro de IFNULL: así SQLite conserva
+        # el LEFT JOIN y recorre entrenamientos por el índice de fecha, en lugar
+        # de recorrer toda la tabla metricas y ordenar el resultado
+        if eg_prueba_max is not None:
+            condiciones.append('IFNULL(mp.eg, ?) <= ?')
+            parametros.extend([float('inf'), eg_prueba_max])
+        if eg_entrenamiento_max is not None:
+            condiciones.append('IFNULL(mt.eg, ?) <= ?')
+            parametros.extend([float('inf'), eg_entrenamiento_max])
+        if solo_convergentes:
+            condiciones.append('IFNULL(mt.converge, 0) = 1')
+        if despues_de is not None:
+            # La primera condición acota el recorrido del índice; la segunda desempata por id
+            fecha, entrenamiento_id = despues_de
+            condiciones.append('e.fecha_creacion <= ? AND (e.fecha_creacion < ? OR e.id < ?)')
+            parametros.extend([fecha, fecha, entrenamiento_id])
+        
+        consulta = '''
+            SELECT e.id, e.nombre, e.dataset_nombre, e.fecha_creacion, e.num_centros, 
+                   e.porcentaje_entrenamiento, mt.eg, mp.eg, mt.converge
+            FROM entrenamientos e
+            LEFT JOIN metricas mt ON mt.entrenamiento_id = e.id AND mt.conjunto = 'Entrenamiento'
+            LEFT JOIN metricas mp ON mp.entrenamiento_id = e.id AND mp.conjunto = 'Prueba'
+        '''
+        if condiciones:
+            consulta += ' WHERE ' + ' AND '.join(condiciones)
+        # Una fila de más para saber si hay página siguiente
+        consulta += ' ORDER BY e.fecha_creacion DESC, e.id DESC LIMIT ?'
+        parametros.append(limite + 1)
+        
+        conn = self._conexiones.obtener()
         cursor = conn.cursor()
+        cursor.execute(consulta, parametros)
+        filas = cursor.fetchall()
+        cursor.close()
+        
+        entrenamientos = [{
+            'id': row[0],
+            'nombre': row[1],
+            'dataset': row[2],
+            'fecha': row[3],
+            'num_centros': row[4],
+            'split': f"{row[5]*100:.0f}%",
+            'eg_entrenamiento': row[6],
+            'eg_prueba': row[7],
+            'converge': bool(row[8])
+        } for row in filas[:limite]]
+        
+        siguiente = None
+        if len(filas) > limite:
+            siguiente = (entrenamientos[-1]['fecha'], entrenamientos[-1]['id'])
         
+        return {'entrenamientos': entrenamientos, 'siguiente': siguiente}
+    
+    def eliminar_entrenamiento(self, entrenamiento_id):
+        """Elimina un entrenamiento y todos sus datos asociados"""
         try:
-            cursor.execute('DELETE FROM estadisticas_dataset WHERE entrenamiento_id = ?', 
-                          (entrenamiento_id,))
-            cursor.execute('DELETE FROM metricas WHERE entrenamiento_id = ?', 
-                          (entrenamiento_id,))
-            cursor.execute('DELETE FROM configuracion_modelo WHERE entrenamiento_id = ?', 
-                          (entrenamiento_id,))
-            cursor.execute('DELETE FROM entrenamientos WHERE id = ?', 
-                          (entrenamiento_id,))
+            with self._conexiones.transaccion() as cursor:
+                # Configuración, métricas, estadísticas y etapas se borran en cascada
+                cursor.execute('DELETE FROM entrenamientos WHERE id = ?', 
+                              (entrenamiento_id,))
             
-            conn.commit()
             return True
+            
         except Exception as e:
-            conn.rollback()
             raise Exception(f"Error al eliminar entrenamiento: {str(e)}")
-        finally:
-            conn.close()
     
     def exportar_modelo(self, entrenamiento_id, ruta_destino):
         """
@@ -335,4 +724,79 @@ class StorageManager:
         with open(ruta_destino, 'wb') as f:
             pickle.dump(modelo_export, f)
         
-        return True
\ No newline at end of file
+        return True
+
+
+class ModeloDiferido:
+    """
+    Modelo guardado que se materializa al primer uso
+    
+    info y metricas están disponibles de inmediato (una fila de la base de
+    datos); los BLOBs de configuracion_modelo (centros, pesos, scaler, label
+    encoder) se leen y deserializan recién la primera vez que se accede a
+    modelo o red, p. ej. al llamar a predecir. Después de eso se comporta
+    como la red cargada con RBFNeuralNetwork.desde_entrenamiento.
+    """
+    
+    def __init__(self, storage, metadatos, **opciones):
+        """
+        Args:
+            storage: StorageManager del que se leen los arrays
+            metadatos: dict retornado por obtener_metadatos
+            **opciones: Argumentos del constructor de la red (p. ej. verbosidad)
+        """
+        self.storage = storage
+        self.info = metadatos['info']
+        self.metricas = metadatos['metricas']
+        self.opciones = opciones
+        self._modelo = None
+        self._red = None
+        self._candado = threading.Lock()
+    
+    @property
+    def entrenamiento_id(self):
+        return self.info['id']
+    
+    @property
+    def cargado(self):
+        """True si los arrays ya se deserializaron"""
+        return self._red is not None
+    
+    @property
+    def funcion_base(self):
+        """Función de activación (se construye desde info, sin cargar el modelo)"""
+        if self._red is not None:
+            return self._red.funcion_base
+        return crear_funcion_base(self.info['funcion_activacion'] or 'thin_plate',
+                                  **self.info['parametros_activacion'])
+    
+    @property
+    def modelo(self):
+        """dict 'modelo' de cargar_entrenamiento (centros, pesos, scaler, label_encoder)"""
+        self._materializar()
+        return self._modelo
+    
+    @property
+    def red(self):
+        """RBFNeuralNetwork lista para predecir"""
+        self._materializar()
+        return self._red
+    
+    def predecir(self, X, tamano_lote=None):
+        return self.red.predecir(X, tamano_lote=tamano_lote)
+    
+    def predecir_por_lotes(self, X, tamano_lote=10000):
+        return self.red.predecir_por_lotes(X, tamano_lote=tamano_lote)
+    
+    def _materializar(self):
+        if self._red is not None:
+            return
+        # Dos hilos que predicen a la vez no deserializan el modelo dos veces
+        with self._candado:
+            if self._red is None:
+                from rbf_model import RBFNeuralNetwork
+                
+                modelo = self.storage.cargar_configuracion_modelo(self.entrenamiento_id)
+                self._red = RBFNeuralNetwork.desde_entrenamiento(
+                    {'info': self.info, 'modelo': modelo}, **self.opciones)
+                self._modelo = modelo
@@ -0,0 +1,92 @@
+"""
+Pruebas de RBFNeuralNetwork.actualizar: agregar patrones por incrementos
+debe dar los mismos pesos que reentrenar con todos los datos y los mismos
+centros
+"""
+
+import numpy as np
+import pytest
+
+from rbf_model import RBFNeuralNetwork
+from solucionador import acumulador_desde_dict
+
+
+def _datos(num_patrones=300, semilla=0):
+    rng = np.random.RandomState(semilla)
+    X = rng.rand(num_patrones, 3)
+    y = np.column_stack([np.sin(3 * X.sum(axis=1)), X[:, 0] * X[:, 1]])
+    return X, y
+
+
+def _pesos_reentrenados(modelo, X, y):
+    """Mínimos cuadrados sobre todos los patrones con los centros del modelo"""
+    A = modelo.construir_matriz_interpolacion(modelo.calcular_phi(X, modelo.centros))
+    return np.linalg.lstsq(A, y, rcond=None)[0]
+
+
+def _actualizar_por_incrementos(modelo, X, y, inicio, num_incrementos=3):
+    for X_lote, y_lote in zip(np.array_split(X[inicio:], num_incrementos),
+                              np.array_split(y[inicio:], num_incrementos)):
+        modelo.actualizar(X_lote, y_lote)
+
+
+@pytest.mark.parametrize('solucionador', ['cholesky', 'qr', 'svd', 'auto'])
+def test_actualizar_igual_a_reentrenar(solucionador):
+    X, y = _datos()
+    modelo = RBFNeuralNetwork(12, semilla=0, solucionador=solucionador, verbosidad=0)
+    modelo.entrenar(X[:150], y[:150])
+
+    _actualizar_por_incrementos(modelo, X, y, 150)
+
+    assert modelo.estado_normal.num_patrones == len(X)
+    np.testing.assert_allclose(modelo.pesos, _pesos_reentrenados(modelo, X, y),
+                               rtol=1e-7, atol=1e-9)
+
+
+def test_actualizar_despues_de_ols():
+    X, y = _datos()
+    modelo = RBFNeuralNetwork(12, error_optimo=0.0, semilla=0, verbosidad=0)
+    modelo.entrenar_ols(X[:150], y[:150], num_candidatos=60)
+
+    _actualizar_por_incrementos(modelo, X, y, 150)
+
+    np.testing.assert_allclose(modelo.pesos, _pesos_reentrenados(modelo, X, y),
+                               rtol=1e-7, atol=1e-9)
+
+
+def test_actualizar_despues_de_entrenar_por_bloques():
+    X, y = _datos()
+    bloques = lambda: zip(np.array_split(X[:150], 4), np.array_split(y[:150], 4))
+    modelo = RBFNeuralNetwork(12, semilla=0, verbosidad=0)
+    modelo.entrenar_por_bloques(bloques, centros=X[:12])
+
+    _actualizar_por_incrementos(modelo, X, y, 150)
+
+    np.testing.assert_allclose(modelo.pesos, _pesos_reentrenados(modelo, X, y),
+                               rtol=1e-7, atol=1e-9)
+
+
+def test_actualizar_con_estado_restaurado():
+    """Las ecuaciones normales guardadas (a_dict) permiten seguir actualizando"""
+    X, y = _datos()
+    modelo = RBFNeuralNetwork(12, semilla=0, verbosidad=0)
+    modelo.entrenar(X[:150], y[:150])
+
+    restaurado = RBFNeuralNetwork(12, semilla=0, verbosidad=0)
+    restaurado.centros = modelo.centros
+    restaurado.pesos = modelo.pesos
+    restaurado.estado_normal = acumulador_desde_dict(modelo.estado_normal.a_dict())
+
+    _actualizar_por_incrementos(modelo, X, y, 150)
+    _actualizar_por_incrementos(restaurado, X, y, 150)
+
+    np.testing.assert_allclose(restaurado.pesos, modelo.pesos, rtol=1e-12, atol=1e-12)
+
+
+def test_actualizar_rechaza_otro_numero_de_salidas():
+    X, y = _datos()
+    modelo = RBFNeuralNetwork(12, semilla=0, verbosidad=0)
+    modelo.entrenar(X[:150], y[:150])
+
+    with pytest.raises(ValueError):
+        modelo.actualizar(X[150:], y[150:, :1])
@@ -0,0 +1,151 @@
+"""
+Pruebas de las migraciones del esquema: bases de datos nuevas, bases de
+datos anteriores al control de versiones (la de ejemplo en database/) y
+reaplicación
+"""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import migraciones
+from migraciones import (MIGRACIONES, TABLAS_EN_CASCADA, VERSION_ACTUAL,
+                         aplicar_migraciones, version_esquema)
+from storage_manager import StorageManager
+
+
+BASE_EJEMPLO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'database', 'rbf_trainings.db')
+
+TABLAS_HIJAS = ('configuracion_modelo', 'metricas', 'estadisticas_dataset')
+
+
+@pytest.fixture
+def base_antigua(tmp_path):
+    """Copia de la base de datos de ejemplo, anterior a version_esquema"""
+    ruta = str(tmp_path / 'antigua.db')
+    shutil.copyfile(BASE_EJEMPLO, ruta)
+    return ruta
+
+
+def _contar(conexion, tabla):
+    return conexion.execute(f'SELECT COUNT(*) FROM {tabla}').fetchone()[0]
+
+
+def _columnas(conexion, tabla):
+    return {fila[1] for fila in conexion.execute(f'PRAGMA table_info({tabla})')}
+
+
+def _indices(conexion):
+    return {fila[0] for fila in conexion.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_base_nueva_llega_a_la_version_actual(tmp_path):
+    conexion = sqlite3.connect(str(tmp_path / 'nueva.db'))
+
+    assert aplicar_migraciones(conexion) == [version for version, _, _ in MIGRACIONES]
+    assert version_esquema(conexion) == VERSION_ACTUAL
+    assert _columnas(conexion, 'configuracion_modelo') >= {'estado_normal'}
+
+
+def test_reaplicar_no_hace_nada(tmp_path):
+    conexion = sqlite3.connect(str(tmp_path / 'nueva.db'))
+    aplicar_migraciones(conexion)
+
+    assert aplicar_migraciones(conexion) == []
+    assert _contar(conexion, 'version_esquema') == len(MIGRACIONES)
+
+
+def test_base_antigua_conserva_sus_filas(base_antigua):
+    conexion = sqlite3.connect(base_antigua)
+    assert version_esquema(conexion) == 0
+    antes = {tabla: _contar(conexion, tabla) for tabla in ('entrenamientos',) + TABLAS_HIJAS}
+
+    aplicar_migraciones(conexion)
+
+    assert version_esquema(conexion) == VERSION_ACTUAL
+    assert {tabla: _contar(conexion, tabla) for tabla in antes} == antes
+    assert _columnas(conexion, 'entrenamientos') >= {'parametros_activacion', 'version',
+                                                    'entrenamiento_padre_id', 'dtype'}
+    assert 'estado_normal' in _columnas(conexion, 'configuracion_modelo')
+
+
+def test_claves_foraneas_en_cascada(base_antigua):
+    conexion = sqlite3.connect(base_antigua)
+    aplicar_migraciones(conexion)
+
+    for tabla in TABLAS_EN_CASCADA:
+        acciones = [fila[6] for fila in conexion.execute(f'PRAGMA foreign_key_list({tabla})')]
+        assert acciones == ['CASCADE'], tabla
+
+    conexion.execute('PRAGMA foreign_keys=ON')
+    entrenamiento_id = conexion.execute('SELECT MIN(id) FROM entrenamientos').fetchone()[0]
+    conexion.execute('DELETE FROM entrenamientos WHERE id = ?', (entrenamiento_id,))
+    conexion.commit()
+    for tabla in TABLAS_HIJAS:
+        restantes = conexion.execute(f'SELECT COUNT(*) FROM {tabla} WHERE entrenamiento_id = ?',
+                                     (entrenamiento_id,)).fetchone()[0]
+        assert restantes == 0, tabla
+
+
+def test_elimina_filas_huerfanas(base_antigua):
+    conexion = sqlite3.connect(base_antigua)
+    conexion.execute("INSERT INTO metricas (entrenamiento_id, conjunto, eg) VALUES (9999, 'prueba', 0.5)")
+    conexion.commit()
+
+    aplicar_migraciones(conexion)
+
+    assert conexion.execute('SELECT COUNT(*) FROM metricas WHERE entrenamiento_id = 9999').fetchone()[0] == 0
+
+
+def test_crea_los_indices(base_antigua):
+    conexion = sqlite3.connect(base_antigua)
+    aplicar_migraciones(conexion)
+
+    esperados = {f'idx_{tabla}_entrenamiento' for tabla in TABLAS_HIJAS + ('etapas_entrenamiento',)}
+    esperados |= {'idx_ensayos_busqueda', 'idx_entrenamientos_fecha', 'idx_entrenamientos_dataset_fecha'}
+    assert esperados <= _indices(conexion)
+
+
+def test_restaura_foreign_keys(tmp_path):
+    conexion = sqlite3.connect(str(tmp_path / 'nueva.db'))
+    conexion.execute('PRAGMA foreign_keys=ON')
+
+    aplicar_migraciones(conexion)
+
+    assert conexion.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+
+
+def test_migracion_fallida_no_deja_el_esquema_a_medias(tmp_path, monkeypatch):
+    conexion = sqlite3.connect(str(tmp_path / 'nueva.db'))
+    aplicar_migraciones(conexion)
+
+    def fallida(cursor):
+        cursor.execute('CREATE TABLE a_medias (id INTEGER)')
+        raise RuntimeError('falla')
+
+    monkeypatch.setattr(migraciones, 'MIGRACIONES', MIGRACIONES + [(VERSION_ACTUAL + 1, 'Falla', fallida)])
+    monkeypatch.setattr(migraciones, 'VERSION_ACTUAL', VERSION_ACTUAL + 1)
+    with pytest.raises(RuntimeError):
+        migraciones.aplicar_migraciones(conexion)
+
+    assert version_esquema(conexion) == VERSION_ACTUAL
+    assert conexion.execute("SELECT name FROM sqlite_master WHERE name = 'a_medias'").fetchone() is None
+
+
+def test_storage_manager_migra_y_borra_en_cascada(base_antigua):
+    storage = StorageManager(base_antigua)
+    try:
+        entrenamiento_id = storage.listar_entrenamientos()[0]['id']
+        storage.eliminar_entrenamiento(entrenamiento_id)
+    finally:
+        storage.cerrar()
+
+    conexion = sqlite3.connect(base_antigua)
+    assert version_esquema(conexion) == VERSION_ACTUAL
+    for tabla in TABLAS_HIJAS:
+        restantes = conexion.execute(f'SELECT COUNT(*) FROM {tabla} WHERE entrenamiento_id = ?',
+                                     (entrenamiento_id,)).fetchone()[0]
+        assert restantes == 0, tabla
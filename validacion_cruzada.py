@@ -0,0 +1,128 @@
+"""
+Validación cruzada para la Red Neuronal RBF
+K pliegues y dejar-uno-fuera sobre una única matriz Φ con centros fijos
+"""
+
+import numpy as np
+
+from solucionador import AcumuladorNormal, resolver_ecuaciones_normales, resolver_triangular
+
+
+def validacion_cruzada(modelo, X, y, pliegues=5, semilla=None, centros=None):
+    """
+    Validación cruzada de k pliegues reutilizando una sola matriz Φ
+
+    Φ se calcula una vez contra un conjunto de centros fijo y se acumulan las
+    ecuaciones normales globales G = A^T A y b = A^T y. Cada pliegue se
+    resuelve restando la contribución de sus patrones (G - A_f^T A_f,
+    b - A_f^T y_f), sin recalcular distancias ni activaciones, por lo que
+    el costo total es similar al de un solo entrenamiento.
+
+    Args:
+        modelo: RBFNeuralNetwork con la configuración a evaluar
+        X: Patrones (n_patrones, n_caracteristicas)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+        pliegues: Número de pliegues o lista de arrays de índices de validación
+                  (p. ej. DataHandler.generar_pliegues)
+        semilla: Semilla para repartir los pliegues cuando pliegues es un entero
+        centros: Centros fijos; si es None se seleccionan sobre X con la
+                 estrategia del modelo
+
+    Returns:
+        dict con las métricas de cada pliegue ('pliegues') y su promedio
+        ('EG', 'MAE', 'RMSE', 'Converge'), más la desviación estándar del EG
+    """
+    y = np.asarray(y, dtype=float)
+    if isinstance(pliegues, int):
+        if not 2 <= pliegues <= len(X):
+            raise ValueError(f"El número de pliegues debe estar entre 2 y {len(X)}")
+        rng = np.random.RandomState(semilla) if semilla is not None else np.random
+        pliegues = np.array_split(rng.permutation(len(X)), pliegues)
+
+    centros = modelo.seleccionar_centros(X) if centros is None else np.asarray(centros, dtype=float)
+    phi = modelo.calcular_phi(X, centros)
+    num_salidas = y.shape[1] if y.ndim > 1 else None
+
+    total = AcumuladorNormal(centros.shape[0], num_salidas)
+    total.agregar(phi, y)
+    metodo = 'svd' if modelo.solucionador == 'svd' else 'cholesky'
+
+    metricas_pliegues = []
+    for indices in pliegues:
+        indices = np.asarray(indices)
+        phi_pliegue = phi[indices]
+
+        fuera = AcumuladorNormal(centros.shape[0], num_salidas)
+        fuera.agregar(phi_pliegue, y[indices])
+        pesos, _ = resolver_ecuaciones_normales(total.G - fuera.G, total.b - fuera.b,
+                                                metodo=metodo)
+
+        y_pred = phi_pliegue @ pesos[1:] + pesos[0]
+        metricas_pliegues.append(modelo.calcular_metricas(y[indices], y_pred))
+
+    eg = np.array([m['EG'] for m in metricas_pliegues])
+    return {
+        'pliegues': metricas_pliegues,
+        'EG': float(eg.mean()),
+        'EG_std': float(eg.std()),
+        'MAE': float(np.mean([m['MAE'] for m in metricas_pliegues])),
+        'RMSE': float(np.mean([m['RMSE'] for m in metricas_pliegues])),
+        'Converge': bool(eg.mean() <= modelo.error_optimo)
+    }
+
+
+def validacion_cruzada_loo(modelo, X, y, centros=None, tamano_bloque=10000):
+    """
+    Validación dejar-uno-fuera (LOO) en forma cerrada
+
+    Para mínimos cuadrados, el residuo al excluir el patrón i es
+    e_i / (1 - h_ii), con h_ii la diagonal de la matriz sombrero
+    H = A·(A^T A)⁻¹·A^T. Con G = L·L^T, h_ii = ||L⁻¹·a_i||², de modo que
+    los n modelos se evalúan con un solo ajuste y una sustitución triangular.
+
+    Args:
+        modelo: RBFNeuralNetwork con la configuración a evaluar
+        X: Patrones (n_patrones, n_caracteristicas)
+        y: Salidas deseadas (n_patrones,) o (n_patrones, n_salidas)
+        centros: Centros fijos; si es None se seleccionan sobre X
+        tamano_bloque: Patrones por bloque al calcular h_ii
+
+    Returns:
+        dict con 'EG', 'MAE', 'RMSE', 'Converge' de las predicciones LOO y
+        'apalancamiento_maximo' (max h_ii)
+    """
+    y = np.asarray(y, dtype=float)
+    centros = modelo.seleccionar_centros(X) if centros is None else np.asarray(centros, dtype=float)
+    phi = modelo.calcular_phi(X, centros)
+    if hasattr(phi, 'toarray'):
+        phi = phi.toarray()
+
+    acumulador = AcumuladorNormal(centros.shape[0], y.shape[1] if y.ndim > 1 else None)
+    acumulador.agregar(phi, y)
+    try:
+        L = np.linalg.cholesky(acumulador.G)
+    except np.linalg.LinAlgError:
+        raise ValueError("A^T A es singular: LOO requiere una matriz A de rango completo")
+
+    z = resolver_triangular(L, acumulador.b, inferior=True)
+    pesos = resolver_triangular(L.T, z, inferior=False)
+
+    # Diagonal de la matriz sombrero por bloques: h_i = ||L⁻¹ [1, φ_i]||²
+    apalancamiento = np.empty(len(phi))
+    for inicio in range(0, len(phi), tamano_bloque):
+        bloque = phi[inicio:inicio + tamano_bloque]
+        A_bloque = np.hstack([np.ones((len(bloque), 1)), bloque])
+        V = resolver_triangular(L, A_bloque.T, inferior=True)
+        apalancamiento[inicio:inicio + len(bloque)] = np.einsum('ij,ij->j', V, V)
+
+    residuo = y - (phi @ pesos[1:] + pesos[0])
+    # h_ii → 1 en patrones interpolados exactamente (p. ej. centros con k ≈ n)
+    divisor = np.maximum(1.0 - apalancamiento, np.finfo(float).eps)
+    if y.ndim > 1:
+        divisor = divisor[:, np.newaxis]
+    y_loo = y - residuo / divisor
+
+    metricas = modelo.calcular_metricas(y, y_loo)
+    metricas['Converge'] = bool(metricas['Converge'])
+    metricas['apalancamiento_maximo'] = float(apalancamiento.max())
+    return metricas